@@ -0,0 +1,282 @@
+"""Shared fixtures for the ``pytest-benchmark`` suites.
+
+Benchmarks are not collected by default; run them explicitly with::
+
+    pytest benchmarks
+
+The plan benchmarks (``test_plans.py``) are compared with the baselines
+stored in ``--baseline`` and fail when they regress by more than
+``--regression-tolerance``; ``--update-baseline`` stores the current
+results as the new baselines instead. A plan without a baseline only
+emits a warning; so do all the plans when the baselines were recorded
+on another machine (Python version, architecture, processor or number
+of CPUs), whose results are not comparable.
+"""
+
+import json
+import os
+import platform
+import threading
+import warnings
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Iterator, Optional
+
+import numpy as np
+import pytest
+from bluesky.preprocessors import run_decorator
+from bluesky.run_engine import RunEngine
+from bluesky.utils import MsgGenerator
+
+from redsun_simulator.openwfs import OpenWFSCameraInfo
+
+#: default baseline file of the plan benchmarks
+BASELINE = Path(__file__).parent / "baselines.json"
+
+#: compared metrics, and whether larger values are better
+CHECKS = {
+    "points_per_second": True,
+    "latency_p95_ms": False,
+    "peak_memory_mb": False,
+}
+
+#: number of points of the unmeasured run preceding each plan
+WARMUP_POINTS = 50
+
+#: absolute increase of a metric below which no regression is reported;
+#: small latencies and memory growths vary from run to run
+SLACK = {
+    "latency_p95_ms": 5.0,
+    "peak_memory_mb": 16.0,
+}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the options of the plan benchmarks."""
+    group = parser.getgroup("plan benchmarks")
+    group.addoption(
+        "--baseline",
+        default=str(BASELINE),
+        help="JSON file with the baselines of the plan benchmarks",
+    )
+    group.addoption(
+        "--update-baseline",
+        action="store_true",
+        help="store the results of the plan benchmarks as the new baselines",
+    )
+    group.addoption(
+        "--regression-tolerance",
+        type=float,
+        default=0.3,
+        help="relative change of a metric reported as a regression (default: 0.3)",
+    )
+    group.addoption(
+        "--max-points",
+        type=int,
+        default=10_000,
+        help="skip the plans with more points (default: 10000)",
+    )
+
+
+@pytest.fixture
+def RE() -> RunEngine:
+    """Return a ``RunEngine`` instance."""
+    return RunEngine()
+
+
+@pytest.fixture
+def camera_info() -> Callable[..., OpenWFSCameraInfo]:
+    """Return a factory of camera configurations with a square sensor of given size.
+
+    Additional keyword arguments of the factory override the other fields.
+    """
+
+    def factory(size: int, **kwargs: Any) -> OpenWFSCameraInfo:
+        return OpenWFSCameraInfo(
+            model_name="OpenWFSCamera",
+            specimen={
+                "resolution": [1024, 1024],
+                "pixel_size": 60.0,
+                "magnification": 40,
+                "numerical_aperture": 0.85,
+                "wavelength": 532.8,
+            },
+            sensor_shape=[size, size],
+            pixel_size=[8.5, 8.5, 8.5],
+            **kwargs,
+        )
+
+    return factory
+
+
+class PeakMemory:
+    """Sample the resident memory of the process in a background thread.
+
+    Only supported on Linux; elsewhere :attr:`peak_mb` is ``None``.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self._interval = interval
+        self._stop = threading.Event()
+        self._start = _resident_bytes()
+        self._peak = self._start
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def __enter__(self) -> "PeakMemory":
+        """Start sampling the resident memory."""
+        if self._start is not None:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Stop sampling the resident memory."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self._interval):
+            self._peak = max(self._peak or 0, _resident_bytes() or 0)
+
+    @property
+    def peak_mb(self) -> Optional[float]:
+        """Peak growth of the resident memory, in megabytes."""
+        if self._start is None or self._peak is None:
+            return None
+        return (self._peak - self._start) / 1e6
+
+
+def _machine() -> dict[str, Any]:
+    """Describe the machine on which the baselines are recorded."""
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def _resident_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+@pytest.fixture(scope="session")
+def baselines(request: pytest.FixtureRequest) -> Iterator[dict[str, Any]]:
+    """Baselines of the plan benchmarks, by test name.
+
+    Baselines recorded on another machine are ignored with a warning.
+    With ``--update-baseline``, results added to the dictionary are
+    written back to the baseline file at the end of the session.
+    """
+    path = Path(request.config.getoption("--baseline"))
+    stored = json.loads(path.read_text()) if path.exists() else {}
+    results: dict[str, Any] = dict(stored.get("benchmarks", {}))
+    machine = _machine()
+    if results and stored.get("machine") != machine:
+        warnings.warn(
+            f"The baselines in {path} were recorded on {stored.get('machine')}, "
+            f"not on {machine}: they are ignored"
+        )
+        results.clear()
+    yield results
+    if request.config.getoption("--update-baseline"):
+        path.write_text(
+            json.dumps({"machine": machine, "benchmarks": results}, indent=2) + "\n"
+        )
+
+
+@pytest.fixture
+def run_plan(
+    benchmark: Any,
+    RE: RunEngine,
+    baselines: dict[str, Any],
+    request: pytest.FixtureRequest,
+) -> Callable[[Callable[[int], MsgGenerator[Any]], int], dict[str, Any]]:
+    """Run a plan of ``points`` steps once and check it against its baseline.
+
+    The plan is a single run executing ``step(i)`` for each point,
+    preceded by a short, unmeasured run of the same steps. The
+    number of points and events per second, the percentiles of the
+    per-point latency and the peak memory growth are stored in the
+    ``extra_info`` of the benchmark and returned.
+    """
+    config = request.config
+    name = request.node.name
+
+    def run(step: Callable[[int], MsgGenerator[Any]], points: int) -> dict[str, Any]:
+        if points > config.getoption("--max-points"):
+            pytest.skip(f"more than --max-points={config.getoption('--max-points')}")
+        stamps: list[float] = []
+        events = [0]
+
+        @run_decorator()
+        def plan(points: int) -> MsgGenerator[None]:
+            stamps.append(perf_counter())
+            for i in range(points):
+                yield from step(i)
+                stamps.append(perf_counter())
+
+        def count(name: str, doc: dict[str, Any]) -> None:
+            events[0] += 1
+
+        # the first steps of a plan are slower (imports, caches, threads)
+        RE(plan(min(points, WARMUP_POINTS)))
+        stamps.clear()
+        token = RE.subscribe(count, "event")
+        with PeakMemory() as memory:
+            benchmark.pedantic(lambda: RE(plan(points)), rounds=1, iterations=1)
+        RE.unsubscribe(token)
+
+        latency = np.diff(stamps) * 1e3
+        duration = stamps[-1] - stamps[0]
+        metrics = {
+            "points": points,
+            "events": events[0],
+            "points_per_second": points / duration,
+            "events_per_second": events[0] / duration,
+            "latency_p50_ms": float(np.percentile(latency, 50)),
+            "latency_p95_ms": float(np.percentile(latency, 95)),
+            "latency_p99_ms": float(np.percentile(latency, 99)),
+            "peak_memory_mb": memory.peak_mb,
+        }
+        benchmark.extra_info.update(metrics)
+
+        if config.getoption("--update-baseline"):
+            baselines[name] = metrics
+        elif name in baselines:
+            regressions = _regressions(
+                baselines[name], metrics, config.getoption("--regression-tolerance")
+            )
+            if regressions:
+                pytest.fail(f"{name} regressed: " + "; ".join(regressions))
+        else:
+            warnings.warn(
+                f"No baseline for {name} in {config.getoption('--baseline')}; "
+                "record it with --update-baseline",
+                stacklevel=2,
+            )
+        return metrics
+
+    return run
+
+
+def _regressions(
+    baseline: dict[str, Any], metrics: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Describe the metrics which are worse than their baseline."""
+    regressions = []
+    for key, larger_is_better in CHECKS.items():
+        old, new = baseline.get(key), metrics.get(key)
+        if old is None or new is None:
+            continue
+        if larger_is_better:
+            worse = new < old * (1.0 - tolerance)
+        else:
+            worse = new > old * (1.0 + tolerance) + SLACK.get(key, 0.0)
+        if worse:
+            regressions.append(f"{key} {new:.3g} (baseline {old:.3g})")
+    return regressions
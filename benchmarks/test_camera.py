@@ -0,0 +1,154 @@
+"""Frame acquisition benchmarks for ``OpenWFSCamera``.
+
+Each benchmark stores the frame rate and per-frame latency
+(or the memory bandwidth, for the digitization benchmark)
+in the ``extra_info`` field of the ``pytest-benchmark`` report.
+"""
+
+from typing import Any, Callable
+
+import astropy.units as u
+import bluesky.plans as bp
+import numpy as np
+import pytest
+from bluesky.run_engine import RunEngine
+
+from redsun_simulator.openwfs import (
+    OpenWFSCamera,
+    OpenWFSCameraInfo,
+    OpenWFSMotor,
+    OpenWFSMotorInfo,
+)
+
+SENSOR_SIZES = [256, 512, 1024, 2048, 4096]
+
+#: number of frames acquired by each ``bp.count`` round
+FRAMES = 5
+
+#: supported ``(bit_depth, dtype)`` combinations
+BIT_DEPTHS = [(8, "uint8"), (8, "uint16"), (12, "uint16"), (16, "uint16")]
+
+
+@pytest.mark.parametrize("size", SENSOR_SIZES)
+def test_frame_latency(
+    benchmark: Any, camera_info: Callable[[int], OpenWFSCameraInfo], size: int
+) -> None:
+    """Time from ``trigger`` to the frame being available."""
+    camera = OpenWFSCamera("camera", camera_info(size))
+
+    benchmark.pedantic(lambda: camera.trigger().wait(), rounds=FRAMES, warmup_rounds=1)
+
+    latency = benchmark.stats["mean"]
+    benchmark.extra_info["latency_ms"] = latency * 1e3
+    benchmark.extra_info["frames_per_second"] = 1.0 / latency
+
+
+@pytest.mark.parametrize("size", SENSOR_SIZES)
+def test_count_throughput(
+    benchmark: Any,
+    camera_info: Callable[[int], OpenWFSCameraInfo],
+    RE: RunEngine,
+    size: int,
+) -> None:
+    """Frame rate of a ``bp.count`` plan under the ``RunEngine``."""
+    camera = OpenWFSCamera("camera", camera_info(size))
+
+    benchmark.pedantic(
+        RE, setup=lambda: ((bp.count([camera], num=FRAMES),), {}), rounds=3
+    )
+
+    latency = benchmark.stats["mean"] / FRAMES
+    benchmark.extra_info["latency_ms"] = latency * 1e3
+    benchmark.extra_info["frames_per_second"] = 1.0 / latency
+
+
+@pytest.mark.parametrize("bit_depth, dtype", BIT_DEPTHS)
+def test_digitize_bandwidth(
+    benchmark: Any,
+    camera_info: Callable[..., OpenWFSCameraInfo],
+    bit_depth: int,
+    dtype: str,
+) -> None:
+    """Memory bandwidth of the conversion from analog image to frame."""
+    size = 2048
+    camera = OpenWFSCamera(
+        "camera", camera_info(size, bit_depth=bit_depth, dtype=dtype)
+    )
+    analog = np.asarray(camera._crop.read(), dtype=np.float64)
+    out = np.empty(camera.data_shape, dtype=dtype)
+
+    # the analog image is scaled in place, so each round gets a fresh copy
+    benchmark.pedantic(
+        camera._digitize,
+        setup=lambda: ((analog.copy(), out), {}),
+        rounds=10,
+        warmup_rounds=1,
+    )
+
+    latency = benchmark.stats["mean"]
+    benchmark.extra_info["bytes_per_frame"] = out.nbytes
+    benchmark.extra_info["latency_ms"] = latency * 1e3
+    benchmark.extra_info["megabytes_per_second"] = out.nbytes / latency / 1e6
+
+
+@pytest.mark.parametrize("margin", [0, 32])
+def test_coupled_raster_scan(
+    benchmark: Any, camera_info: Callable[..., OpenWFSCameraInfo], margin: int
+) -> None:
+    """Frame rate of a fine raster scan with the camera coupled to a motor."""
+    # one motor step is one specimen pixel
+    motor = OpenWFSMotor(
+        "stage",
+        OpenWFSMotorInfo(
+            model_name="OpenWFSMotor",
+            axis=["X", "Y"],
+            step_size={"X": 0.06, "Y": 0.06},
+            egu="um",
+            setpoint_time=0.0,
+        ),
+    )
+    camera = OpenWFSCamera("camera", camera_info(1024))
+    camera.couple_stage(motor, x="X", y="Y", margin=margin)
+    points = [(0.06 * i, 0.06 * j) for i in range(4) for j in range(4)]
+
+    def scan() -> None:
+        for x, y in points:
+            motor.set({"X": x, "Y": y}).wait()
+            camera.trigger().wait()
+
+    benchmark.pedantic(scan, rounds=3, warmup_rounds=1)
+
+    latency = benchmark.stats["mean"] / len(points)
+    benchmark.extra_info["latency_ms"] = latency * 1e3
+    benchmark.extra_info["frames_per_second"] = 1.0 / latency
+
+
+@pytest.mark.parametrize("stack", [False, True], ids=["series", "zstack"])
+@pytest.mark.parametrize("batched", [False, True])
+def test_burst_throughput(
+    benchmark: Any,
+    camera_info: Callable[..., OpenWFSCameraInfo],
+    batched: bool,
+    stack: bool,
+) -> None:
+    """Frame rate of a burst, frame by frame or with ``acquire_batch``.
+
+    The burst is either a time series at a fixed position or a z-stack.
+    """
+    camera = OpenWFSCamera("camera", camera_info(512))
+    positions = np.linspace(-2.0, 2.0, 16)
+
+    def frame_by_frame() -> None:
+        for z in positions:
+            if stack:
+                camera._microscope.z_stage.position = z * u.um
+            camera.trigger().wait()
+
+    def batch() -> None:
+        camera.acquire_batch(positions.size, positions if stack else None)
+
+    benchmark.pedantic(batch if batched else frame_by_frame, rounds=3, warmup_rounds=1)
+
+    latency = benchmark.stats["mean"] / positions.size
+    benchmark.extra_info["latency_ms"] = latency * 1e3
+    benchmark.extra_info["frames_per_second"] = 1.0 / latency
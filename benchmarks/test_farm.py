@@ -0,0 +1,45 @@
+"""Multi-camera benchmarks, in process and with a ``CameraFarm``.
+
+Each benchmark stores the aggregated frame rate of all the cameras
+in the ``extra_info`` field of the ``pytest-benchmark`` report.
+"""
+
+from typing import Any, Callable
+
+import pytest
+
+from redsun_simulator.openwfs import CameraFarm, OpenWFSCamera, OpenWFSCameraInfo
+
+#: number of simulated cameras
+CAMERAS = 4
+
+#: number of frames acquired by each camera in a round
+FRAMES = 5
+
+
+@pytest.mark.parametrize("farm", [False, True], ids=["threads", "processes"])
+def test_multi_camera_throughput(
+    benchmark: Any, camera_info: Callable[..., OpenWFSCameraInfo], farm: bool
+) -> None:
+    """Aggregated frame rate of cameras triggered together."""
+    infos = {f"camera {i}": camera_info(1024) for i in range(CAMERAS)}
+    pool = CameraFarm(infos) if farm else None
+    cameras = (
+        list(pool.values())
+        if pool is not None
+        else [OpenWFSCamera(name, info) for name, info in infos.items()]
+    )
+
+    def acquire() -> None:
+        for _ in range(FRAMES):
+            for status in [camera.trigger() for camera in cameras]:
+                status.wait()
+
+    try:
+        benchmark.pedantic(acquire, rounds=3, warmup_rounds=1)
+    finally:
+        if pool is not None:
+            pool.close()
+
+    frames = CAMERAS * FRAMES
+    benchmark.extra_info["frames_per_second"] = frames / benchmark.stats["mean"]
@@ -0,0 +1,77 @@
+"""Benchmarks of many simulated motors, as individual devices and as a bank.
+
+Motors use a virtual clock, so that only the cost of the simulation is measured.
+"""
+
+from typing import Any
+
+import numpy as np
+import pytest
+
+from redsun_simulator.openwfs import (
+    OpenWFSMotor,
+    OpenWFSMotorBank,
+    OpenWFSMotorInfo,
+    VirtualClock,
+)
+
+#: number of simulated motors
+MOTORS = [100, 1000]
+
+
+@pytest.fixture
+def motor_info() -> OpenWFSMotorInfo:
+    """Return the configuration of a three-axis motor."""
+    return OpenWFSMotorInfo(
+        model_name="OpenWFSMotor",
+        axis=["X", "Y", "Z"],
+        step_size={"X": 0.1, "Y": 0.1, "Z": 0.1},
+        egu="um",
+        velocity=1000.0,
+    )
+
+
+@pytest.mark.parametrize("count", MOTORS)
+@pytest.mark.parametrize("bank", [False, True], ids=["motors", "bank"])
+def test_construction(
+    benchmark: Any, motor_info: OpenWFSMotorInfo, count: int, bank: bool
+) -> None:
+    """Time to construct ``count`` motors."""
+    clock = VirtualClock()
+
+    def construct() -> Any:
+        if bank:
+            return OpenWFSMotorBank("stage", motor_info, count, clock=clock)
+        return [
+            OpenWFSMotor(f"stage-{i}", motor_info, clock=clock) for i in range(count)
+        ]
+
+    benchmark(construct)
+
+
+@pytest.mark.parametrize("count", MOTORS)
+@pytest.mark.parametrize("bank", [False, True], ids=["motors", "bank"])
+def test_bulk_move(
+    benchmark: Any, motor_info: OpenWFSMotorInfo, count: int, bank: bool
+) -> None:
+    """Move all the motors and locate them, as a single step of a scan."""
+    clock = VirtualClock()
+    targets = np.random.default_rng(0).uniform(0.0, 100.0, (count, 3))
+    if bank:
+        motor_bank = OpenWFSMotorBank("stage", motor_info, count, clock=clock)
+
+        def move() -> Any:
+            motor_bank.move(targets).wait()
+            return motor_bank.locate()
+
+    else:
+        motors = [
+            OpenWFSMotor(f"stage-{i}", motor_info, clock=clock) for i in range(count)
+        ]
+
+        def move() -> Any:
+            for status in [m.set(t) for m, t in zip(motors, targets)]:
+                status.wait()
+            return [m.locate_many() for m in motors]
+
+    benchmark.pedantic(move, rounds=5, warmup_rounds=1)
@@ -0,0 +1,137 @@
+"""End-to-end benchmarks of Bluesky plans running against the simulators.
+
+Each plan runs once under the ``RunEngine`` through the ``run_plan``
+fixture, which reports the points and events per second, the per-point
+latency percentiles and the peak memory growth, and compares them with
+the stored baselines (see ``conftest.py``).
+
+Motors use a virtual clock, so that only the cost of the simulation
+and of the ``RunEngine`` is measured. Grid scans read a small camera
+at each point, so that each point also produces an event.
+"""
+
+import math
+from typing import Any, Callable
+
+import bluesky.plan_stubs as bps
+import pytest
+from bluesky.utils import MsgGenerator
+
+from redsun_simulator.openwfs import (
+    OpenWFSCamera,
+    OpenWFSCameraInfo,
+    OpenWFSMotor,
+    OpenWFSMotorInfo,
+    VirtualClock,
+)
+
+#: number of points of the scans; plans above ``--max-points`` are skipped
+POINTS = [1_000, 10_000, 100_000]
+
+#: number of frames of the counts
+FRAMES = 20
+
+#: settle time of the virtual clocks; the plans wait for each step,
+#: so that a short one does not change the simulated timings
+SETTLE = 1e-3
+
+RunPlan = Callable[[Callable[[int], MsgGenerator[Any]], int], dict[str, Any]]
+
+
+@pytest.fixture
+def detector(camera_info: Callable[..., OpenWFSCameraInfo]) -> OpenWFSCamera:
+    """Return a camera with a small sensor, read at each point of the grid scans."""
+    return OpenWFSCamera("detector", camera_info(16, buffer_size=4))
+
+
+@pytest.fixture
+def motor_info() -> OpenWFSMotorInfo:
+    """Return the configuration of a three-axis motor."""
+    return OpenWFSMotorInfo(
+        model_name="OpenWFSMotor",
+        axis=["X", "Y", "Z"],
+        step_size={"X": 0.1, "Y": 0.1, "Z": 0.1},
+        egu="um",
+        velocity=1000.0,
+    )
+
+
+@pytest.mark.parametrize("points", POINTS)
+def test_grid_1d(
+    run_plan: RunPlan,
+    motor_info: OpenWFSMotorInfo,
+    detector: OpenWFSCamera,
+    points: int,
+) -> None:
+    """Absolute moves of a motor with ``bps.mv``, reading a detector at each point."""
+    motor = OpenWFSMotor("x", motor_info, clock=VirtualClock(settle=SETTLE))
+
+    def step(i: int) -> MsgGenerator[Any]:
+        yield from bps.mv(motor, 0.1 * i)
+        return (yield from bps.trigger_and_read([detector]))
+
+    run_plan(step, points)
+
+
+@pytest.mark.parametrize("points", POINTS)
+def test_relative_1d(
+    run_plan: RunPlan, motor_info: OpenWFSMotorInfo, points: int
+) -> None:
+    """Relative moves of a motor with ``bps.mvr``."""
+    motor = OpenWFSMotor("x", motor_info, clock=VirtualClock(settle=SETTLE))
+
+    run_plan(lambda i: bps.mvr(motor, 0.1), points)
+
+
+@pytest.mark.parametrize("points", POINTS)
+def test_grid_2d(
+    run_plan: RunPlan,
+    motor_info: OpenWFSMotorInfo,
+    detector: OpenWFSCamera,
+    points: int,
+) -> None:
+    """Raster scan of two motors, reading a detector at each point.
+
+    The slow motor only moves between rows.
+    """
+    clock = VirtualClock(settle=SETTLE)
+    fast = OpenWFSMotor("x", motor_info, clock=clock)
+    slow = OpenWFSMotor("y", motor_info, clock=clock)
+    side = math.isqrt(points)
+
+    def step(i: int) -> MsgGenerator[Any]:
+        row, column = divmod(i, side)
+        if column == 0:
+            yield from bps.mv(slow, 0.1 * row, fast, 0.0)
+        else:
+            yield from bps.mv(fast, 0.1 * column)
+        return (yield from bps.trigger_and_read([detector]))
+
+    run_plan(step, side * side)
+
+
+@pytest.mark.parametrize("motors", [10])
+def test_multi_motor(
+    run_plan: RunPlan, motor_info: OpenWFSMotorInfo, motors: int
+) -> None:
+    """Simultaneous moves of many motors with a single ``bps.mv``."""
+    clock = VirtualClock(settle=SETTLE)
+    devices = [OpenWFSMotor(f"m{j}", motor_info, clock=clock) for j in range(motors)]
+
+    def step(i: int) -> MsgGenerator[Any]:
+        args: list[Any] = []
+        for j, motor in enumerate(devices):
+            args += [motor, 0.1 * (i + j)]
+        return bps.mv(*args)
+
+    run_plan(step, POINTS[0])
+
+
+@pytest.mark.parametrize("size", [1024, 2048])
+def test_count_frames(
+    run_plan: RunPlan, camera_info: Callable[..., OpenWFSCameraInfo], size: int
+) -> None:
+    """Large frames triggered and read with ``bps.trigger_and_read``."""
+    camera = OpenWFSCamera("camera", camera_info(size, buffer_size=4))
+
+    run_plan(lambda i: bps.trigger_and_read([camera]), FRAMES)
@@ -1,8 +1,112 @@
+# Only the configuration classes are imported eagerly; the devices and
+# their heavy dependencies (numpy, astropy, bluesky, openwfs) are imported
+# on first access, through the module ``__getattr__``.
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from ._config import OpenWFSCameraInfo, OpenWFSMotorInfo
-from ._model import OpenWFSMotor
+
+if TYPE_CHECKING:
+    from ._aio import AsyncOpenWFSCamera, AsyncOpenWFSMotor, AsyncStatus
+    from ._bank import BankMotor, OpenWFSMotorBank
+    from ._client import CameraProxy, DeviceClient, MotorProxy
+    from ._clock import Clock, ScaledClock, VirtualClock, get_clock, set_clock
+    from ._factory import (
+        DeviceRegistry,
+        config_cache_clear,
+        config_cache_info,
+        load_devices,
+    )
+    from ._farm import CameraFarm, RemoteCamera
+    from ._metrics import dump_metrics, format_prometheus
+    from ._model import OpenWFSCamera, OpenWFSMotor
+    from ._noise import NoiseEngine
+    from ._optics import psf_cache_clear, psf_cache_info
+    from ._rpc import Command, RemoteError
+    from ._server import DeviceServer
+    from ._writer import FrameWriter
 
 __all__ = (
     "OpenWFSMotor",
     "OpenWFSMotorInfo",
+    "OpenWFSCamera",
     "OpenWFSCameraInfo",
+    "OpenWFSMotorBank",
+    "BankMotor",
+    "AsyncOpenWFSMotor",
+    "AsyncOpenWFSCamera",
+    "AsyncStatus",
+    "Clock",
+    "ScaledClock",
+    "VirtualClock",
+    "get_clock",
+    "set_clock",
+    "DeviceRegistry",
+    "load_devices",
+    "config_cache_clear",
+    "config_cache_info",
+    "CameraFarm",
+    "RemoteCamera",
+    "DeviceServer",
+    "DeviceClient",
+    "MotorProxy",
+    "CameraProxy",
+    "Command",
+    "RemoteError",
+    "FrameWriter",
+    "NoiseEngine",
+    "dump_metrics",
+    "format_prometheus",
+    "psf_cache_clear",
+    "psf_cache_info",
 )
+
+#: submodule defining each lazily imported name
+_LAZY = {
+    "OpenWFSMotor": "_model",
+    "OpenWFSCamera": "_model",
+    "OpenWFSMotorBank": "_bank",
+    "BankMotor": "_bank",
+    "AsyncOpenWFSMotor": "_aio",
+    "AsyncOpenWFSCamera": "_aio",
+    "AsyncStatus": "_aio",
+    "Clock": "_clock",
+    "ScaledClock": "_clock",
+    "VirtualClock": "_clock",
+    "get_clock": "_clock",
+    "set_clock": "_clock",
+    "DeviceRegistry": "_factory",
+    "load_devices": "_factory",
+    "config_cache_clear": "_factory",
+    "config_cache_info": "_factory",
+    "CameraFarm": "_farm",
+    "RemoteCamera": "_farm",
+    "DeviceServer": "_server",
+    "DeviceClient": "_client",
+    "MotorProxy": "_client",
+    "CameraProxy": "_client",
+    "Command": "_rpc",
+    "RemoteError": "_rpc",
+    "FrameWriter": "_writer",
+    "NoiseEngine": "_noise",
+    "dump_metrics": "_metrics",
+    "format_prometheus": "_metrics",
+    "psf_cache_clear": "_optics",
+    "psf_cache_info": "_optics",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import the objects of the package on first access."""
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Generator, Mapping, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from ._model import OpenWFSCamera, OpenWFSMotor
+
+if TYPE_CHECKING:
+    from bluesky.protocols import Reading
+
+    from ._model import Frame
+
+__all__ = ["AsyncStatus", "AsyncOpenWFSMotor", "AsyncOpenWFSCamera"]
+
+
+class AsyncStatus:
+    """Status of an operation running as a task in the ``asyncio`` event loop.
+
+    Implements the Bluesky ``Status`` protocol and can be awaited.
+    It must be created from a running event loop.
+
+    Parameters
+    ----------
+    coroutine : ``Coroutine[Any, Any, None]``
+        The operation.
+
+    """
+
+    def __init__(self, coroutine: Coroutine[Any, Any, None]) -> None:
+        self._task = asyncio.ensure_future(coroutine)
+
+    def __await__(self) -> Generator[Any, None, None]:
+        return self._task.__await__()
+
+    def add_callback(self, callback: Callable[[AsyncStatus], None]) -> None:
+        """Add a function called with the status once the operation is done.
+
+        If the operation is already done, ``callback`` is called immediately.
+        """
+        if self.done:
+            callback(self)
+        else:
+            self._task.add_done_callback(lambda _: callback(self))
+
+    def exception(
+        self, timeout: Union[float, None] = 0.0
+    ) -> Union[BaseException, None]:
+        """Return the exception raised by the operation, if any.
+
+        Raises
+        ------
+        ValueError
+            If ``timeout`` is not 0; awaiting is the way to wait for the status.
+
+        """
+        if timeout != 0.0:
+            raise ValueError("An asynchronous status can only be awaited.")
+        if not self._task.done():
+            return None
+        try:
+            return self._task.exception()
+        except asyncio.CancelledError as exc:
+            return exc
+
+    @property
+    def done(self) -> bool:
+        """Whether the operation is done."""
+        return self._task.done()
+
+    @property
+    def success(self) -> bool:
+        """Whether the operation is done and succeeded."""
+        return (
+            self._task.done()
+            and not self._task.cancelled()
+            and self._task.exception() is None
+        )
+
+
+class AsyncOpenWFSMotor(OpenWFSMotor):
+    """``asyncio`` front-end of :class:`OpenWFSMotor`.
+
+    Movements wait with ``asyncio.sleep`` in the running event loop, for the
+    real duration given by the clock of the motor, and return an awaitable
+    :class:`AsyncStatus`; no thread is involved,
+    so that many motors can share a single event loop.
+    """
+
+    def move_many(  # type: ignore[override]
+        self, targets: Union[Mapping[str, float], npt.ArrayLike]
+    ) -> AsyncStatus:
+        """Start moving multiple axis of the motor at once.
+
+        See :meth:`OpenWFSMotor.move_many`; :meth:`set` uses this method too.
+
+        Returns
+        -------
+        status : AsyncStatus
+            The status of the movement.
+
+        """
+        index, setpoint, end = self._start_move(targets)
+        return AsyncStatus(self._reach(index, setpoint, end))
+
+    async def _reach(
+        self,
+        index: npt.NDArray[np.intp],
+        setpoint: npt.NDArray[np.float64],
+        end: float,
+    ) -> None:
+        """Wait for the end of the movement and update the readback."""
+        while (delay := self._clock.delay_until(end)) > 0:
+            await asyncio.sleep(delay)
+        self._readback[index] = setpoint
+
+    async def shutdown(self) -> None:  # type: ignore[override]
+        """Shutdown the motor.
+
+        Simulates a waiting time for the motor to shutdown.
+        """
+        clock = self._clock
+        end = clock.monotonic() + self.model_info.shutdown_time
+        while (delay := clock.delay_until(end)) > 0:
+            await asyncio.sleep(delay)
+
+
+class AsyncOpenWFSCamera(OpenWFSCamera):
+    """``asyncio`` front-end of :class:`OpenWFSCamera`.
+
+    Frames are rendered in the default executor of the event loop, shared
+    by all the cameras, and :meth:`trigger` returns an awaitable :class:`AsyncStatus`.
+    """
+
+    def trigger(self) -> AsyncStatus:  # type: ignore[override]
+        """Start the acquisition of a frame.
+
+        Returns
+        -------
+        status : AsyncStatus
+            The status of the acquisition;
+            it is marked as finished when the frame is available.
+
+        """
+        return AsyncStatus(self._acquire())
+
+    async def _acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        handle, timestamp = await loop.run_in_executor(None, self._render_frame)
+        self._last_frame = handle
+        self._timestamp = timestamp
+
+    async def read(self) -> dict[str, Reading[Frame]]:  # type: ignore[override]
+        """Read the last acquired frame.
+
+        If no frame was acquired yet, one is acquired first.
+
+        Returns
+        -------
+        reading : dict[str, Reading[Frame]]
+            The last frame, with the time at which it was acquired.
+
+        """
+        if self._last_frame is None:
+            await self.trigger()
+        assert self._last_frame is not None
+        frame = self._resolve(self._last_frame)
+        return {self.name: {"value": frame, "timestamp": self._timestamp}}
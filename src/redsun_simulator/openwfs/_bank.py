@@ -0,0 +1,406 @@
+from __future__ import annotations
+
+from functools import partial
+from typing import TYPE_CHECKING, Any, Mapping, Optional, Sequence, Union, overload
+
+import numpy as np
+import numpy.typing as npt
+from bluesky.protocols import Location
+from sunflare.engine import Status
+
+from ._clock import Clock, get_clock
+from ._documents import ConfigurationDocuments
+from ._motion import move_duration
+from ._scheduler import get_scheduler
+
+if TYPE_CHECKING:
+    from ._config import OpenWFSMotorInfo
+    from ._documents import ConfigurationCallback
+
+__all__ = ["OpenWFSMotorBank", "BankMotor"]
+
+
+class OpenWFSMotorBank(Sequence["BankMotor"]):
+    """Bank of identical motors, with the state of all motors in shared arrays.
+
+    The setpoints, readbacks and movement deadlines of the ``size`` motors
+    are stored in contiguous ``(size, K)`` arrays, where ``K`` is the number
+    of axis in ``model_info``; all the motors share the same model information.
+    Constructing the bank does not create any per-motor object: the
+    :class:`BankMotor` proxies, which implement the same Bluesky protocols
+    as ``OpenWFSMotor``, are created on first access.
+
+    Movements of many motors at once (see :meth:`move`) and the location
+    of all the motors (see :meth:`locate`) are vectorized over the bank.
+
+    Parameters
+    ----------
+    name : str
+        The name of the bank; motors are named ``"{name}-{index}"``.
+    model_info : OpenWFSMotorInfo
+        The model information shared by all the motors.
+    size : int
+        The number of motors.
+    clock : Clock, optional
+        The clock of the simulation. Default is the clock returned by ``get_clock``.
+
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model_info: OpenWFSMotorInfo,
+        size: int,
+        *,
+        clock: Optional[Clock] = None,
+    ) -> None:
+        if size < 1:
+            raise ValueError("A motor bank must contain at least one motor.")
+        self._name = name
+        self._model_info = model_info
+        self._clock = clock if clock is not None else get_clock()
+        self._scheduler = get_scheduler(self._clock)
+        self._axis_index = {axis: i for i, axis in enumerate(model_info.axis)}
+        self._step_size = np.array(
+            [model_info.step_size[axis] for axis in model_info.axis], dtype=np.float64
+        )
+        shape = (size, len(model_info.axis))
+        self._setpoint = np.zeros(shape, dtype=np.float64)
+        self._readback = np.zeros(shape, dtype=np.float64)
+        # time at which the last movement of each motor axis ends
+        self._move_end = np.zeros(shape, dtype=np.float64)
+        # index of the current axis of each motor
+        self._current_axis = np.zeros(size, dtype=np.intp)
+        self._motors: list[Optional[BankMotor]] = [None] * size
+        self._documents = ConfigurationDocuments(model_info)
+
+    @overload
+    def __getitem__(self, index: int) -> BankMotor: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[BankMotor]: ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[BankMotor, list[BankMotor]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        row = range(len(self))[index]
+        motor = self._motors[row]
+        if motor is None:
+            motor = self._motors[row] = BankMotor(self, row)
+        return motor
+
+    def __len__(self) -> int:
+        return len(self._motors)
+
+    def move(
+        self,
+        targets: npt.ArrayLike,
+        axis: Optional[str] = None,
+        motors: Optional[npt.ArrayLike] = None,
+    ) -> Status:
+        """Start moving many motors at once.
+
+        Setpoints are rounded to the closest multiple of the axis step size.
+        All the movements run concurrently and are queued after the pending
+        movements of the same motor axis; the returned ``Status`` is marked
+        as finished when the slowest motor reaches its setpoint.
+
+        Parameters
+        ----------
+        targets : npt.ArrayLike
+            The locations to move to. If ``axis`` is given, a vector with a
+            location for each moved motor; otherwise, an array of shape
+            ``(N, K)`` with a location for each axis of the ``N`` moved motors.
+        axis : str, optional
+            The axis along which to move.
+        motors : npt.ArrayLike, optional
+            The indices of the moved motors. Default is all the motors.
+
+        Returns
+        -------
+        status : Status
+            The status of the movement.
+
+        Raises
+        ------
+        IndexError
+            If ``axis`` is not in ``model_info.axis``.
+        ValueError
+            If the shape of ``targets`` does not match the moved motors.
+
+        """
+        rows = (
+            np.arange(len(self))
+            if motors is None
+            else np.asarray(motors, dtype=np.intp).reshape(-1)
+        )
+        if axis is None:
+            columns = np.arange(self._step_size.size)
+            values = np.asarray(targets, dtype=np.float64)
+        else:
+            columns = np.array([self._index_of(axis)], dtype=np.intp)
+            values = np.asarray(targets, dtype=np.float64).reshape(-1, 1)
+        if values.shape != (rows.size, columns.size):
+            raise ValueError(
+                f"Expected locations of shape {(rows.size, columns.size)}, "
+                f"got {values.shape}"
+            )
+        return self._move(rows, columns, values)
+
+    def locate(self) -> Location[npt.NDArray[np.float64]]:
+        """Return the current location of all the motors.
+
+        Returns
+        -------
+        location : Location[npt.NDArray[np.float64]]
+            The setpoint and readback arrays of shape ``(size, K)``,
+            with axis in the order of ``model_info.axis``.
+
+        """
+        return Location(setpoint=self._setpoint.copy(), readback=self._readback.copy())
+
+    def shutdown(self) -> None:
+        """Shutdown all the motors.
+
+        Simulates a single waiting time for the motors to shutdown.
+        """
+        self._clock.sleep(self.model_info.shutdown_time)
+
+    def configure(self, name: str, value: Any) -> None:
+        """Configure all the motors.
+
+        The configuration documents of the motors are regenerated and the
+        subscribed callbacks are notified (see :meth:`subscribe_configuration`).
+
+        Parameters
+        ----------
+        name : str
+            The name of the configuration parameter.
+        value : Any
+            The value to set the configuration
+
+        """
+        setattr(self.model_info, name, value)
+        self._documents.changed(name)
+
+    def subscribe_configuration(self, callback: ConfigurationCallback) -> None:
+        """Call ``callback`` after each call to :meth:`configure`.
+
+        Parameters
+        ----------
+        callback : ConfigurationCallback
+            Called with the name and the new value of the configuration parameter.
+
+        """
+        self._documents.subscribe(callback)
+
+    def unsubscribe_configuration(self, callback: ConfigurationCallback) -> None:
+        """Stop calling a callback registered with :meth:`subscribe_configuration`."""
+        self._documents.unsubscribe(callback)
+
+    def _move(
+        self,
+        rows: npt.NDArray[np.intp],
+        columns: npt.NDArray[np.intp],
+        values: npt.NDArray[np.float64],
+    ) -> Status:
+        """Move the axis ``columns`` of the motors ``rows`` to ``values``."""
+        index = np.ix_(rows, columns)
+        step_size = self._step_size[columns]
+        steps = np.round((values - self._setpoint[index]) / step_size)
+        setpoint = self._setpoint[index] + steps * step_size
+        duration = move_duration(
+            np.abs(steps) * step_size,
+            self.model_info.velocity,
+            self.model_info.acceleration,
+            self.model_info.setpoint_time,
+        )
+        end = np.maximum(self._clock.monotonic(), self._move_end[index]) + duration
+        self._move_end[index] = end
+        self._setpoint[index] = setpoint
+        s = Status()
+        self._scheduler.call_at(
+            float(end.max(initial=0.0)),
+            partial(self._wait_readback, s, index, setpoint),
+        )
+        return s
+
+    def _wait_readback(
+        self,
+        status: Status,
+        index: tuple[npt.NDArray[np.intp], ...],
+        value: npt.NDArray[np.float64],
+    ) -> None:
+        """Simulate the motors reaching the setpoints."""
+        self._readback[index] = value
+        status.set_finished()
+
+    def _index_of(self, axis: str) -> int:
+        """Return the position of ``axis`` in the state arrays."""
+        try:
+            return self._axis_index[axis]
+        except KeyError:
+            raise IndexError(f"Axis {axis} is not in {self.model_info.axis}") from None
+
+    @property
+    def name(self) -> str:
+        """The name of the bank."""
+        return self._name
+
+    @property
+    def model_info(self) -> OpenWFSMotorInfo:
+        """The model information shared by all the motors."""
+        return self._model_info
+
+    @property
+    def clock(self) -> Clock:
+        """The clock of the simulation."""
+        return self._clock
+
+    @property
+    def configuration_version(self) -> int:
+        """Version of the configuration documents, increased by :meth:`configure`."""
+        return self._documents.version
+
+
+class BankMotor:
+    """Single motor of an :class:`OpenWFSMotorBank`.
+
+    A lightweight view of a row of the bank state arrays, implementing
+    the same Bluesky ``Movable`` and ``Locatable`` protocols as ``OpenWFSMotor``.
+    It can also drive the stage of an ``OpenWFSCamera`` (see
+    ``OpenWFSCamera.couple_stage``).
+    """
+
+    __slots__ = ("_bank", "_row")
+
+    def __init__(self, bank: OpenWFSMotorBank, row: int) -> None:
+        self._bank = bank
+        self._row = row
+
+    def set(
+        self,
+        value: Union[float, Mapping[str, float], npt.ArrayLike],
+        axis: Optional[str] = None,
+    ) -> Status:
+        """Start moving the motor to the setpoint.
+
+        See ``OpenWFSMotor.set``.
+
+        Parameters
+        ----------
+        value : float | Mapping[str, float] | npt.ArrayLike
+            The location to move to; either a scalar, a mapping of axis
+            names to locations, or a vector with a location for each axis.
+        axis : str, optional
+            The axis along which to move a scalar location.
+            If not specified, `current_axis` is used.
+
+        Returns
+        -------
+        status : Status
+            The status of the movement
+
+        """
+        bank = self._bank
+        rows = np.array([self._row], dtype=np.intp)
+        if isinstance(value, Mapping):
+            columns = np.array([bank._index_of(name) for name in value], dtype=np.intp)
+            values = np.fromiter(value.values(), dtype=np.float64, count=len(columns))
+        elif np.ndim(value) > 0:
+            values = np.asarray(value, dtype=np.float64)
+            if values.shape != bank._step_size.shape:
+                raise ValueError(
+                    f"Expected {bank._step_size.size} locations, got shape {values.shape}"
+                )
+            columns = np.arange(values.size)
+        else:
+            index = (
+                bank._current_axis[self._row] if axis is None else bank._index_of(axis)
+            )
+            columns = np.array([index], dtype=np.intp)
+            values = np.array([value], dtype=np.float64)
+        return bank._move(rows, columns, values[np.newaxis])
+
+    def locate(self) -> Location[float]:
+        """Return the current location of the ``current_axis`` of the motor.
+
+        Returns
+        -------
+        location : Location[float]
+            The current location of the motor.
+
+        """
+        bank = self._bank
+        index = self._row, bank._current_axis[self._row]
+        return Location(
+            setpoint=float(bank._setpoint[index]),
+            readback=float(bank._readback[index]),
+        )
+
+    def read_configuration(self) -> dict[str, Any]:
+        """Read the device configuration as a Bluesky document.
+
+        The document is shared by all the motors of the bank and cached
+        until the next call to ``OpenWFSMotorBank.configure``.
+
+        Returns
+        -------
+        configuration : dict[str, Any]
+            The configuration parameters of the device.
+
+        """
+        return self._bank._documents.read()
+
+    def describe_configuration(self) -> dict[str, Any]:
+        """Describe the device configuration as a Bluesky document.
+
+        The document is shared by all the motors of the bank and cached
+        until the next call to ``OpenWFSMotorBank.configure``.
+
+        Returns
+        -------
+        configuration : dict[str, Any]
+            The configuration parameters of the device.
+
+        """
+        return self._bank._documents.describe()
+
+    @property
+    def current_axis(self) -> str:
+        """The current axis of the motor."""
+        return self.model_info.axis[self._bank._current_axis[self._row]]
+
+    @current_axis.setter
+    def current_axis(self, axis: str) -> None:
+        self._bank._current_axis[self._row] = self._bank._index_of(axis)
+
+    @property
+    def _readback(self) -> npt.NDArray[np.float64]:
+        """The readback of all the axis of the motor; a view of the bank state."""
+        return self._bank._readback[self._row]
+
+    def _index_of(self, axis: str) -> int:
+        return self._bank._index_of(axis)
+
+    @property
+    def bank(self) -> OpenWFSMotorBank:
+        """The bank of the motor."""
+        return self._bank
+
+    @property
+    def model_info(self) -> OpenWFSMotorInfo:
+        """The model information."""
+        return self._bank.model_info
+
+    @property
+    def name(self) -> str:
+        """The name of the motor."""
+        return f"{self._bank.name}-{self._row}"
+
+    @property
+    def parent(self) -> None:
+        """Model parent. For compatibility with Bluesky's ophyd interface."""
+        return None
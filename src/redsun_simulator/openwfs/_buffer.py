@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+__all__ = ["FrameBuffer"]
+
+
+class FrameBuffer:
+    """Preallocated ring buffer of frames.
+
+    Frames are written in place in one of ``size`` preallocated slots
+    and handed out as read-only views, so that steady-state
+    acquisition does not allocate new frames.
+
+    Each written frame is identified by a monotonically increasing index.
+    When the writer wraps around the ring and overwrites a frame that was
+    never read, an overrun is counted.
+
+    Parameters
+    ----------
+    size : ``int``
+        Number of frames in the buffer.
+    shape : ``tuple[int, ...]``
+        Shape of a single frame.
+    dtype : ``npt.DTypeLike``
+        Data type of the frames.
+
+    Notes
+    -----
+    A view returned by :meth:`frame` is only valid until its slot
+    is overwritten, i.e. for the next ``size - 1`` frames;
+    use :meth:`is_valid` to check it, or copy the frame to retain it longer.
+
+    """
+
+    def __init__(self, size: int, shape: tuple[int, ...], dtype: npt.DTypeLike) -> None:
+        if size < 1:
+            raise ValueError("The buffer must contain at least one frame.")
+        self._frames = np.zeros((size, *shape), dtype=dtype)
+        self._lock = threading.Lock()
+        self._written = 0
+        # index of the oldest unread frame
+        self._cursor = 0
+        self._overruns = 0
+
+    def claim(self) -> tuple[int, npt.NDArray[Any]]:
+        """Reserve the next slot for writing.
+
+        Returns
+        -------
+        index : ``int``
+            The index of the frame that will be written.
+        slot : ``npt.NDArray[Any]``
+            A writable view of the slot.
+
+        """
+        with self._lock:
+            index = self._written
+            size = self.size
+            if index - self._cursor >= size:
+                # the oldest unread frame is overwritten
+                self._overruns += 1
+                self._cursor = index - size + 1
+            self._written += 1
+        return index, self._frames[index % size]
+
+    def frame(self, index: int) -> npt.NDArray[Any]:
+        """Return a read-only view of a written frame and mark it as read.
+
+        Parameters
+        ----------
+        index : ``int``
+            The index of the frame, as returned by :meth:`claim`.
+
+        Returns
+        -------
+        frame : ``npt.NDArray[Any]``
+            A read-only view of the frame.
+
+        Raises
+        ------
+        IndexError
+            If the frame was already overwritten or not yet claimed.
+
+        """
+        view = self.peek(index)
+        with self._lock:
+            self._cursor = max(self._cursor, index + 1)
+        return view
+
+    def peek(self, index: int) -> npt.NDArray[Any]:
+        """Return a read-only view of a written frame, without marking it as read.
+
+        Parameters
+        ----------
+        index : ``int``
+            The index of the frame, as returned by :meth:`claim`.
+
+        Returns
+        -------
+        frame : ``npt.NDArray[Any]``
+            A read-only view of the frame.
+
+        Raises
+        ------
+        IndexError
+            If the frame was already overwritten or not yet claimed.
+
+        """
+        if not self.is_valid(index):
+            raise IndexError(f"Frame {index} is not available in the buffer.")
+        view = self._frames[index % self.size]
+        view.flags.writeable = False
+        return view
+
+    def is_valid(self, index: int) -> bool:
+        """Check if the frame with the given index is still in the buffer."""
+        return self._written - self.size <= index < self._written
+
+    @property
+    def size(self) -> int:
+        """Number of frames in the buffer."""
+        return self._frames.shape[0]
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        """Shape of the frames."""
+        return self._frames.shape[1:]  # type: ignore[no-any-return]
+
+    @property
+    def frames_written(self) -> int:
+        """Total number of frames written in the buffer."""
+        return self._written
+
+    @property
+    def pending(self) -> int:
+        """Number of written frames that were not read yet."""
+        return self._written - self._cursor
+
+    @property
+    def overruns(self) -> int:
+        """Number of frames overwritten before being read."""
+        return self._overruns
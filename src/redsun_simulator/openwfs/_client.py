@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import itertools
+import socket
+import threading
+from concurrent.futures import Future
+from typing import Any, Iterator, Mapping, Optional, Sequence, Union
+
+import numpy.typing as npt
+from bluesky.protocols import Location
+from sunflare.engine import Status
+
+from ._rpc import (
+    Address,
+    Command,
+    RemoteError,
+    connect,
+    decode,
+    encode,
+    recv_message,
+    send_message,
+)
+
+__all__ = ["DeviceClient", "MotorProxy", "CameraProxy"]
+
+
+class DeviceClient(Mapping[str, Union["MotorProxy", "CameraProxy"]]):
+    """Connection to a ``DeviceServer``, and mapping of its device proxies.
+
+    Batches of commands are sent with :meth:`submit` or :meth:`call`;
+    several batches can be in flight at once, and their replies are
+    received by a background thread. The proxies of the served devices
+    implement the same Bluesky protocols as the devices themselves.
+
+    Parameters
+    ----------
+    address : ``Address``
+        The address of the server; a Unix socket path or a ``(host, port)`` pair.
+
+    """
+
+    def __init__(self, address: Address) -> None:
+        self._socket = connect(address)
+        self._ids = itertools.count()
+        self._pending: dict[int, Future[list[Any]]] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._receive, name="device-client", daemon=True
+        )
+        self._thread.start()
+        models = self.call([Command("", "list_devices")])[0]
+        self._proxies: dict[str, Union[MotorProxy, CameraProxy]] = {
+            name: (MotorProxy if model == "OpenWFSMotor" else CameraProxy)(self, name)
+            for name, model in models.items()
+        }
+
+    def submit(self, commands: Sequence[Command]) -> Future[list[Any]]:
+        """Send a batch of commands, without waiting for the reply.
+
+        Parameters
+        ----------
+        commands : ``Sequence[Command]``
+            The commands, started in order by the server.
+
+        Returns
+        -------
+        results : ``Future[list[Any]]``
+            The results of the commands, once the statuses they returned
+            are all done; ``None`` for statuses. It fails with a
+            :class:`RemoteError` if any command failed.
+
+        """
+        future: Future[list[Any]] = Future()
+        with self._lock:
+            if self._closed:
+                raise ConnectionError("The client is closed.")
+            request = next(self._ids)
+            self._pending[request] = future
+            buffers: list[npt.NDArray[Any]] = []
+            body = {"id": request, "commands": encode(list(commands), buffers)}
+            try:
+                send_message(self._socket, body, buffers)
+            except OSError:
+                del self._pending[request]
+                raise
+        return future
+
+    def call(
+        self, commands: Sequence[Command], timeout: Optional[float] = None
+    ) -> list[Any]:
+        """Send a batch of commands and wait for their results.
+
+        See :meth:`submit`.
+
+        Raises
+        ------
+        RemoteError
+            If any command failed.
+
+        """
+        return self.submit(commands).result(timeout)
+
+    def close(self) -> None:
+        """Close the connection; pending batches fail with ``ConnectionError``."""
+        with self._lock:
+            self._closed = True
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._thread.join()
+        self._socket.close()
+
+    def __enter__(self) -> DeviceClient:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __getitem__(self, name: str) -> Union[MotorProxy, CameraProxy]:
+        return self._proxies[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._proxies)
+
+    def __len__(self) -> int:
+        return len(self._proxies)
+
+    def _receive(self) -> None:
+        """Complete the pending batches with the replies of the server."""
+        try:
+            while (message := recv_message(self._socket)) is not None:
+                header, buffers = message
+                with self._lock:
+                    future = self._pending.pop(header["id"])
+                # the arrays of the results are views of the received buffers
+                errors = [error for error in header["errors"] if error is not None]
+                if errors:
+                    future.set_exception(RemoteError("; ".join(errors)))
+                else:
+                    future.set_result(decode(header["results"], buffers))
+        except OSError:
+            pass
+        with self._lock:
+            self._closed = True
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(ConnectionError("Lost the connection to the server."))
+
+
+class _DeviceProxy:
+    """Proxy of a device served by a ``DeviceServer``."""
+
+    def __init__(self, client: DeviceClient, name: str) -> None:
+        self._client = client
+        self._name = name
+
+    def _call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        return self._client.call([Command(self._name, method, args, kwargs)])[0]
+
+    def _start(self, method: str, *args: Any) -> Status:
+        """Call a method returning a status, without waiting for it."""
+        status = Status()
+        future = self._client.submit([Command(self._name, method, args)])
+
+        def done(future: Future[list[Any]]) -> None:
+            exc = future.exception()
+            if exc is not None:
+                status.set_exception(exc)  # type: ignore[arg-type]
+            else:
+                status.set_finished()
+
+        future.add_done_callback(done)
+        return status
+
+    def configure(self, name: str, value: Any) -> None:
+        """Configure the device.
+
+        Parameters
+        ----------
+        name : str
+            The name of the configuration parameter.
+        value : Any
+            The value to set the configuration
+
+        """
+        self._call("configure", name, value)
+
+    def read_configuration(self) -> dict[str, Any]:
+        """Read the device configuration as a Bluesky document.
+
+        Returns
+        -------
+        configuration : dict[str, Any]
+            The configuration parameters of the device.
+
+        """
+        return self._call("read_configuration")  # type: ignore[no-any-return]
+
+    def describe_configuration(self) -> dict[str, Any]:
+        """Describe the device configuration as a Bluesky document.
+
+        Returns
+        -------
+        configuration : dict[str, Any]
+            The configuration parameters of the device.
+
+        """
+        return self._call("describe_configuration")  # type: ignore[no-any-return]
+
+    @property
+    def name(self) -> str:
+        """The name of the device."""
+        return self._name
+
+    @property
+    def parent(self) -> None:
+        """Model parent. For compatibility with Bluesky's ophyd interface."""
+        return None
+
+
+class MotorProxy(_DeviceProxy):
+    """Proxy of an ``OpenWFSMotor`` served by a ``DeviceServer``.
+
+    Implements the Bluesky ``Movable``, ``Locatable`` and ``Configurable`` protocols.
+    """
+
+    def set(
+        self,
+        value: Union[float, Mapping[str, float], npt.ArrayLike],
+        axis: Optional[str] = None,
+    ) -> Status:
+        """Start moving the motor to the setpoint.
+
+        See ``OpenWFSMotor.set``; the returned status is marked as
+        finished when the server reports the end of the movement.
+
+        Parameters
+        ----------
+        value : float | Mapping[str, float] | npt.ArrayLike
+            The location to move to.
+        axis : str, optional
+            The axis along which to move a scalar location.
+
+        Returns
+        -------
+        status : Status
+            The status of the movement.
+
+        """
+        return self._start("set", value, axis)
+
+    def locate(self) -> Location[float]:
+        """Return the current location of the motor.
+
+        Returns
+        -------
+        location : Location[float]
+            The current location of the motor.
+
+        """
+        return self._call("locate")  # type: ignore[no-any-return]
+
+
+class CameraProxy(_DeviceProxy):
+    """Proxy of an ``OpenWFSCamera`` served by a ``DeviceServer``.
+
+    Implements the Bluesky ``Triggerable``, ``Readable`` and ``Configurable``
+    protocols. Frames are received as raw bytes and returned as arrays
+    backed by the received buffers, without copies.
+    """
+
+    def trigger(self) -> Status:
+        """Start the acquisition of a frame.
+
+        Returns
+        -------
+        status : Status
+            The status of the acquisition.
+
+        """
+        return self._start("trigger")
+
+    def read(self) -> dict[str, Any]:
+        """Read the last acquired frame.
+
+        Returns
+        -------
+        reading : dict[str, Reading]
+            The last frame, with the time at which it was acquired.
+
+        """
+        return self._call("read")  # type: ignore[no-any-return]
+
+    def describe(self) -> dict[str, Any]:
+        """Describe the data returned by :meth:`read`.
+
+        Returns
+        -------
+        description : dict[str, DataKey]
+            The description of the frame.
+
+        """
+        return self._call("describe")  # type: ignore[no-any-return]
+
+    def acquire_batch(
+        self, n: int, positions: Optional[npt.ArrayLike] = None
+    ) -> npt.NDArray[Any]:
+        """Acquire a burst of frames in a single call.
+
+        See ``OpenWFSCamera.acquire_batch``.
+
+        Parameters
+        ----------
+        n : int
+            The number of frames.
+        positions : npt.ArrayLike, optional
+            Positions of the focus stage in micrometers, shape ``(n,)``.
+
+        Returns
+        -------
+        frames : npt.NDArray[Any]
+            The acquired frames.
+
+        """
+        return self._call("acquire_batch", n, positions)  # type: ignore[no-any-return]
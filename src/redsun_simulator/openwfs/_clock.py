@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from typing import Optional
+
+__all__ = ["Clock", "ScaledClock", "VirtualClock", "get_clock", "set_clock"]
+
+
+class Clock:
+    """Source of time of the simulated devices.
+
+    All the simulated delays (movements, shutdowns, frame periods)
+    and all the timestamps of the devices go through a clock.
+    The base class follows the wall clock; subclasses accelerate
+    or virtualize the simulated time.
+    """
+
+    def monotonic(self) -> float:
+        """Return the simulated monotonic time in seconds.
+
+        Deadlines of the simulated operations are expressed in this reference.
+        """
+        return time.monotonic()
+
+    def time(self) -> float:
+        """Return the simulated time since the epoch in seconds.
+
+        Used for the timestamps of readings and events.
+        """
+        return time.time()
+
+    def delay_until(self, deadline: float) -> float:
+        """Return the real time to wait before checking a simulated deadline again.
+
+        Waiting for a deadline is a loop: wait for the returned delay
+        and call this method again, until it returns 0.
+
+        Parameters
+        ----------
+        deadline : ``float``
+            The deadline, in the :meth:`monotonic` reference.
+
+        Returns
+        -------
+        delay : ``float``
+            The number of (real) seconds to wait; 0 if the deadline has passed.
+
+        """
+        return max(0.0, deadline - self.monotonic())
+
+    def sleep(self, seconds: float) -> None:
+        """Block the calling thread for ``seconds`` of simulated time.
+
+        Parameters
+        ----------
+        seconds : ``float``
+            The simulated duration.
+
+        """
+        deadline = self.monotonic() + seconds
+        while (delay := self.delay_until(deadline)) > 0.0:
+            time.sleep(delay)
+
+
+class ScaledClock(Clock):
+    """Clock running ``factor`` times faster than the wall clock.
+
+    Relative timings are preserved: a movement of 1 s with a factor
+    of 100 completes after 10 ms, and the timestamps of the devices
+    are 1 s apart.
+
+    Parameters
+    ----------
+    factor : ``float``
+        Speed-up factor of the simulated time; must be positive.
+
+    """
+
+    def __init__(self, factor: float) -> None:
+        if factor <= 0.0:
+            raise ValueError("The time scale factor must be positive.")
+        self._factor = float(factor)
+        self._origin = time.monotonic()
+        self._epoch = time.time()
+
+    @property
+    def factor(self) -> float:
+        """Speed-up factor of the simulated time."""
+        return self._factor
+
+    def monotonic(self) -> float:
+        """Return the simulated monotonic time in seconds."""
+        return self._origin + (time.monotonic() - self._origin) * self._factor
+
+    def time(self) -> float:
+        """Return the simulated time since the epoch in seconds."""
+        return self._epoch + (time.monotonic() - self._origin) * self._factor
+
+    def delay_until(self, deadline: float) -> float:
+        """Return the real time to wait until a simulated deadline."""
+        return max(0.0, deadline - self.monotonic()) / self._factor
+
+
+class VirtualClock(Clock):
+    """Discrete-event clock, advanced only by the simulated operations.
+
+    The time never advances by itself. Once the simulation is idle,
+    i.e. no new deadline was awaited for ``settle`` seconds of real time,
+    the clock jumps to the earliest awaited deadline. Operations started
+    one after the other, such as the moves of a ``bps.mv`` of several
+    motors, therefore start at the same simulated time and overlap,
+    and long plans run about as fast as the simulation can compute them.
+
+    Parameters
+    ----------
+    start : ``float``, optional
+        The initial time since the epoch in seconds.
+        Default is the current wall time.
+    settle : ``float``, optional
+        Real time in seconds without new awaited deadlines after which
+        the clock jumps to the next deadline. Operations started further
+        apart than ``settle`` may not overlap. Default is 0.01.
+
+    """
+
+    def __init__(self, start: Optional[float] = None, settle: float = 0.01) -> None:
+        if settle <= 0.0:
+            raise ValueError("The settle time must be positive.")
+        self._epoch = time.time() if start is None else float(start)
+        self._now = 0.0
+        self._settle = float(settle)
+        # deadlines awaited in the future, and the real time of the last new one
+        self._deadlines: list[float] = []
+        self._awaited: set[float] = set()
+        self._active = time.monotonic()
+        self._lock = threading.Lock()
+
+    def monotonic(self) -> float:
+        """Return the simulated monotonic time in seconds."""
+        return self._now
+
+    def time(self) -> float:
+        """Return the simulated time since the epoch in seconds."""
+        return self._epoch + self._now
+
+    def delay_until(self, deadline: float) -> float:
+        """Return the real time to wait before checking a simulated deadline again.
+
+        If the simulation is idle, the clock first jumps to the earliest
+        awaited deadline; the other waiters are then given ``settle``
+        seconds to react before the next jump.
+        """
+        with self._lock:
+            if deadline <= self._now:
+                return 0.0
+            real = time.monotonic()
+            if deadline not in self._awaited:
+                self._awaited.add(deadline)
+                heapq.heappush(self._deadlines, deadline)
+                self._active = real
+            idle = real - self._active
+            if idle < self._settle:
+                return self._settle - idle
+            self._set_now(self._deadlines[0])
+            self._active = real
+            return 0.0 if deadline <= self._now else self._settle
+
+    def advance(self, seconds: float) -> None:
+        """Advance the clock by ``seconds``.
+
+        Parameters
+        ----------
+        seconds : ``float``
+            The simulated duration; must not be negative.
+
+        """
+        if seconds < 0.0:
+            raise ValueError("The time cannot go backwards.")
+        with self._lock:
+            self._set_now(self._now + seconds)
+
+    @property
+    def settle(self) -> float:
+        """Real time without new awaited deadlines before the clock jumps."""
+        return self._settle
+
+    def _set_now(self, now: float) -> None:
+        """Move the time forward, forgetting the deadlines reached."""
+        self._now = now
+        while self._deadlines and self._deadlines[0] <= now:
+            self._awaited.discard(heapq.heappop(self._deadlines))
+
+
+_clock = Clock()
+
+
+def get_clock() -> Clock:
+    """Return the default clock of the simulated devices."""
+    return _clock
+
+
+def set_clock(clock: Clock) -> None:
+    """Set the default clock of the simulated devices.
+
+    Only devices created afterwards use the new clock.
+
+    Parameters
+    ----------
+    clock : ``Clock``
+        The new default clock.
+
+    """
+    global _clock
+    _clock = clock
@@ -1,8 +1,39 @@
-from attrs import converters, define, field, setters, validators
+from collections.abc import Sized
+from typing import Any, Optional
+
+from attrs import asdict, converters, define, field, setters, validators
 from sunflare.config import ModelInfo
 
 __all__ = ["OpenWFSMotorInfo", "OpenWFSCameraInfo"]
 
+_DTYPES = {
+    str: "string",
+    float: "number",
+    int: "integer",
+    bool: "boolean",
+    list: "array",
+    tuple: "array",
+    dict: "array",
+}
+
+
+def _describe_configuration(info: ModelInfo) -> dict[str, Any]:
+    """Describe the model information as a Bluesky configuration dictionary.
+
+    Equivalent to :meth:`sunflare.config.ModelInfo.describe_configuration`,
+    but it also supports dictionary fields (e.g. per-axis values or nested
+    ``attrs`` classes), which are described as arrays.
+    """
+    return {
+        key: {
+            "source": "model_info",
+            "dtype": _DTYPES[type(value)],
+            "shape": [len(value)] if isinstance(value, Sized) else [],
+        }
+        for key, value in asdict(info).items()
+        if key != "model_name"
+    }
+
 
 @define(kw_only=True)
 class OpenWFSMotorInfo(ModelInfo):
@@ -21,11 +52,20 @@ class OpenWFSMotorInfo(ModelInfo):
     egu : ``str``
         - Engineering units for the motor.
     setpoint_time : ``float``, optional
-        - Time required to simulate the motor moving to the setpoint in seconds.
+        - Time required to simulate the motor settling on the setpoint in seconds.
+        - It is added to the travel time of each movement.
         - Default is 0.1 seconds.
     shutdown_time : ``float``, optional
         - Time required to simulate the motor shutdown in seconds.
         - Default is 0.5 seconds.
+    velocity : ``float``, optional
+        - Maximum velocity of the motor in engineering units per second.
+        - If 0, the travel is instantaneous and only ``setpoint_time`` is simulated.
+        - Default is 0.0.
+    acceleration : ``float``, optional
+        - Acceleration of the motor in engineering units per second squared.
+        - If 0, the motor reaches ``velocity`` instantly.
+        - Default is 0.0.
 
     """
 
@@ -34,6 +74,19 @@ class OpenWFSMotorInfo(ModelInfo):
     egu: str = field(validator=validators.instance_of(str), on_setattr=setters.frozen)
     setpoint_time: float = field(default=0.1)
     shutdown_time: float = field(default=0.5)
+    velocity: float = field(default=0.0)
+    acceleration: float = field(default=0.0)
+
+    def describe_configuration(self) -> dict[str, Any]:
+        """Describe the model information as a Bluesky configuration dictionary.
+
+        Returns
+        -------
+        ``dict[str, Any]``
+            A dictionary containing the model information description.
+
+        """
+        return _describe_configuration(self)
 
     @axis.validator
     def _validate_axis(self, _: str, value: list[str]) -> None:
@@ -54,9 +107,10 @@ class OpenWFSMotorInfo(ModelInfo):
 class Specimen:
     """Container for specimen information.
 
-    It is used in conjunction with
-    :class:``openwfs.simulation.StaticSource``
-    to generate a fake moving sample.
+    It is used to generate a fake moving sample
+    of random emitters, which is computed lazily in tiles
+    as the field of view of the camera moves over it,
+    or to image a sample loaded from ``path``.
 
     Parameters
     ----------
@@ -70,6 +124,20 @@ class Specimen:
         Numerical aperture of the microscope objective.
     wavelength: ``float``
         Wavelength of the light source in nanometers.
+    seed: ``int``, optional
+        Seed of the random specimen; the same seed always
+        generates the same specimen. Default is 0.
+    tile_size: ``int``, optional
+        Size in pixels of the square tiles in which the specimen
+        is generated. Default is 512.
+    cache_tiles: ``int``, optional
+        Maximum number of generated tiles kept in memory. Default is 64.
+    path: ``str``, optional
+        Path to a 2D specimen image (``.npy``, uncompressed ``.tif``
+        or ``.zarr``), memory-mapped rather than loaded in memory.
+        When set, ``resolution``, ``seed``, ``tile_size`` and ``cache_tiles``
+        are ignored and the shape of the image is used.
+        Default is an empty string (random specimen).
 
     """
 
@@ -82,6 +150,69 @@ class Specimen:
     magnification: int = field(validator=validators.instance_of(int))
     numerical_aperture: float = field(validator=validators.instance_of(float))
     wavelength: float = field(validator=validators.instance_of(float))
+    seed: int = field(
+        default=0, validator=validators.instance_of(int), on_setattr=setters.frozen
+    )
+    tile_size: int = field(
+        default=512,
+        validator=[validators.instance_of(int), validators.gt(0)],
+        on_setattr=setters.frozen,
+    )
+    cache_tiles: int = field(
+        default=64,
+        validator=[validators.instance_of(int), validators.gt(0)],
+        on_setattr=setters.frozen,
+    )
+    path: str = field(
+        default="", validator=validators.instance_of(str), on_setattr=setters.frozen
+    )
+
+
+@define
+class Noise:
+    """Container for the sensor noise model.
+
+    Signals are expressed in photoelectrons, with one photoelectron
+    per digital count.
+
+    Parameters
+    ----------
+    shot_noise: ``bool``, optional
+        Whether to draw Poisson (shot) noise. Default is ``True``.
+    gaussian_threshold: ``float``, optional
+        Signal above which Poisson noise is approximated by Gaussian noise
+        of the same variance, which is faster to draw; ``.inf`` always draws
+        Poisson noise. Default is 100.0.
+    read_noise: ``float``, optional
+        Standard deviation of the Gaussian read noise. Default is 0.0.
+    dark_current: ``float``, optional
+        Mean dark signal of each pixel in each frame, subject to shot noise.
+        Default is 0.0.
+    seed: ``int``, optional
+        Seed of the noise; the same seed always draws the same noise
+        for the same sequence of frames. Default is ``None`` (random seed).
+    threads: ``int``, optional
+        Number of threads drawing the noise; 0 uses all the CPUs. The threads
+        are shared by all the cameras, at most one per CPU. Default is 0.
+
+    """
+
+    shot_noise: bool = field(default=True, validator=validators.instance_of(bool))
+    gaussian_threshold: float = field(
+        default=100.0, converter=float, validator=validators.ge(0.0)
+    )
+    read_noise: float = field(
+        default=0.0, converter=float, validator=validators.ge(0.0)
+    )
+    dark_current: float = field(
+        default=0.0, converter=float, validator=validators.ge(0.0)
+    )
+    seed: Optional[int] = field(
+        default=None, validator=validators.optional(validators.instance_of(int))
+    )
+    threads: int = field(
+        default=0, validator=[validators.instance_of(int), validators.ge(0)]
+    )
 
 
 @define(kw_only=True)
@@ -100,6 +231,41 @@ class OpenWFSCameraInfo(ModelInfo):
         Shape of the detector sensor.
     pixel_size : ``tuple[float, float, float]``
         Detector pixel size.
+    buffer_size : ``int``, optional
+        Number of frames in the preallocated frame ring buffer.
+        If 0, each frame is allocated independently.
+        Default is 0.
+    frame_rate : ``float``, optional
+        Target frame rate of the continuous acquisition in frames per second.
+        If 0, frames are produced as fast as possible.
+        Default is 0.0.
+    stream_queue_size : ``int``, optional
+        Maximum number of frames of the continuous acquisition
+        waiting to be retrieved; older frames are dropped.
+        Default is 8.
+    stream_workers : ``int``, optional
+        Number of threads rendering frames during the continuous acquisition.
+        Default is 1.
+    bit_depth : ``int``, optional
+        Resolution of the analog-to-digital converter in bits (1 to 16);
+        frames contain values between 0 and ``2**bit_depth - 1``.
+        Default is 8.
+    dtype : ``str``, optional
+        Data type of the frames; either ``"uint8"`` or ``"uint16"``.
+        It must be wide enough to store ``bit_depth`` bits.
+        Default is ``"uint16"``.
+    roi : ``tuple[int, int, int, int]``, optional
+        Region of interest of the sensor read out, as
+        ``(top, left, height, width)`` in sensor pixels; a height or width
+        of 0 extends the region to the edge of the sensor.
+        Default is ``(0, 0, 0, 0)``, the whole sensor.
+    binning : ``int``, optional
+        Number of sensor pixels summed along each direction into a frame
+        pixel; either 1, 2 or 4. The size of the region of interest
+        must be a multiple of the binning.
+        Default is 1.
+    noise : ``Noise``, optional
+        The sensor noise model. Default is shot noise only.
 
     """
 
@@ -115,6 +281,60 @@ class OpenWFSCameraInfo(ModelInfo):
     pixel_size: tuple[float, float, float] = field(
         converter=tuple[float, float, float], on_setattr=setters.frozen
     )
+    buffer_size: int = field(
+        default=0, validator=validators.instance_of(int), on_setattr=setters.frozen
+    )
+    frame_rate: float = field(default=0.0, validator=validators.ge(0))
+    stream_queue_size: int = field(
+        default=8, validator=[validators.instance_of(int), validators.ge(1)]
+    )
+    stream_workers: int = field(
+        default=1, validator=[validators.instance_of(int), validators.ge(1)]
+    )
+    bit_depth: int = field(
+        default=8,
+        validator=[validators.instance_of(int), validators.ge(1), validators.le(16)],
+        on_setattr=setters.frozen,
+    )
+    dtype: str = field(
+        default="uint16",
+        validator=validators.in_(("uint8", "uint16")),
+        on_setattr=setters.frozen,
+    )
+    roi: tuple[int, int, int, int] = field(default=(0, 0, 0, 0), converter=tuple)
+    binning: int = field(default=1, validator=validators.in_((1, 2, 4)))
+    noise: Noise = field(
+        factory=Noise,
+        converter=converters.pipe(lambda x: x if isinstance(x, Noise) else Noise(**x)),
+    )
+
+    @property
+    def readout_region(self) -> tuple[int, int, int, int]:
+        """The region of the sensor read out, as ``(top, left, height, width)``."""
+        top, left, height, width = self.roi
+        return (
+            top,
+            left,
+            height or self.sensor_shape[0] - top,
+            width or self.sensor_shape[1] - left,
+        )
+
+    @property
+    def frame_shape(self) -> tuple[int, int]:
+        """The shape of the frames, after binning of the region of interest."""
+        _, _, height, width = self.readout_region
+        return height // self.binning, width // self.binning
+
+    def describe_configuration(self) -> dict[str, Any]:
+        """Describe the model information as a Bluesky configuration dictionary.
+
+        Returns
+        -------
+        ``dict[str, Any]``
+            A dictionary containing the model information description.
+
+        """
+        return _describe_configuration(self)
 
     @sensor_shape.validator
     def _validate_sensor_shape(
@@ -125,6 +345,40 @@ class OpenWFSCameraInfo(ModelInfo):
         if len(value) != 2:
             raise ValueError("The tuple must contain exactly two values.")
 
+    @dtype.validator
+    def _validate_dtype(self, _: str, value: str) -> None:
+        bits = 8 if value == "uint8" else 16
+        if self.bit_depth > bits:
+            raise ValueError(
+                f"A bit depth of {self.bit_depth} does not fit in {value} frames."
+            )
+
+    @roi.validator
+    def _validate_roi(self, _: tuple[int, ...], value: tuple[int, ...]) -> None:
+        self._validate_readout(value, self.binning)
+
+    @binning.validator
+    def _validate_binning(self, _: int, value: int) -> None:
+        self._validate_readout(self.roi, value)
+
+    def _validate_readout(self, roi: tuple[int, ...], binning: int) -> None:
+        if len(roi) != 4 or not all(isinstance(val, int) and val >= 0 for val in roi):
+            raise ValueError("The ROI must contain four non-negative integers.")
+        top, left, height, width = roi
+        for offset, size, extent in (
+            (top, height, self.sensor_shape[0]),
+            (left, width, self.sensor_shape[1]),
+        ):
+            size = size or extent - offset
+            if size <= 0 or offset + size > extent:
+                raise ValueError(
+                    f"The ROI {roi} exceeds the sensor shape {self.sensor_shape}."
+                )
+            if size % binning != 0:
+                raise ValueError(
+                    f"The size of the ROI {roi} is not a multiple of the binning {binning}."
+                )
+
     @pixel_size.validator
     def _validate_pixel_size(
         self, _: tuple[float, ...], value: tuple[float, ...]
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Union
+
+import astropy.units as u
+from astropy.units import Quantity
+
+if TYPE_CHECKING:
+    from ._bank import BankMotor
+    from ._model import OpenWFSMotor
+
+__all__ = ["MotorAxis", "MotorXYStage", "MotorZStage"]
+
+
+class MotorAxis:
+    """Readback of a single motor axis as a physical quantity.
+
+    Parameters
+    ----------
+    motor : ``Union[OpenWFSMotor, BankMotor]``
+        The motor.
+    axis : ``str``
+        The axis of the motor.
+
+    Raises
+    ------
+    IndexError
+        If ``axis`` is not an axis of ``motor``.
+    ValueError
+        If the engineering units of ``motor`` are not a length.
+
+    """
+
+    def __init__(self, motor: Union[OpenWFSMotor, BankMotor], axis: str) -> None:
+        self._motor = motor
+        self._index = motor._index_of(axis)
+        self._unit = u.Unit(motor.model_info.egu)
+        if not self._unit.is_equivalent(u.m):
+            raise ValueError(
+                f"The units of {motor.name} ({self._unit}) are not a length."
+            )
+
+    @property
+    def position(self) -> Quantity:
+        """The current readback of the axis."""
+        return float(self._motor._readback[self._index]) * self._unit
+
+
+class MotorXYStage:
+    """Lateral stage of the simulated microscope driven by motor axis.
+
+    Replaces the ``xy_stage`` of :class:`openwfs.simulation.Microscope`;
+    the specimen follows the readback of the motors.
+    An axis set to ``None`` is kept at 0.
+
+    Parameters
+    ----------
+    x : ``MotorAxis``, optional
+        Axis moving the specimen along the sensor columns.
+    y : ``MotorAxis``, optional
+        Axis moving the specimen along the sensor rows.
+
+    """
+
+    def __init__(
+        self, x: Optional[MotorAxis] = None, y: Optional[MotorAxis] = None
+    ) -> None:
+        self._x = x
+        self._y = y
+
+    @property
+    def x(self) -> Quantity:
+        """Position of the stage along the sensor columns."""
+        return self._x.position if self._x is not None else 0.0 * u.um
+
+    @property
+    def y(self) -> Quantity:
+        """Position of the stage along the sensor rows."""
+        return self._y.position if self._y is not None else 0.0 * u.um
+
+
+class MotorZStage:
+    """Focus stage of the simulated microscope driven by a motor axis.
+
+    Replaces the ``z_stage`` of :class:`openwfs.simulation.Microscope`;
+    the readback of the motor defocuses the image.
+
+    Parameters
+    ----------
+    z : ``MotorAxis``
+        Axis moving the specimen along the optical axis.
+
+    """
+
+    def __init__(self, z: MotorAxis) -> None:
+        self._z = z
+
+    @property
+    def position(self) -> Quantity:
+        """Position of the stage along the optical axis."""
+        return self._z.position
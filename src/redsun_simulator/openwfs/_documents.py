@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from sunflare.log import get_logger
+
+if TYPE_CHECKING:
+    from sunflare.config import ModelInfo
+
+__all__ = ["ConfigurationDocuments", "ConfigurationCallback"]
+
+#: callback notified of a configuration change, with the name and new value
+#: of the configuration parameter
+ConfigurationCallback = Callable[[str, Any], None]
+
+
+class ConfigurationDocuments:
+    """Versioned cache of the Bluesky configuration documents of a device.
+
+    The documents returned by :meth:`read` and :meth:`describe` are
+    generated from the model information once per version; :meth:`changed`
+    starts a new version and notifies the subscribed callbacks. The
+    cached documents are shared and must not be modified.
+
+    Parameters
+    ----------
+    model_info : ``ModelInfo``
+        The model information of the device; it must only be
+        modified through the ``configure`` method of the device.
+
+    """
+
+    def __init__(self, model_info: ModelInfo) -> None:
+        self._model_info = model_info
+        self._version = 0
+        self._read: Optional[dict[str, Any]] = None
+        self._describe: Optional[dict[str, Any]] = None
+        self._callbacks: list[ConfigurationCallback] = []
+        self._lock = threading.Lock()
+
+    def read(self) -> dict[str, Any]:
+        """Return the configuration document of the current version."""
+        with self._lock:
+            if self._read is None:
+                self._read = self._model_info.read_configuration()
+            return self._read
+
+    def describe(self) -> dict[str, Any]:
+        """Return the configuration description of the current version."""
+        with self._lock:
+            if self._describe is None:
+                self._describe = self._model_info.describe_configuration()
+            return self._describe
+
+    def changed(self, name: str) -> None:
+        """Start a new version after a change of the parameter ``name``.
+
+        The subscribed callbacks are called, in the calling thread, with
+        the name and the new value of the parameter; exceptions raised
+        by callbacks are logged.
+        """
+        with self._lock:
+            self._version += 1
+            self._read = None
+            self._describe = None
+            callbacks = list(self._callbacks)
+        value = getattr(self._model_info, name)
+        for callback in callbacks:
+            try:
+                callback(name, value)
+            except Exception:
+                get_logger().exception(
+                    f"Error in configuration callback {callback!r} for {name}"
+                )
+
+    def subscribe(self, callback: ConfigurationCallback) -> None:
+        """Call ``callback`` on each configuration change."""
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def unsubscribe(self, callback: ConfigurationCallback) -> None:
+        """Stop calling ``callback``; unknown callbacks are ignored."""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    @property
+    def version(self) -> int:
+        """Number of configuration changes."""
+        return self._version
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import copy
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator, Mapping, Optional, Union
+
+import yaml
+
+from ._config import OpenWFSCameraInfo, OpenWFSMotorInfo
+
+if TYPE_CHECKING:
+    from functools import _CacheInfo
+
+    from sunflare.config import ModelInfo
+
+    from ._clock import Clock
+
+__all__ = ["DeviceRegistry", "load_devices", "config_cache_clear", "config_cache_info"]
+
+#: model information class of each supported ``model_name``
+_MODEL_INFO: dict[str, type[ModelInfo]] = {
+    "OpenWFSMotor": OpenWFSMotorInfo,
+    "OpenWFSCamera": OpenWFSCameraInfo,
+}
+
+_Loader: Any = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=16)
+def _parse_models(content: bytes) -> dict[str, ModelInfo]:
+    """Parse and validate the ``models`` of a configuration file.
+
+    The result is cached by file content; it must not be modified.
+    """
+    document = yaml.load(content, Loader=_Loader) or {}
+    models = document.get("models") or {}
+    infos: dict[str, ModelInfo] = {}
+    for name, values in models.items():
+        model_name = values.get("model_name")
+        try:
+            info_class = _MODEL_INFO[model_name]
+        except KeyError:
+            raise ValueError(
+                f"Unsupported model {model_name!r} for device {name!r}; "
+                f"expected one of {sorted(_MODEL_INFO)}."
+            ) from None
+        infos[name] = info_class(**values)
+    return infos
+
+
+def config_cache_info() -> _CacheInfo:
+    """Return the hit/miss statistics of the configuration cache."""
+    return _parse_models.cache_info()
+
+
+def config_cache_clear() -> None:
+    """Clear the configuration cache."""
+    _parse_models.cache_clear()
+
+
+class DeviceRegistry(Mapping[str, Any]):
+    """Devices of a configuration file, constructed on first access.
+
+    A mapping from the device names to the devices; a device is only
+    constructed, with its own copy of its model information, the first
+    time it is retrieved.
+
+    Parameters
+    ----------
+    infos : ``Mapping[str, ModelInfo]``
+        The validated model information of the devices; it is not modified.
+    clock : ``Clock``, optional
+        The clock of the devices. Default is the clock returned by ``get_clock``.
+
+    """
+
+    def __init__(
+        self, infos: Mapping[str, ModelInfo], clock: Optional[Clock] = None
+    ) -> None:
+        self._templates = infos
+        self._clock = clock
+        self._infos: dict[str, ModelInfo] = {}
+        self._devices: dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def model_info(self, name: str) -> ModelInfo:
+        """Return the model information of a device, without constructing it.
+
+        Parameters
+        ----------
+        name : ``str``
+            The name of the device.
+
+        Returns
+        -------
+        info : ``ModelInfo``
+            The model information used to construct the device.
+
+        """
+        with self._lock:
+            info = self._infos.get(name)
+            if info is None:
+                info = self._infos[name] = copy.deepcopy(self._templates[name])
+            return info
+
+    def __getitem__(self, name: str) -> Any:
+        with self._lock:
+            device = self._devices.get(name)
+            if device is None:
+                device = self._devices[name] = self._build(name)
+            return device
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._templates)
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def _build(self, name: str) -> Any:
+        info = self.model_info(name)
+        if isinstance(info, OpenWFSMotorInfo):
+            from ._model import OpenWFSMotor
+
+            return OpenWFSMotor(name, info, clock=self._clock)
+        from ._model import OpenWFSCamera
+
+        return OpenWFSCamera(name, info, clock=self._clock)
+
+    @property
+    def constructed(self) -> list[str]:
+        """Names of the devices constructed so far."""
+        return list(self._devices)
+
+
+def load_devices(
+    path: Union[str, Path], *, clock: Optional[Clock] = None
+) -> DeviceRegistry:
+    """Load the devices of a configuration file.
+
+    The ``models`` section of the file maps device names to their model
+    information, selected by ``model_name`` (``OpenWFSMotor`` or
+    ``OpenWFSCamera``). The file is parsed and validated once; loading
+    a file with the same content again reuses the cached model information.
+    Devices are constructed on first access.
+
+    Parameters
+    ----------
+    path : ``Union[str, Path]``
+        The configuration file.
+    clock : ``Clock``, optional
+        The clock of the devices. Default is the clock returned by ``get_clock``.
+
+    Returns
+    -------
+    devices : ``DeviceRegistry``
+        The devices, by name.
+
+    Raises
+    ------
+    ValueError
+        If a model is not supported.
+
+    """
+    return DeviceRegistry(_parse_models(Path(path).read_bytes()), clock)
@@ -0,0 +1,400 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import threading
+from multiprocessing.connection import Connection, wait
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING, Any, Iterator, Mapping, Optional
+
+import numpy as np
+import numpy.typing as npt
+from sunflare.engine import Status
+from sunflare.log import get_logger
+
+from ._clock import Clock, get_clock
+
+if TYPE_CHECKING:
+    from multiprocessing.queues import Queue
+
+    from bluesky.protocols import Reading
+    from event_model.documents.event_descriptor import DataKey
+
+    from ._config import OpenWFSCameraInfo
+    from ._model import OpenWFSCamera
+
+__all__ = ["CameraFarm", "RemoteCamera"]
+
+#: description of a camera served by a worker process:
+#: name, model information, shared memory block and number of slots
+_CameraSpec = tuple[str, "OpenWFSCameraInfo", str, int]
+
+
+def _render(
+    camera: OpenWFSCamera, frames: npt.NDArray[Any], index: int
+) -> Optional[str]:
+    """Render a frame of ``camera`` in the slot ``index % slots`` of ``frames``.
+
+    Returns the representation of the error raised by the camera, if any.
+    """
+    try:
+        data = camera._crop.trigger(immediate=True).result()
+        camera._digitize(camera._bin(data), frames[index % frames.shape[0]])
+    except Exception as exc:
+        return repr(exc)
+    return None
+
+
+def _serve(
+    specs: list[_CameraSpec],
+    commands: Queue[Optional[tuple[str, int]]],
+    results: Connection,
+) -> None:
+    """Render the frames of a group of cameras in a worker process.
+
+    Each command ``(name, index)`` renders a frame of camera ``name``
+    directly in the slot ``index % slots`` of its shared memory block.
+    ``None`` stops the worker. Results ``(name, index, error)`` are sent
+    through ``results``; cameras that cannot be built report the error
+    to every command.
+    """
+    from ._model import OpenWFSCamera
+
+    cameras: dict[str, tuple[OpenWFSCamera, npt.NDArray[Any]]] = {}
+    errors: dict[str, str] = {}
+    blocks: list[SharedMemory] = []
+    for name, info, block_name, slots in specs:
+        try:
+            # the block is owned (and unlinked) by the parent process; spawned
+            # workers share its resource tracker, so it is tracked only once
+            block = SharedMemory(name=block_name)
+            blocks.append(block)
+            cameras[name] = (
+                OpenWFSCamera(name, info),
+                np.ndarray(
+                    (slots, *info.frame_shape), dtype=info.dtype, buffer=block.buf
+                ),
+            )
+        except Exception as exc:
+            errors[name] = repr(exc)
+
+    while (command := commands.get()) is not None:
+        name, index = command
+        if name in errors:
+            results.send((name, index, errors[name]))
+        else:
+            results.send((name, index, _render(*cameras[name], index)))
+
+    # views on the shared memory must be released before closing it
+    cameras.clear()
+    for block in blocks:
+        block.close()
+    results.close()
+
+
+class RemoteCamera:
+    """Proxy of an ``OpenWFSCamera`` rendered in a worker process of a :class:`CameraFarm`.
+
+    Implements the Bluesky ``Triggerable`` and ``Readable`` protocols.
+    Frames are read as read-only views of a shared memory ring of frames,
+    without copies; a view is overwritten after ``slots`` acquisitions.
+    Acquisitions fail once the worker process has exited.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model_info: OpenWFSCameraInfo,
+        frames: npt.NDArray[Any],
+        commands: Queue[Optional[tuple[str, int]]],
+    ) -> None:
+        self._name = name
+        self._model_info = model_info
+        self._frames = frames
+        self._frames.flags.writeable = False
+        self._commands = commands
+        self._lock = threading.Lock()
+        self._requested = 0
+        self._pending: dict[int, Status] = {}
+        self._error: Optional[str] = None
+        self._last_index: Optional[int] = None
+        self._timestamp = 0.0
+
+    def trigger(self) -> Status:
+        """Start the acquisition of a frame in the worker process.
+
+        Returns
+        -------
+        status : Status
+            The status of the acquisition;
+            it is marked as finished when the frame is available.
+
+        """
+        s = Status()
+        with self._lock:
+            error = self._error
+            if error is None:
+                index = self._requested
+                self._requested += 1
+                self._pending[index] = s
+        if error is not None:
+            s.set_exception(RuntimeError(f"{self.name}: {error}"))
+            return s
+        self._commands.put((self.name, index))
+        return s
+
+    def read(self) -> dict[str, Reading[npt.NDArray[Any]]]:
+        """Read the last acquired frame.
+
+        If no frame was acquired yet, one is acquired synchronously.
+
+        Returns
+        -------
+        reading : dict[str, Reading[npt.NDArray[Any]]]
+            The last frame, with the time at which it was acquired.
+
+        """
+        if self._last_index is None:
+            self.trigger().wait()
+        assert self._last_index is not None
+        frame = self._frames[self._last_index % self._frames.shape[0]]
+        return {self.name: {"value": frame, "timestamp": self._timestamp}}
+
+    def describe(self) -> dict[str, DataKey]:
+        """Describe the data returned by :meth:`read`.
+
+        Returns
+        -------
+        description : dict[str, DataKey]
+            The description of the frame.
+
+        """
+        return {
+            self.name: {
+                "source": "data",
+                "dtype": "array",
+                "shape": list(self.model_info.frame_shape),
+                "dtype_numpy": np.dtype(self.model_info.dtype).str,
+            }
+        }
+
+    def read_configuration(self) -> dict[str, Any]:
+        """Read the device configuration as a Bluesky document.
+
+        Returns
+        -------
+        configuration : dict[str, Any]
+            The configuration parameters of the device.
+
+        """
+        return self.model_info.read_configuration()
+
+    def describe_configuration(self) -> dict[str, Any]:
+        """Describe the device configuration as a Bluesky document.
+
+        Returns
+        -------
+        configuration : dict[str, Any]
+            The configuration parameters of the device.
+
+        """
+        return self.model_info.describe_configuration()
+
+    def _finish(self, index: int, timestamp: float, error: Optional[str]) -> None:
+        """Mark the acquisition ``index`` as finished."""
+        with self._lock:
+            status = self._pending.pop(index, None)
+        if status is None:
+            # already failed because the worker process exited
+            return
+        if error is not None:
+            status.set_exception(RuntimeError(f"{self.name}: {error}"))
+            return
+        if self._last_index is None or index > self._last_index:
+            self._last_index = index
+            self._timestamp = timestamp
+        status.set_finished()
+
+    def _fail(self, error: str) -> None:
+        """Fail the pending and all the following acquisitions with ``error``."""
+        with self._lock:
+            self._error = error
+            pending, self._pending = self._pending, {}
+        for status in pending.values():
+            status.set_exception(RuntimeError(f"{self.name}: {error}"))
+
+    @property
+    def name(self) -> str:
+        """The name of the camera."""
+        return self._name
+
+    @property
+    def parent(self) -> None:
+        """Model parent. For compatibility with Bluesky's ophyd interface."""
+        return None
+
+    @property
+    def model_info(self) -> OpenWFSCameraInfo:
+        """The model information."""
+        return self._model_info
+
+
+class CameraFarm(Mapping[str, RemoteCamera]):
+    """Pool of worker processes rendering simulated cameras.
+
+    Cameras are distributed over the worker processes, which build
+    their ``OpenWFSCamera`` instances from the (picklable) model
+    information. Frames are rendered directly into shared memory and
+    delivered to the parent process without pickling or copying, so that
+    multiple cameras render in parallel without contending for the GIL.
+
+    Frames are timestamped with ``clock`` when they are delivered to
+    the parent process. When a worker process exits, the pending and
+    following acquisitions of its cameras fail.
+
+    The farm is a mapping from camera names to :class:`RemoteCamera` proxies.
+    It should be closed when no longer needed, e.g. by using it as
+    a context manager.
+
+    Parameters
+    ----------
+    model_info : ``Mapping[str, OpenWFSCameraInfo]``
+        The cameras, by name.
+    processes : ``int``, optional
+        Number of worker processes.
+        Default is the number of cameras, up to the number of CPUs.
+    slots : ``int``, optional
+        Number of frames in the shared memory ring of each camera.
+        Default is 4.
+    clock : ``Clock``, optional
+        The clock of the simulation. Default is the clock returned by ``get_clock``.
+
+    """
+
+    def __init__(
+        self,
+        model_info: Mapping[str, OpenWFSCameraInfo],
+        processes: Optional[int] = None,
+        slots: int = 4,
+        *,
+        clock: Optional[Clock] = None,
+    ) -> None:
+        if slots < 1:
+            raise ValueError("At least one frame slot is required.")
+        if processes is None:
+            processes = min(len(model_info), os.cpu_count() or 1)
+        processes = max(1, min(processes, len(model_info)))
+        # threads of the parent process must not be forked
+        context = mp.get_context("spawn")
+        self._clock = clock if clock is not None else get_clock()
+        self._commands = [context.Queue() for _ in range(processes)]
+        self._blocks: list[SharedMemory] = []
+        self._cameras: dict[str, RemoteCamera] = {}
+        self._closing = False
+        specs: list[list[_CameraSpec]] = [[] for _ in range(processes)]
+        for i, (name, info) in enumerate(model_info.items()):
+            shape = (slots, *info.frame_shape)
+            size = int(np.prod(shape)) * np.dtype(info.dtype).itemsize
+            block = SharedMemory(create=True, size=size)
+            self._blocks.append(block)
+            frames: npt.NDArray[Any] = np.ndarray(
+                shape, dtype=info.dtype, buffer=block.buf
+            )
+            worker = i % processes
+            specs[worker].append((name, info, block.name, slots))
+            self._cameras[name] = RemoteCamera(
+                name, info, frames, self._commands[worker]
+            )
+        self._specs = specs
+        # each worker has its own pipe of results: a worker that dies
+        # cannot corrupt the results of the others, and its exit is
+        # detected as the end of its pipe
+        pipes = [context.Pipe(duplex=False) for _ in range(processes)]
+        self._results = [reader for reader, _ in pipes]
+        self._processes = [
+            context.Process(
+                target=_serve,
+                args=(specs[i], self._commands[i], pipes[i][1]),
+                name=f"camera-farm-{i}",
+                daemon=True,
+            )
+            for i in range(processes)
+        ]
+        for process in self._processes:
+            process.start()
+        for _, writer in pipes:
+            writer.close()
+        self._listener = threading.Thread(
+            target=self._listen, name="camera-farm-listener", daemon=True
+        )
+        self._listener.start()
+
+    def _listen(self) -> None:
+        workers = {results: i for i, results in enumerate(self._results)}
+        while workers:
+            for results in wait(list(workers)):
+                assert isinstance(results, Connection)
+                try:
+                    name, index, error = results.recv()
+                except (EOFError, OSError):
+                    self._exited(workers.pop(results))
+                    continue
+                try:
+                    self._cameras[name]._finish(index, self._clock.time(), error)
+                except Exception:
+                    get_logger().exception(f"Error while completing a frame of {name}")
+
+    def _exited(self, worker: int) -> None:
+        """Fail the acquisitions of the cameras of an exited worker."""
+        if self._closing:
+            # workers exiting on request are not failures
+            return
+        process = self._processes[worker]
+        process.join(timeout=1.0)
+        error = f"{process.name} exited with code {process.exitcode}"
+        get_logger().error(f"Camera farm worker {error}")
+        for name, *_ in self._specs[worker]:
+            self._cameras[name]._fail(error)
+
+    def close(self) -> None:
+        """Stop the worker processes and release the shared memory."""
+        if not self._processes:
+            return
+        self._closing = True
+        for commands in self._commands:
+            commands.put(None)
+        for process in self._processes:
+            process.join()
+        # the listener returns when the pipes of all the workers are closed
+        self._listener.join()
+        for results in self._results:
+            results.close()
+        self._processes = []
+        for camera in self._cameras.values():
+            camera._fail("the camera farm is closed")
+            # views on the shared memory must be released before closing it
+            camera._frames = np.empty((0,))
+        for block in self._blocks:
+            try:
+                block.close()
+            except BufferError:
+                # frames still referenced by the caller; the mapping
+                # is released when they are garbage collected
+                pass
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self) -> CameraFarm:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __getitem__(self, name: str) -> RemoteCamera:
+        return self._cameras[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._cameras)
+
+    def __len__(self) -> int:
+        return len(self._cameras)
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import json
+import threading
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Iterable, Optional, Union
+
+__all__ = ["DeviceMetrics", "Histogram", "dump_metrics", "format_prometheus"]
+
+#: upper bounds of the latency histogram buckets in seconds, from 1 us to 5 s
+BUCKETS = tuple(m * 10.0**e for e in range(-6, 1) for m in (1.0, 2.5, 5.0))
+
+#: prefix of the metric names in the Prometheus text format
+_PREFIX = "redsun_simulator"
+
+
+class Histogram:
+    """Latency histogram with fixed, logarithmically spaced buckets.
+
+    Observations are counted in the first bucket whose upper bound
+    (see ``BUCKETS``) is greater or equal to the observed value;
+    larger values are counted in an overflow bucket.
+    """
+
+    __slots__ = ("counts", "total", "maximum")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add an observation, in seconds."""
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        if value > self.maximum:
+            self.maximum = value
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the content of the histogram.
+
+        Returns
+        -------
+        snapshot : ``dict[str, Any]``
+            The number of observations (``count``), their sum (``sum``),
+            mean (``mean``) and maximum (``max``) in seconds, and the
+            (non-cumulative) count of each bucket (``buckets``), as a list
+            of ``(upper bound, count)`` pairs ending with the overflow bucket,
+            whose upper bound is ``None``.
+
+        """
+        count = sum(self.counts)
+        return {
+            "count": count,
+            "sum": self.total,
+            "mean": self.total / count if count else 0.0,
+            "max": self.maximum,
+            "buckets": list(zip((*BUCKETS, None), self.counts)),
+        }
+
+
+class DeviceMetrics:
+    """Counters, gauges and latency histograms of a simulated device.
+
+    Devices only hold an instance while their metrics are enabled,
+    so that disabled metrics cost a single ``None`` check per call.
+
+    Parameters
+    ----------
+    device : ``str``
+        The name of the device.
+
+    """
+
+    def __init__(self, device: str) -> None:
+        self._device = device
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = {}
+        self._histograms: dict[str, Histogram] = {}
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Increment the counter ``name`` by ``value``."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Add a latency observation to the histogram ``name``."""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def snapshot(
+        self, gauges: dict[str, float], counters: Optional[dict[str, int]] = None
+    ) -> dict[str, Any]:
+        """Return the current value of all the metrics.
+
+        Parameters
+        ----------
+        gauges : ``dict[str, float]``
+            Instantaneous values sampled by the device (e.g. queue depths).
+        counters : ``dict[str, int]``, optional
+            Counters maintained by the device itself, added to the
+            counters recorded with :meth:`count`.
+
+        Returns
+        -------
+        metrics : ``dict[str, Any]``
+            The name of the device (``device``) and its ``counters``,
+            ``gauges`` and ``histograms``.
+
+        """
+        with self._lock:
+            return {
+                "device": self._device,
+                "counters": {**self._counters, **(counters or {})},
+                "gauges": gauges,
+                "histograms": {
+                    name: histogram.snapshot()
+                    for name, histogram in self._histograms.items()
+                },
+            }
+
+
+def format_prometheus(metrics: Iterable[dict[str, Any]]) -> str:
+    """Format device metrics in the Prometheus text exposition format.
+
+    Parameters
+    ----------
+    metrics : ``Iterable[dict[str, Any]]``
+        Metrics returned by the ``read_metrics`` method of the devices.
+
+    Returns
+    -------
+    text : ``str``
+        The metrics, labelled with the device name.
+
+    """
+    # samples of each metric family, grouped across devices
+    families: dict[str, tuple[str, list[str]]] = {}
+
+    def add(family: str, kind: str, sample: str) -> None:
+        families.setdefault(family, (kind, []))[1].append(sample)
+
+    for device in metrics:
+        label = 'device="{}"'.format(device["device"].replace('"', '\\"'))
+        for name, value in device["counters"].items():
+            family = f"{_PREFIX}_{name}_total"
+            add(family, "counter", f"{family}{{{label}}} {value}")
+        for name, value in device["gauges"].items():
+            family = f"{_PREFIX}_{name}"
+            add(family, "gauge", f"{family}{{{label}}} {value}")
+        for name, histogram in device["histograms"].items():
+            family = f"{_PREFIX}_{name}_seconds"
+            cumulative = 0
+            for bound, count in histogram["buckets"]:
+                cumulative += count
+                le = "+Inf" if bound is None else repr(bound)
+                add(
+                    family,
+                    "histogram",
+                    f'{family}_bucket{{{label},le="{le}"}} {cumulative}',
+                )
+            add(family, "histogram", f"{family}_sum{{{label}}} {histogram['sum']}")
+            add(family, "histogram", f"{family}_count{{{label}}} {histogram['count']}")
+    lines: list[str] = []
+    for family, (kind, samples) in families.items():
+        lines.append(f"# TYPE {family} {kind}")
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
+
+
+def dump_metrics(
+    devices: Iterable[Any], path: Union[str, Path], format: str = "json"
+) -> None:
+    """Write the metrics of simulated devices to a local file.
+
+    Parameters
+    ----------
+    devices : ``Iterable[Any]``
+        Devices implementing ``read_metrics``; devices with
+        disabled metrics are skipped.
+    path : ``Union[str, Path]``
+        The destination file; it is overwritten.
+    format : ``str``, optional
+        Either ``"json"`` or ``"prometheus"`` (text exposition format).
+        Default is ``"json"``.
+
+    Raises
+    ------
+    ValueError
+        If the format is not supported.
+
+    """
+    metrics = [m for m in (device.read_metrics() for device in devices) if m]
+    if format == "json":
+        text = json.dumps(metrics, indent=2)
+    elif format == "prometheus":
+        text = format_prometheus(metrics)
+    else:
+        raise ValueError(f"Unsupported metrics format: {format}.")
+    Path(path).write_text(text)
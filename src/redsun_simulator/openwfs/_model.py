@@ -1,38 +1,104 @@
 from __future__ import annotations
 
-from time import sleep
-from typing import TYPE_CHECKING, Any, Optional
+from functools import partial
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, Any, Iterator, Mapping, Optional, Union
 
 import astropy.units as u
 import numpy as np
-from astropy.units import Quantity
+import numpy.typing as npt
 from bluesky.protocols import Location
 from openwfs import Actuator
-from openwfs.simulation import Camera, Microscope, StaticSource
+from openwfs.simulation import Camera
 from sunflare.engine import Status
 
+from ._buffer import FrameBuffer
+from ._clock import Clock, get_clock
+from ._coupling import MotorAxis, MotorXYStage, MotorZStage
+from ._documents import ConfigurationDocuments
+from ._metrics import DeviceMetrics
+from ._motion import move_duration, plan_trajectory
+from ._noise import NoiseEngine
+from ._optics import SimulatedMicroscope
+from ._scheduler import get_scheduler
+from ._specimen import MappedSpecimen, SpecimenSource, TiledSpecimen
+from ._stream import FrameStream
+from ._writer import FrameWriter
+
 if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from pathlib import Path
+
+    from bluesky.protocols import Reading
+
+    from event_model.documents.event_descriptor import DataKey
+    from event_model.documents.event_page import PartialEventPage
+
+    from ._bank import BankMotor
     from ._config import OpenWFSCameraInfo, OpenWFSMotorInfo
+    from ._documents import ConfigurationCallback
 
 
 __all__ = ["OpenWFSMotor", "OpenWFSCamera"]
 
+#: digitized camera frame, of the ``dtype`` configured in ``OpenWFSCameraInfo``
+Frame = npt.NDArray[np.unsignedinteger[Any]]
+
+#: handle to a digitized frame; either the frame itself
+#: or its index in the camera frame buffer
+FrameHandle = Union[int, Frame]
+
 
 class OpenWFSMotor(Actuator):
-    """General purpose motor model. Simulates a motor moving on multiple axis."""
+    """General purpose motor model. Simulates a motor moving on multiple axis.
+
+    Movement and shutdown durations, as well as timestamps, are measured
+    with ``clock``; an accelerated or virtual :class:`Clock` runs
+    long simulations faster than real time, with the same relative timings.
+
+    Parameters
+    ----------
+    name : str
+        The name of the motor.
+    model_info : OpenWFSMotorInfo
+        The model information.
+    clock : Clock, optional
+        The clock of the simulation. Default is the clock returned by ``get_clock``.
+
+    """
 
-    def __init__(self, name: str, model_info: OpenWFSMotorInfo) -> None:
+    def __init__(
+        self, name: str, model_info: OpenWFSMotorInfo, *, clock: Optional[Clock] = None
+    ) -> None:
         self._name = name
+        self._clock = clock if clock is not None else get_clock()
         self._model_info = model_info
         self._axis = model_info.axis
-        self._step_size = model_info.step_size
+        self._axis_index = {axis: i for i, axis in enumerate(model_info.axis)}
+        self._step_size = np.array(
+            [model_info.step_size[axis] for axis in model_info.axis], dtype=np.float64
+        )
+
+        # positions are stored in arrays indexed by axis
+        self._setpoint = np.zeros(len(model_info.axis), dtype=np.float64)
+        self._readback = np.zeros(len(model_info.axis), dtype=np.float64)
+        # time at which the last movement on each axis ends
+        self._move_end = np.zeros(len(model_info.axis), dtype=np.float64)
+        self._scheduler = get_scheduler(self._clock)
 
-        self._setpoint: dict[str, float] = {axis: 0.0 for axis in model_info.axis}
-        self._readback: dict[str, float] = {axis: 0.0 for axis in model_info.axis}
+        # fly scan state
+        self._trajectory_index: Optional[npt.NDArray[np.intp]] = None
+        self._trajectory: Optional[npt.NDArray[np.float64]] = None
+        self._fly_positions = np.empty((0, 0), dtype=np.float64)
+        self._fly_timestamps = np.empty(0, dtype=np.float64)
+        self._fly_collected = 0
+        self._fly_status: Optional[Status] = None
 
         self._current_axis = model_info.axis[0]
         self._shutdown_time = model_info.shutdown_time
         self._setpoint_time = model_info.setpoint_time
+        self._metrics: Optional[DeviceMetrics] = None
+        self._documents = ConfigurationDocuments(model_info)
 
         super().__init__(duration=0 * u.ms, latency=0 * u.ms)
 
@@ -41,23 +107,35 @@ class OpenWFSMotor(Actuator):
 
         Simulates a waiting time for the motor to shutdown.
         """
-        sleep(self.model_info.shutdown_time)
+        self._clock.sleep(self.model_info.shutdown_time)
 
-    def set(self, value: float, axis: Optional[str] = None) -> Status:
+    def set(
+        self,
+        value: Union[float, Mapping[str, float], npt.ArrayLike],
+        axis: Optional[str] = None,
+    ) -> Status:
         """Start moving the motor to the setpoint.
 
-        The axis along which to move is determined either by `axis`
-        or the `current_axis` attribute. A ``Status`` object is
-        returned to track the movement; this has a callback
-        to simulate the setpoint being reached.
+        If ``value`` is a scalar, the axis along which to move is determined
+        either by `axis` or the `current_axis` attribute. If ``value`` is a mapping
+        of axis names to positions or a vector of positions, the movement is
+        delegated to :meth:`move_many`. The setpoint is rounded to the closest
+        multiple of the axis step size.
+
+        The method returns immediately with a pending ``Status`` object.
+        The duration of the movement is computed from the travelled distance
+        and the ``velocity``, ``acceleration`` and ``setpoint_time`` of the motor;
+        once elapsed, the readback value is updated and the ``Status`` is marked
+        as finished from a background thread. Movements on the same axis are queued.
 
         Parameters
         ----------
-        value : float
+        value : float | Mapping[str, float] | npt.ArrayLike
             The location to move to.
         axis : str, optional
             The axis along which to move.
             If not specified, `current_axis` is used.
+            Ignored for multi-axis movements.
 
         Returns
         -------
@@ -65,22 +143,263 @@ class OpenWFSMotor(Actuator):
             The status of the movement
 
         """
+        return self.move_many(self._targets(value, axis))
+
+    def move_many(self, targets: Union[Mapping[str, float], npt.ArrayLike]) -> Status:
+        """Start moving multiple axis of the motor at once.
+
+        All axis move concurrently; the returned ``Status`` is marked
+        as finished when the slowest axis reaches its setpoint.
+
+        Parameters
+        ----------
+        targets : Mapping[str, float] | npt.ArrayLike
+            Either a mapping of axis names to the locations to move to,
+            or a vector with a location for each axis, in the order of
+            ``model_info.axis``.
+
+        Returns
+        -------
+        status : Status
+            The status of the movement
+
+        Raises
+        ------
+        IndexError
+            If an axis is not in ``model_info.axis``.
+        ValueError
+            If the vector of locations does not match the number of axis.
+
+        """
+        metrics = self._metrics
+        start = perf_counter() if metrics is not None else 0.0
+        index, setpoint, end = self._start_move(targets)
         s = Status()
-        s.add_callback(self._wait_readback)
+        self._scheduler.call_at(end, partial(self._wait_readback, s, index, setpoint))
+        if metrics is not None:
+            metrics.count("moves")
+            metrics.observe("set", perf_counter() - start)
+        return s
+
+    def _targets(
+        self,
+        value: Union[float, Mapping[str, float], npt.ArrayLike],
+        axis: Optional[str],
+    ) -> Union[Mapping[str, float], npt.ArrayLike]:
+        """Convert the arguments of :meth:`set` to the targets of :meth:`move_many`."""
+        if isinstance(value, Mapping) or np.ndim(value) > 0:
+            return value
         if axis is None:
             axis = self.current_axis
-        steps = np.floor((value - self._setpoint[axis]) / self._step_size[axis]).astype(
-            int
+        return {axis: value}
+
+    def _start_move(
+        self, targets: Union[Mapping[str, float], npt.ArrayLike]
+    ) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.float64], float]:
+        """Update the setpoints and compute when the movement ends.
+
+        Returns
+        -------
+        index : npt.NDArray[np.intp]
+            The indices of the moved axis.
+        setpoint : npt.NDArray[np.float64]
+            The new setpoints of the moved axis.
+        end : float
+            The time at which the slowest axis reaches its setpoint,
+            in the ``monotonic`` reference of the clock.
+
+        """
+        if isinstance(targets, Mapping):
+            index = np.array([self._index_of(axis) for axis in targets], dtype=np.intp)
+            values = np.fromiter(targets.values(), dtype=np.float64, count=len(index))
+        else:
+            values = np.asarray(targets, dtype=np.float64)
+            if values.shape != self._setpoint.shape:
+                raise ValueError(
+                    f"Expected {self._setpoint.size} locations, got shape {values.shape}"
+                )
+            index = np.arange(values.size)
+        step_size = self._step_size[index]
+        steps = np.round((values - self._setpoint[index]) / step_size)
+        if self._metrics is not None:
+            self._metrics.count("steps", int(np.abs(steps).sum()))
+        setpoint = self._setpoint[index] + steps * step_size
+        duration = move_duration(
+            np.abs(steps) * step_size,
+            self.model_info.velocity,
+            self.model_info.acceleration,
+            self.setpoint_time,
         )
-        for _ in range(steps):
-            self._setpoint[axis] += self._step_size[axis]
-            self.wait(up_to=Quantity(self.setpoint_time * 1000, u.ms))
+        end = np.maximum(self._clock.monotonic(), self._move_end[index]) + duration
+        self._move_end[index] = end
+        self._setpoint[index] = setpoint
+        return index, setpoint, float(end.max())
+
+    def prepare(self, value: npt.ArrayLike) -> Status:
+        """Load a trajectory to be executed as a fly scan.
+
+        Parameters
+        ----------
+        value : npt.ArrayLike
+            The trajectory points. Either a 1D array of locations
+            for the ``current_axis``, or a 2D array of shape ``(N, K)``
+            with a location for each of the ``K`` motor axis.
+
+        Returns
+        -------
+        status : Status
+            A finished status.
+
+        Raises
+        ------
+        ValueError
+            If the trajectory shape does not match the motor axis.
+
+        """
+        trajectory = np.asarray(value, dtype=np.float64)
+        if trajectory.ndim == 1:
+            index = np.array([self._axis_index[self.current_axis]], dtype=np.intp)
+            trajectory = trajectory[:, np.newaxis]
+        elif trajectory.ndim == 2 and trajectory.shape[1] == self._setpoint.size:
+            index = np.arange(self._setpoint.size)
+        else:
+            raise ValueError(
+                f"Expected a trajectory of shape (N,) or (N, {self._setpoint.size}), "
+                f"got {trajectory.shape}"
+            )
+        if trajectory.shape[0] == 0:
+            raise ValueError("The trajectory must contain at least one point.")
+        self._trajectory_index = index
+        self._trajectory = trajectory
+        s = Status()
+        s.set_finished()
+        return s
+
+    def kickoff(self) -> Status:
+        """Start executing the prepared trajectory.
+
+        The whole trajectory is simulated in a single pass: the time at which
+        each point is reached is precomputed, and the motor readback is updated
+        in the background once the last point is reached.
+
+        Returns
+        -------
+        status : Status
+            A finished status; use :meth:`complete` to wait for the trajectory end.
+
+        Raises
+        ------
+        RuntimeError
+            If no trajectory was prepared.
+
+        """
+        if self._trajectory is None or self._trajectory_index is None:
+            raise RuntimeError(f"No trajectory prepared for {self.name}.")
+        index = self._trajectory_index
+        positions, offsets = plan_trajectory(
+            self._setpoint[index],
+            self._trajectory,
+            self._step_size[index],
+            self.model_info.velocity,
+            self.model_info.acceleration,
+            self.setpoint_time,
+        )
+        now = self._clock.monotonic()
+        start = max(now, float(self._move_end[index].max()))
+        end = start + float(offsets[-1])
+        self._fly_positions = positions
+        self._fly_timestamps = self._clock.time() + (start - now) + offsets
+        self._fly_collected = 0
+        self._move_end[index] = end
+        self._setpoint[index] = positions[-1]
+        self._fly_status = Status()
+        self._scheduler.call_at(
+            end, partial(self._wait_readback, self._fly_status, index, positions[-1])
+        )
+        s = Status()
         s.set_finished()
         return s
 
+    def complete(self) -> Status:
+        """Return a status which finishes when the trajectory is completed.
+
+        Returns
+        -------
+        status : Status
+            The status of the trajectory execution.
+
+        Raises
+        ------
+        RuntimeError
+            If the motor was not kicked off.
+
+        """
+        if self._fly_status is None:
+            raise RuntimeError(f"{self.name} was not kicked off.")
+        return self._fly_status
+
+    def describe_collect(self) -> dict[str, dict[str, DataKey]]:
+        """Describe the data emitted by :meth:`collect_pages`.
+
+        Returns
+        -------
+        description : dict[str, dict[str, DataKey]]
+            The data keys of the trajectory axis, in a stream named after the motor.
+
+        """
+        index = self._trajectory_index if self._trajectory_index is not None else []
+        return {
+            self.name: {
+                f"{self.name}-{self._axis[i]}": {
+                    "source": "readback",
+                    "dtype": "number",
+                    "shape": [],
+                }
+                for i in index
+            }
+        }
+
+    def collect_pages(self) -> Iterator[PartialEventPage]:
+        """Emit the trajectory points reached since the last collection.
+
+        All the available points are emitted in bulk
+        as a single partial ``EventPage``.
+
+        Yields
+        ------
+        page : PartialEventPage
+            The reached positions with their timestamps.
+
+        """
+        if self._trajectory_index is None:
+            return
+        if self._fly_status is not None and self._fly_status.done:
+            stop = self._fly_timestamps.size
+        else:
+            stop = int(
+                np.searchsorted(self._fly_timestamps, self._clock.time(), side="right")
+            )
+        if stop <= self._fly_collected:
+            return
+        rows = slice(self._fly_collected, stop)
+        self._fly_collected = stop
+        timestamps = self._fly_timestamps[rows].tolist()
+        data = {
+            f"{self.name}-{self._axis[i]}": self._fly_positions[rows, j].tolist()
+            for j, i in enumerate(self._trajectory_index)
+        }
+        yield {
+            "data": data,
+            "timestamps": {key: timestamps for key in data},
+            "time": timestamps,
+        }
+
     def configure(self, name: str, value: Any) -> None:
         """Configure the motor.
 
+        The configuration documents are regenerated and the subscribed
+        callbacks are notified (see :meth:`subscribe_configuration`).
+
         Parameters
         ----------
         name : str
@@ -90,28 +409,55 @@ class OpenWFSMotor(Actuator):
 
         """
         setattr(self.model_info, name, value)
+        self._documents.changed(name)
 
     def read_configuration(self) -> dict[str, Any]:
         """Read the device configuration as a Bluesky document.
 
+        The document is cached until the next call to :meth:`configure`;
+        it must not be modified.
+
         Returns
         -------
         configuration : dict[str, Any]
             The configuration parameters of the device.
 
         """
-        return self.model_info.read_configuration()
+        return self._documents.read()
 
     def describe_configuration(self) -> dict[str, Any]:
         """Describe the device configuration as a Bluesky document.
 
+        The document is cached until the next call to :meth:`configure`;
+        it must not be modified.
+
         Returns
         -------
         configuration : dict[str, Any]
             The configuration parameters of the device.
 
         """
-        return self.model_info.describe_configuration()
+        return self._documents.describe()
+
+    def subscribe_configuration(self, callback: ConfigurationCallback) -> None:
+        """Call ``callback`` after each call to :meth:`configure`.
+
+        Parameters
+        ----------
+        callback : ConfigurationCallback
+            Called with the name and the new value of the configuration parameter.
+
+        """
+        self._documents.subscribe(callback)
+
+    def unsubscribe_configuration(self, callback: ConfigurationCallback) -> None:
+        """Stop calling a callback registered with :meth:`subscribe_configuration`."""
+        self._documents.unsubscribe(callback)
+
+    @property
+    def configuration_version(self) -> int:
+        """Version of the configuration documents, increased by :meth:`configure`."""
+        return self._documents.version
 
     def locate(self) -> Location[float]:
         """Return the current location of a Device.
@@ -130,11 +476,23 @@ class OpenWFSMotor(Actuator):
             The current location of the Device.
 
         """
+        index = self._axis_index[self.current_axis]
         return Location(
-            setpoint=self._setpoint[self.current_axis],
-            readback=self._readback[self.current_axis],
+            setpoint=float(self._setpoint[index]),
+            readback=float(self._readback[index]),
         )
 
+    def locate_many(self) -> Location[npt.NDArray[np.float64]]:
+        """Return the current location of all the motor axis.
+
+        Returns
+        -------
+        location : Location[npt.NDArray[np.float64]]
+            The setpoint and readback vectors, in the order of ``model_info.axis``.
+
+        """
+        return Location(setpoint=self._setpoint.copy(), readback=self._readback.copy())
+
     @property
     def current_axis(self) -> str:
         """The current axis of the motor."""
@@ -142,10 +500,16 @@ class OpenWFSMotor(Actuator):
 
     @current_axis.setter
     def current_axis(self, axis: str) -> None:
-        if axis not in self.model_info.axis:
-            raise IndexError(f"Axis {axis} is not in {self.model_info.axis}")
+        self._index_of(axis)
         self._current_axis = axis
 
+    def _index_of(self, axis: str) -> int:
+        """Return the position of ``axis`` in the state arrays."""
+        try:
+            return self._axis_index[axis]
+        except KeyError:
+            raise IndexError(f"Axis {axis} is not in {self.model_info.axis}") from None
+
     @property
     def shutdown_time(self) -> float:
         """The time required to simulate the motor shutdown in seconds."""
@@ -156,16 +520,80 @@ class OpenWFSMotor(Actuator):
         """The time required to simulate the motor moving to the setpoint in seconds."""
         return self.model_info.setpoint_time
 
-    def _wait_readback(self, _: Status) -> None:
-        """Simulate the motor moving to the setpoint via a callback.
+    @property
+    def clock(self) -> Clock:
+        """The clock of the simulation."""
+        return self._clock
+
+    def _wait_readback(
+        self,
+        status: Status,
+        index: npt.NDArray[np.intp],
+        value: npt.NDArray[np.float64],
+    ) -> None:
+        """Simulate the motor reaching the setpoint.
+
+        Called by the scheduler once the movement duration has elapsed.
 
         Parameters
         ----------
-        s : Status
-            The status object (not used).
+        status : Status
+            The status object of the movement.
+        index : npt.NDArray[np.intp]
+            The indices of the moved axis.
+        value : npt.NDArray[np.float64]
+            The reached positions.
 
         """
-        self._readback[self.current_axis] = self._setpoint[self.current_axis]
+        metrics = self._metrics
+        start = perf_counter() if metrics is not None else 0.0
+        self._readback[index] = value
+        status.set_finished()
+        if metrics is not None:
+            metrics.observe("readback", perf_counter() - start)
+
+    def enable_metrics(self, enabled: bool = True) -> None:
+        """Enable or disable the collection of metrics.
+
+        When enabled, the motor records the number of movements (``moves``)
+        and of steps (``steps``), and the latency histograms of :meth:`set`
+        (``set``) and of the completion of the movements (``readback``,
+        including the ``Status`` callbacks). Enabling the metrics again
+        resets them; disabled metrics have no overhead.
+
+        Parameters
+        ----------
+        enabled : bool, optional
+            Whether to collect metrics. Default is ``True``.
+
+        """
+        self._metrics = DeviceMetrics(self.name) if enabled else None
+
+    def read_metrics(self) -> dict[str, Any]:
+        """Read the metrics of the motor.
+
+        See :meth:`enable_metrics`. The gauges report the number of pending
+        callbacks of the scheduler (``scheduler_queue``) and the number of
+        moving axis (``moving_axis``).
+
+        Returns
+        -------
+        metrics : dict[str, Any]
+            The ``counters``, ``gauges`` and ``histograms`` of the motor;
+            an empty dictionary if the metrics are disabled.
+
+        """
+        metrics = self._metrics
+        if metrics is None:
+            return {}
+        return metrics.snapshot(
+            {
+                "scheduler_queue": self._scheduler.pending,
+                "moving_axis": int(
+                    np.count_nonzero(self._move_end > self._clock.monotonic())
+                ),
+            }
+        )
 
     @property
     def model_info(self) -> OpenWFSMotorInfo:
@@ -184,34 +612,641 @@ class OpenWFSMotor(Actuator):
 
 
 class OpenWFSCamera(Camera):
-    def __init__(self, name: str, model_info: OpenWFSCameraInfo) -> None:
+    """Simulated camera imaging a random specimen through a microscope.
+
+    The specimen is generated lazily in tiles, or memory-mapped from
+    ``model_info.specimen.path``, so that the memory usage and the
+    construction time do not depend on its resolution.
+
+    Implements the Bluesky ``Triggerable`` and ``Readable`` protocols.
+
+    Frames are digitized with ``model_info.bit_depth`` bits directly
+    into arrays of ``model_info.dtype``, after drawing the sensor noise
+    of ``model_info.noise`` with a :class:`NoiseEngine`.
+
+    If ``model_info.buffer_size`` is greater than 0, frames are digitized
+    in place into a preallocated :class:`FrameBuffer` and :meth:`read`
+    returns read-only views of the buffer slots. Such views are overwritten
+    once the buffer wraps around; consumers retaining frames for longer
+    than ``buffer_size`` acquisitions should copy them.
+
+    Frame timestamps and the frame rate of the continuous acquisition
+    are measured with ``clock``.
+
+    Only the region of interest of the sensor (``model_info.roi``) is
+    rendered, with the optical axis kept at the center of the full sensor,
+    so that smaller regions render faster. Frames are then binned by summing
+    blocks of ``model_info.binning`` pixels. Near the edges of the region,
+    images only include the light of the specimen within the rendered region.
+
+    Parameters
+    ----------
+    name : str
+        The name of the camera.
+    model_info : OpenWFSCameraInfo
+        The model information.
+    clock : Clock, optional
+        The clock of the simulation. Default is the clock returned by ``get_clock``.
+
+    """
+
+    def __init__(
+        self, name: str, model_info: OpenWFSCameraInfo, *, clock: Optional[Clock] = None
+    ) -> None:
         self._name = name
+        self._clock = clock if clock is not None else get_clock()
         self._model_info = model_info
         specimen = model_info.specimen
-        img = np.maximum(
-            np.random.randint(-10000, 10, specimen.resolution, dtype=np.int16), 0
-        )
-        src = StaticSource(img, specimen.pixel_size)
-        microscope = Microscope(
-            source=src,
+        # the specimen is only read (or generated) where the camera looks at it
+        self._specimen: SpecimenSource
+        if specimen.path:
+            self._specimen = MappedSpecimen(specimen.path, specimen.pixel_size * u.nm)
+        else:
+            self._specimen = TiledSpecimen(
+                specimen.resolution,
+                specimen.pixel_size * u.nm,
+                seed=specimen.seed,
+                tile_size=specimen.tile_size,
+                cache_size=specimen.cache_tiles,
+            )
+        microscope = SimulatedMicroscope(
+            source=self._specimen,
+            data_shape=model_info.sensor_shape,
             magnification=specimen.magnification,
             numerical_aperture=specimen.numerical_aperture,
-            wavelength=specimen.wavelength,
+            wavelength=specimen.wavelength * u.nm,
         )
 
-        # TODO: digital_max=255 forces to be uint8;
-        # can this be customized?
         super().__init__(
             source=microscope,
             shape=model_info.sensor_shape,
-            shot_noise=True,
+            # the noise is drawn by the noise engine
+            shot_noise=False,
             analog_max=None,
-            digital_max=255,
+            digital_max=2**model_info.bit_depth - 1,
+        )
+        self._dtype = np.dtype(model_info.dtype)
+        self._noise = NoiseEngine(model_info.noise)
+        self._buffer: Optional[FrameBuffer] = None
+        if model_info.buffer_size > 0:
+            self._buffer = FrameBuffer(
+                model_info.buffer_size, model_info.frame_shape, self._dtype
+            )
+        self._microscope = microscope
+        self._binning = 1
+        self._apply_readout()
+        self._last_frame: Optional[FrameHandle] = None
+        self._timestamp = 0.0
+        self._stream: Optional[FrameStream[tuple[FrameHandle, float]]] = None
+        self._metrics: Optional[DeviceMetrics] = None
+        self._writer: Optional[FrameWriter] = None
+        self._documents = ConfigurationDocuments(model_info)
+
+    def trigger(self) -> Status:  # type: ignore[override]
+        """Start the acquisition of a frame.
+
+        The frame is computed in a background thread.
+
+        Returns
+        -------
+        status : Status
+            The status of the acquisition;
+            it is marked as finished when the frame is available.
+
+        """
+        s = Status()
+        start = perf_counter() if self._metrics is not None else 0.0
+        # only the optical simulation runs through the OpenWFS trigger chain;
+        # the frame is digitized by the camera itself, directly in its destination
+        future = self._crop.trigger()
+        future.add_done_callback(partial(self._store_frame, s, start))
+        return s
+
+    def read(self) -> dict[str, Reading[Frame]]:  # type: ignore[override]
+        """Read the last acquired frame.
+
+        If no frame was acquired yet, one is acquired synchronously.
+
+        Returns
+        -------
+        reading : dict[str, Reading[Frame]]
+            The last frame, with the time at which it was acquired.
+
+        """
+        if self._last_frame is None:
+            self.trigger().wait()
+        assert self._last_frame is not None
+        frame = self._resolve(self._last_frame)
+        return {self.name: {"value": frame, "timestamp": self._timestamp}}
+
+    def describe(self) -> dict[str, DataKey]:
+        """Describe the data returned by :meth:`read`.
+
+        Returns
+        -------
+        description : dict[str, DataKey]
+            The description of the frame.
+
+        """
+        return {
+            self.name: {
+                "source": "data",
+                "dtype": "array",
+                "shape": list(self.data_shape),
+                "dtype_numpy": self._dtype.str,
+            }
+        }
+
+    def start_streaming(self) -> None:
+        """Start the continuous acquisition.
+
+        Frames are rendered ahead of time by ``model_info.stream_workers``
+        background threads at ``model_info.frame_rate``, and queued until
+        retrieved with :meth:`get_frame` or :meth:`frames`. When the queue
+        (of size ``model_info.stream_queue_size``) is full, the oldest frame
+        is dropped; so is a queued frame overwritten in the frame buffer
+        before being retrieved.
+        """
+        if self._stream is not None and self._stream.running:
+            return
+        queue_size = self.model_info.stream_queue_size
+        if self._buffer is not None:
+            # older queued frames would be overwritten in the ring buffer anyway
+            queue_size = min(queue_size, self._buffer.size)
+        self._stream = FrameStream(
+            self._render_frame,
+            self.model_info.frame_rate,
+            queue_size,
+            self.model_info.stream_workers,
+            self._clock,
         )
+        self._stream.start()
+
+    def stop_streaming(self) -> None:
+        """Stop the continuous acquisition."""
+        if self._stream is not None:
+            self._stream.stop()
+
+    def get_frame(self, timeout: Optional[float] = None) -> tuple[Frame, float]:
+        """Return the oldest streamed frame.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum time to wait for a frame in seconds.
+            If ``None`` (default), wait indefinitely.
+
+        Returns
+        -------
+        frame : Frame
+            The frame.
+        timestamp : float
+            The time at which the frame was acquired.
+
+        Raises
+        ------
+        RuntimeError
+            If the streaming was never started.
+        TimeoutError
+            If no frame is available within ``timeout``,
+            or the streaming is stopped and all frames were retrieved.
+
+        Notes
+        -----
+        Queued frames whose slot of the frame buffer was overwritten
+        are skipped, and counted as dropped by the stream.
+
+        """
+        stream = self._stream
+        if stream is None:
+            raise RuntimeError(f"Streaming of {self.name} was not started.")
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(deadline - monotonic(), 0.0)
+            handle, timestamp = stream.get(remaining)
+            try:
+                return self._resolve(handle), timestamp
+            except IndexError:
+                stream.discard()
+
+    def frames(self) -> Iterator[tuple[Frame, float]]:
+        """Iterate over the streamed frames until the streaming is stopped.
+
+        Yields
+        ------
+        frame : tuple[Frame, float]
+            The frame and the time at which it was acquired.
+
+        """
+        while True:
+            try:
+                yield self.get_frame()
+            except TimeoutError:
+                return
+
+    @property
+    def stream(self) -> Optional[FrameStream[tuple[FrameHandle, float]]]:
+        """The frame stream of the continuous acquisition, if started."""
+        return self._stream
+
+    def _render_frame(self) -> tuple[FrameHandle, float]:
+        """Acquire a single frame in the calling thread."""
+        metrics = self._metrics
+        start = perf_counter() if metrics is not None else 0.0
+        data = self._crop.trigger(immediate=True).result()
+        handle = self._emit(data)
+        if metrics is not None:
+            metrics.observe("render", perf_counter() - start)
+        timestamp = self._clock.time()
+        writer = self._writer
+        if writer is not None:
+            writer.write(self._resolve(handle, peek=True), timestamp)
+        return handle, timestamp
+
+    def _store_frame(
+        self, status: Status, start: float, future: Future[npt.NDArray[np.float64]]
+    ) -> None:
+        """Digitize the acquired image and mark the acquisition as finished.
+
+        Parameters
+        ----------
+        status : Status
+            The status of the acquisition.
+        start : float
+            The ``perf_counter`` time at which the acquisition was triggered.
+        future : Future[npt.NDArray[np.float64]]
+            The future returning the analog image on the sensor.
+
+        """
+        try:
+            self._last_frame = self._emit(future.result())
+            self._timestamp = self._clock.time()
+            writer = self._writer
+            if writer is not None:
+                writer.write(
+                    self._resolve(self._last_frame, peek=True), self._timestamp
+                )
+        except Exception as exc:
+            status.set_exception(exc)
+            return
+        if self._metrics is not None:
+            self._metrics.observe("trigger", perf_counter() - start)
+        status.set_finished()
+
+    def _emit(self, data: npt.NDArray[np.float64]) -> FrameHandle:
+        """Digitize an analog image into the frame buffer or a new frame."""
+        metrics = self._metrics
+        start = perf_counter() if metrics is not None else 0.0
+        data = self._bin(data)
+        handle: FrameHandle
+        if self._buffer is not None:
+            handle, slot = self._buffer.claim()
+            self._digitize(data, slot)
+        else:
+            handle = self._digitize(data, np.empty(self.data_shape, dtype=self._dtype))
+        if metrics is not None:
+            metrics.count("frames")
+            metrics.observe("digitize", perf_counter() - start)
+        return handle
+
+    def _resolve(self, handle: FrameHandle, peek: bool = False) -> Frame:
+        """Return the frame associated with a handle returned by :meth:`_emit`.
+
+        Unless ``peek`` is set, a buffered frame is marked as read.
+        """
+        if isinstance(handle, int):
+            assert self._buffer is not None
+            if peek:
+                return self._buffer.peek(handle)
+            return self._buffer.frame(handle)
+        return handle
+
+    def _fetch(self, data: npt.NDArray[np.float64]) -> Frame:
+        """Digitize the image rendered by the microscope in a new frame."""
+        return self._digitize(
+            self._bin(data), np.empty(self.data_shape, dtype=self._dtype)
+        )
+
+    def _bin(self, data: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        """Sum blocks of ``binning`` pixels of an image, or of a stack of images."""
+        b = self._binning
+        if b == 1:
+            return data
+        *lead, height, width = data.shape
+        blocks = data.reshape(*lead, height // b, b, width // b, b)
+        return blocks.sum(axis=(-3, -1))
+
+    def _apply_readout(self) -> None:
+        """Render only the region of interest of the sensor."""
+        top, left, height, width = self.model_info.readout_region
+        sensor_height, sensor_width = self.model_info.sensor_shape
+        self._microscope._data_shape = (height, width)
+        self._microscope.view_offset = (
+            top + height / 2 - sensor_height / 2,
+            left + width / 2 - sensor_width / 2,
+        )
+        self._crop.data_shape = (height, width)
+        self._crop.pos = (0, 0)
+        self._binning = self.model_info.binning
+        if self._buffer is not None and self._buffer.shape != self.data_shape:
+            self._buffer = FrameBuffer(self._buffer.size, self.data_shape, self._dtype)
+        # the last frame does not match the new readout
+        self._last_frame = None
+
+    def _digitize(self, data: npt.NDArray[np.float64], out: Frame) -> Frame:
+        """Convert an analog image to digital values.
+
+        Equivalent to the conversion of :class:`openwfs.simulation.ADCProcessor`,
+        but the result is clipped and cast directly into ``out``, of any
+        unsigned integer type, rather than into a new ``uint16`` array.
+        ``data`` is modified in place.
+
+        ``out`` may also be a stack of frames, in which case ``data`` is
+        either a stack of images, scaled frame by frame, or a single image
+        broadcast to all the frames; the noise of all the frames is drawn
+        at once by the :class:`NoiseEngine`.
+
+        Parameters
+        ----------
+        data : npt.NDArray[np.float64]
+            The analog image(s).
+        out : Frame
+            The destination of the digitized image(s).
+
+        Returns
+        -------
+        out : Frame
+            The digitized image.
+
+        """
+        scale = float(self._scale)
+        if self.analog_max is None:  # auto scaling, frame by frame
+            max_value = np.max(data, axis=(-2, -1), keepdims=True)
+            max_value[max_value <= 0.0] = self.digital_max * scale
+            np.multiply(data, self.digital_max * scale / max_value, out=data)
+        else:
+            np.multiply(data, self.digital_max / self.analog_max * scale, out=data)
+
+        data = self._noise.apply(data, out.shape)
+
+        if self._amplifier_bias != 0.0:
+            data += self._amplifier_bias
+
+        np.rint(data, out=data)
+        return np.clip(data, 0, self.digital_max, out=out, casting="unsafe")
+
+    def acquire_batch(
+        self,
+        n: int,
+        positions: Optional[npt.ArrayLike] = None,
+        out: Optional[Frame] = None,
+    ) -> Frame:
+        """Acquire a burst of frames in a single vectorized pass.
+
+        Without ``positions``, ``n`` frames of a time series are acquired
+        at the current position; the image is rendered once and only the
+        noise differs between frames. With ``positions``, a z-stack is
+        acquired with the focus stage at each of the given positions.
+
+        The noise of all the frames is drawn at once and the frames are
+        digitized directly into a single ``(n, height, width)`` array.
+        The frame buffer and the last frame returned by :meth:`read`
+        are not affected.
+
+        Parameters
+        ----------
+        n : int
+            The number of frames.
+        positions : npt.ArrayLike, optional
+            Positions of the focus stage in micrometers, shape ``(n,)``.
+        out : Frame, optional
+            Preallocated destination of the frames, of shape
+            ``(n, height, width)`` and of the camera data type.
+
+        Returns
+        -------
+        frames : Frame
+            The acquired frames.
+
+        Raises
+        ------
+        ValueError
+            If ``positions`` or ``out`` do not match ``n`` frames.
+
+        """
+        shape = (n, *self.data_shape)
+        if out is None:
+            out = np.empty(shape, dtype=self._dtype)
+        elif out.shape != shape or out.dtype != self._dtype:
+            raise ValueError(
+                f"Expected an output array of shape {shape} and type {self._dtype}, "
+                f"got {out.shape} and {out.dtype}"
+            )
+        metrics = self._metrics
+        start = perf_counter() if metrics is not None else 0.0
+        if positions is None:
+            data = self._crop.trigger(immediate=True).result()
+        else:
+            defocus = np.asarray(positions, dtype=np.float64)
+            if defocus.shape != (n,):
+                raise ValueError(f"Expected {n} positions, got shape {defocus.shape}")
+            data = self._microscope.render_stack(defocus * u.um)
+        self._digitize(self._bin(data), out)
+        if metrics is not None:
+            metrics.count("frames", n)
+            metrics.observe("batch", perf_counter() - start)
+        writer = self._writer
+        if writer is not None:
+            timestamp = self._clock.time()
+            for frame in out:
+                writer.write(frame, timestamp)
+        return out
+
+    def couple_stage(
+        self,
+        motor: Union[OpenWFSMotor, BankMotor],
+        *,
+        x: Optional[str] = None,
+        y: Optional[str] = None,
+        z: Optional[str] = None,
+        margin: int = 32,
+    ) -> None:
+        """Drive the position of the specimen with the axis of a motor.
+
+        The readback of the ``x`` and ``y`` axis moves the specimen
+        laterally, the readback of the ``z`` axis defocuses the image.
+        Positions are converted from the engineering units of the motor.
+
+        Each frame renders a canvas extending ``margin`` pixels beyond the
+        sensor; following lateral moves by a whole number of sensor pixels
+        which remain within the margin only crop the canvas, without rendering
+        a new image. Changes of focus or optics always render a new canvas.
+
+        Parameters
+        ----------
+        motor : OpenWFSMotor | BankMotor
+            The motor moving the specimen.
+        x : str, optional
+            The axis moving the specimen along the sensor columns.
+        y : str, optional
+            The axis moving the specimen along the sensor rows.
+        z : str, optional
+            The axis moving the specimen along the optical axis.
+        margin : int, optional
+            Margin of the rendered canvas in sensor pixels;
+            0 renders each frame independently. Default is 32.
+
+        Raises
+        ------
+        IndexError
+            If an axis is not an axis of ``motor``.
+        ValueError
+            If the engineering units of ``motor`` are not a length.
+
+        """
+        if x is not None or y is not None:
+            self._microscope.xy_stage = MotorXYStage(
+                x=MotorAxis(motor, x) if x is not None else None,
+                y=MotorAxis(motor, y) if y is not None else None,
+            )
+        if z is not None:
+            self._microscope.z_stage = MotorZStage(MotorAxis(motor, z))
+        self._microscope.canvas_margin = margin
+
+    def start_recording(self, path: Union[str, Path], **options: Any) -> FrameWriter:
+        """Start streaming all the acquired frames to a Zarr or HDF5 store.
+
+        Every frame acquired by :meth:`trigger`, the continuous acquisition
+        or :meth:`acquire_batch` is written, with its timestamp, by a
+        :class:`FrameWriter` until :meth:`stop_recording` is called.
+
+        Parameters
+        ----------
+        path : str | Path
+            The store; a ``.zarr`` directory or an ``.h5``/``.hdf5`` file.
+        **options : Any
+            Options of the :class:`FrameWriter`
+            (``chunk_frames``, ``max_chunks``, ``compression``, ``block``).
+
+        Returns
+        -------
+        writer : FrameWriter
+            The writer, e.g. to monitor its statistics.
+
+        Raises
+        ------
+        RuntimeError
+            If the camera is already recording.
+
+        """
+        if self._writer is not None:
+            raise RuntimeError(f"{self.name} is already recording.")
+        self._writer = FrameWriter(path, self.data_shape, self._dtype, **options)
+        return self._writer
+
+    def stop_recording(self) -> None:
+        """Stop recording, and wait for the remaining frames to be written."""
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.close()
+
+    def enable_metrics(self, enabled: bool = True) -> None:
+        """Enable or disable the collection of metrics.
+
+        When enabled, the camera records the number of frames (``frames``)
+        and the latency histograms of the acquisitions started by :meth:`trigger`
+        (``trigger``), of the frames rendered synchronously or by the continuous
+        acquisition (``render``), of the digitization (``digitize``) and of
+        :meth:`acquire_batch` (``batch``). Enabling the metrics again resets
+        them; disabled metrics have no overhead.
+
+        Parameters
+        ----------
+        enabled : bool, optional
+            Whether to collect metrics. Default is ``True``.
+
+        """
+        self._metrics = DeviceMetrics(self.name) if enabled else None
+
+    def read_metrics(self) -> dict[str, Any]:
+        """Read the metrics of the camera.
+
+        See :meth:`enable_metrics`. The number of frames queued by the
+        continuous acquisition (``stream_queue``) and waiting in the frame
+        buffer (``buffer_pending``) are reported as gauges; the frames dropped
+        by the continuous acquisition (``frames_dropped``) and overwritten
+        in the frame buffer before being read (``buffer_overruns``) as counters.
+        While recording, the statistics of the writer (see :meth:`start_recording`)
+        are reported too.
+
+        Returns
+        -------
+        metrics : dict[str, Any]
+            The ``counters``, ``gauges`` and ``histograms`` of the camera;
+            an empty dictionary if the metrics are disabled.
+
+        """
+        metrics = self._metrics
+        if metrics is None:
+            return {}
+        gauges: dict[str, float] = {}
+        counters: dict[str, int] = {}
+        if self._stream is not None:
+            gauges["stream_queue"] = self._stream.queued
+            counters["frames_dropped"] = self._stream.frames_dropped
+        if self._buffer is not None:
+            gauges["buffer_pending"] = self._buffer.pending
+            counters["buffer_overruns"] = self._buffer.overruns
+        writer = self._writer
+        if writer is not None:
+            stats = writer.stats()
+            gauges["writer_pending_chunks"] = stats["pending_chunks"]
+            gauges["writer_throughput"] = stats["throughput"]
+            counters["writer_frames_written"] = int(stats["frames_written"])
+            counters["writer_frames_dropped"] = int(stats["frames_dropped"])
+        return metrics.snapshot(gauges, counters)
+
+    @property
+    def clock(self) -> Clock:
+        """The clock of the simulation."""
+        return self._clock
+
+    @property
+    def data_shape(self) -> tuple[int, int]:
+        """The shape of the frames, after binning of the region of interest."""
+        return self.model_info.frame_shape
+
+    @property
+    def noise_engine(self) -> NoiseEngine:
+        """The engine drawing the sensor noise of the frames.
+
+        It can be replaced by any subclass of :class:`NoiseEngine`
+        overriding :meth:`NoiseEngine.apply`.
+        """
+        return self._noise
+
+    @noise_engine.setter
+    def noise_engine(self, engine: NoiseEngine) -> None:
+        self._noise = engine
+
+    @property
+    def frame_buffer(self) -> Optional[FrameBuffer]:
+        """The frame ring buffer, if enabled by ``model_info.buffer_size``."""
+        return self._buffer
 
     def configure(self, name: str, value: Any) -> None:
         """Configure the camera.
 
+        When ``specimen`` is configured, the new magnification, numerical
+        aperture and wavelength are applied to the simulated microscope;
+        the specimen image itself is not regenerated. ``roi`` and ``binning``
+        are applied from the next frame; they cannot be configured during
+        the continuous acquisition. Configuring ``noise`` replaces the
+        noise engine, restarting its random streams.
+
+        The configuration documents are then regenerated and the subscribed
+        callbacks are notified (see :meth:`subscribe_configuration`).
+
         Parameters
         ----------
         name : str
@@ -219,39 +1254,91 @@ class OpenWFSCamera(Camera):
         value : Any
             The value to set the configuration
 
+        Raises
+        ------
+        RuntimeError
+            If ``roi`` or ``binning`` are configured during the continuous acquisition.
+
         """
+        readout = name in ("roi", "binning")
+        if readout and self._stream is not None and self._stream.running:
+            raise RuntimeError(
+                f"Cannot configure {name} of {self.name} while streaming."
+            )
         setattr(self.model_info, name, value)
+        if readout:
+            self._apply_readout()
+            # the frames left by a stopped acquisition do not match the new readout
+            self._stream = None
+        if name == "noise":
+            self.noise_engine = NoiseEngine(self.model_info.noise)
+        if name == "specimen":
+            specimen = self.model_info.specimen
+            self._microscope.magnification = specimen.magnification
+            self._microscope.numerical_aperture = specimen.numerical_aperture
+            self._microscope.wavelength = specimen.wavelength * u.nm
+        # callbacks are notified once the new configuration is in effect
+        self._documents.changed(name)
 
     def read_configuration(self) -> dict[str, Any]:
         """Read the device configuration as a Bluesky document.
 
+        The document is cached until the next call to :meth:`configure`;
+        it must not be modified.
+
         Returns
         -------
         configuration : dict[str, Any]
             The configuration parameters of the device.
 
         """
-        return self.model_info.read_configuration()
+        return self._documents.read()
 
     def describe_configuration(self) -> dict[str, Any]:
         """Describe the device configuration as a Bluesky document.
 
+        The document is cached until the next call to :meth:`configure`;
+        it must not be modified.
+
         Returns
         -------
         configuration : dict[str, Any]
             The configuration parameters of the device.
 
         """
-        return self.model_info.describe_configuration()
+        return self._documents.describe()
+
+    def subscribe_configuration(self, callback: ConfigurationCallback) -> None:
+        """Call ``callback`` after each call to :meth:`configure`.
+
+        Parameters
+        ----------
+        callback : ConfigurationCallback
+            Called with the name and the new value of the configuration parameter.
+
+        """
+        self._documents.subscribe(callback)
+
+    def unsubscribe_configuration(self, callback: ConfigurationCallback) -> None:
+        """Stop calling a callback registered with :meth:`subscribe_configuration`."""
+        self._documents.unsubscribe(callback)
+
+    @property
+    def configuration_version(self) -> int:
+        """Version of the configuration documents, increased by :meth:`configure`."""
+        return self._documents.version
 
     @property
     def name(self) -> str:
+        """The name of the camera."""
         return self._name
 
     @property
     def parent(self) -> None:
+        """Model parent. For compatibility with Bluesky's ophyd interface."""
         return None
 
     @property
     def model_info(self) -> OpenWFSCameraInfo:
+        """The model information."""
         return self._model_info
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import numpy as np
+import numpy.typing as npt
+
+__all__ = ["move_duration", "plan_trajectory"]
+
+
+def move_duration(
+    distance: npt.ArrayLike,
+    velocity: npt.ArrayLike,
+    acceleration: npt.ArrayLike,
+    settle_time: float = 0.0,
+) -> npt.NDArray[np.float64]:
+    """Compute the time required to travel ``distance`` with a trapezoidal profile.
+
+    The motor accelerates up to ``velocity``, cruises and decelerates
+    back to rest. When the move is too short to reach full velocity the
+    profile degenerates into a triangle. All inputs are broadcast
+    against each other, so that multiple moves can be evaluated at once.
+
+    Parameters
+    ----------
+    distance : ``npt.ArrayLike``
+        Travelled distance in engineering units; the sign is ignored.
+    velocity : ``npt.ArrayLike``
+        Maximum velocity in engineering units per second.
+        A value of ``0`` models an instantaneous travel.
+    acceleration : ``npt.ArrayLike``
+        Acceleration in engineering units per second squared.
+        A value of ``0`` models an infinite acceleration.
+    settle_time : ``float``, optional
+        Time in seconds added to each non-zero move
+        to simulate the motor settling on the setpoint.
+        Default is 0.0 seconds.
+
+    Returns
+    -------
+    duration : ``npt.NDArray[np.float64]``
+        The duration of the move(s) in seconds.
+
+    """
+    distance = np.abs(np.asarray(distance, dtype=np.float64))
+    velocity = np.asarray(velocity, dtype=np.float64)
+    acceleration = np.asarray(acceleration, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cruise = np.where(velocity > 0.0, distance / velocity, 0.0)
+        # time spent to ramp up to full velocity (and back down to rest)
+        ramp = np.where(acceleration > 0.0, velocity / acceleration, 0.0)
+        triangular = (acceleration > 0.0) & (velocity * ramp > distance)
+        travel = np.where(
+            triangular,
+            2.0 * np.sqrt(distance / np.where(triangular, acceleration, 1.0)),
+            cruise + ramp,
+        )
+    return np.where(distance > 0.0, travel + settle_time, 0.0)
+
+
+def plan_trajectory(
+    start: npt.NDArray[np.float64],
+    points: npt.NDArray[np.float64],
+    step_size: npt.NDArray[np.float64],
+    velocity: npt.ArrayLike,
+    acceleration: npt.ArrayLike,
+    settle_time: float = 0.0,
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """Quantize a multi-axis trajectory and compute when each point is reached.
+
+    Each point of the trajectory is reached when the slowest axis
+    completes its segment; segments are travelled one after the other.
+
+    Parameters
+    ----------
+    start : ``npt.NDArray[np.float64]``
+        Starting position of each axis, shape ``(K,)``.
+    points : ``npt.NDArray[np.float64]``
+        Trajectory points, shape ``(N, K)``.
+    step_size : ``npt.NDArray[np.float64]``
+        Step size of each axis, shape ``(K,)``.
+    velocity : ``npt.ArrayLike``
+        Maximum velocity; see :func:`move_duration`.
+    acceleration : ``npt.ArrayLike``
+        Acceleration; see :func:`move_duration`.
+    settle_time : ``float``, optional
+        Settle time added to each segment; see :func:`move_duration`.
+
+    Returns
+    -------
+    positions : ``npt.NDArray[np.float64]``
+        The trajectory points rounded to the step size grid, shape ``(N, K)``.
+    offsets : ``npt.NDArray[np.float64]``
+        Time in seconds, relative to the trajectory start,
+        at which each point is reached, shape ``(N,)``.
+
+    """
+    positions = start + np.round((points - start) / step_size) * step_size
+    distance = np.diff(positions, axis=0, prepend=start[np.newaxis])
+    durations = move_duration(distance, velocity, acceleration, settle_time)
+    return positions, np.cumsum(durations.max(axis=1))
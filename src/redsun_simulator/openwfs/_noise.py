@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+if TYPE_CHECKING:
+    from ._config import Noise
+
+__all__ = ["NoiseEngine"]
+
+#: number of image rows in each block of noise
+_BLOCK_ROWS = 64
+
+#: executor shared by all the noise engines of the process
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class NoiseEngine:
+    """Sensor noise generator, drawing blocks of a frame in parallel threads.
+
+    The expected signal of each pixel, in photoelectrons, is increased by
+    the dark current; Poisson (shot) noise is then drawn, or approximated
+    by Gaussian noise of the same variance above ``gaussian_threshold``
+    photoelectrons, and Gaussian read noise is added.
+
+    Frames are split into blocks of rows. Each block always draws its noise
+    from its own ``numpy.random.Generator``, spawned from the seed of the
+    noise model, so that the noise only depends on the seed and on the
+    sequence of frames, not on the number of threads. The threads are
+    shared by all the engines, at most one per CPU.
+
+    Parameters
+    ----------
+    noise : ``Noise``
+        The noise model.
+
+    """
+
+    def __init__(self, noise: Noise) -> None:
+        self._noise = noise
+        self._seed = np.random.SeedSequence(noise.seed)
+        self._generators: list[np.random.Generator] = []
+        self._threads = noise.threads or os.cpu_count() or 1
+        # the generators are shared by all the frames
+        self._lock = threading.Lock()
+
+    def apply(
+        self, data: npt.NDArray[np.float64], shape: tuple[int, ...]
+    ) -> npt.NDArray[np.float64]:
+        """Draw the noisy signal of one or several frames.
+
+        Parameters
+        ----------
+        data : ``npt.NDArray[np.float64]``
+            The expected signal in photoelectrons; either of ``shape``,
+            or a single frame broadcast to a stack of frames of ``shape``.
+        shape : ``tuple[int, ...]``
+            The shape of the frame, or of the stack of frames.
+
+        Returns
+        -------
+        signal : ``npt.NDArray[np.float64]``
+            The noisy signal, of ``shape``.
+
+        """
+        noise = self._noise
+        if not noise.shot_noise and noise.dark_current == 0 and noise.read_noise == 0:
+            return np.array(np.broadcast_to(data, shape), dtype=np.float64)
+        signal = np.broadcast_to(data, shape).reshape(-1, shape[-1])
+        out = np.empty(signal.shape, dtype=np.float64)
+        blocks = [
+            (index, slice(start, start + _BLOCK_ROWS))
+            for index, start in enumerate(range(0, signal.shape[0], _BLOCK_ROWS))
+        ]
+        tasks = min(self._threads, len(blocks))
+        with self._lock:
+            self._spawn(len(blocks))
+            if tasks == 1:
+                self._draw_blocks(blocks, signal, out)
+            else:
+                executor = _shared_executor()
+                futures = [
+                    executor.submit(self._draw_blocks, blocks[i::tasks], signal, out)
+                    for i in range(tasks)
+                ]
+                for future in futures:
+                    future.result()
+        return out.reshape(shape)
+
+    def _spawn(self, count: int) -> None:
+        """Create the generators of the first ``count`` blocks."""
+        missing = count - len(self._generators)
+        if missing > 0:
+            self._generators.extend(
+                np.random.Generator(np.random.PCG64(seed))
+                for seed in self._seed.spawn(missing)
+            )
+
+    def _draw_blocks(
+        self,
+        blocks: list[tuple[int, slice]],
+        signal: npt.NDArray[np.float64],
+        out: npt.NDArray[np.float64],
+    ) -> None:
+        """Draw the noise of the given blocks of rows into ``out``."""
+        for index, rows in blocks:
+            self._draw(index, signal[rows], out[rows])
+
+    def _draw(
+        self,
+        index: int,
+        signal: npt.NDArray[np.float64],
+        out: npt.NDArray[np.float64],
+    ) -> None:
+        """Draw the noise of a block of rows into ``out``."""
+        noise = self._noise
+        rng = self._generators[index]
+        if noise.dark_current > 0:
+            np.add(signal, noise.dark_current, out=out)
+        else:
+            out[...] = signal
+        if noise.shot_noise:
+            bright = out > noise.gaussian_threshold
+            if bright.any():
+                mean = out[bright]
+                dim = ~bright
+                out[dim] = rng.poisson(out[dim])
+                out[bright] = mean + np.sqrt(mean) * rng.standard_normal(mean.size)
+            else:
+                out[...] = rng.poisson(out)
+        if noise.read_noise > 0:
+            out += rng.normal(scale=noise.read_noise, size=out.shape)
+
+    @property
+    def noise(self) -> Noise:
+        """The noise model."""
+        return self._noise
+
+
+def _shared_executor() -> ThreadPoolExecutor:
+    """Return the executor of the noise engines, with one thread per CPU."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                os.cpu_count() or 1, thread_name_prefix="noise"
+            )
+        return _executor
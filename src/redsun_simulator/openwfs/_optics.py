@@ -0,0 +1,431 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional, Union
+
+import astropy.units as u
+import numpy as np
+import numpy.typing as npt
+from astropy.units import Quantity
+from openwfs.simulation import Microscope, StaticSource
+from openwfs.utilities import get_pixel_size, patterns, place
+from openwfs.utilities.patterns import propagation
+from scipy import fft
+
+from ._specimen import SpecimenSource
+
+if TYPE_CHECKING:
+    from openwfs import Detector
+
+__all__ = [
+    "CacheInfo",
+    "OpticalTransfer",
+    "SimulatedMicroscope",
+    "psf_cache_clear",
+    "psf_cache_info",
+]
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of the optical transfer cache."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class OpticalTransfer(NamedTuple):
+    """Point spread function of the microscope and its transfer function.
+
+    Attributes
+    ----------
+    psf : ``npt.NDArray[np.float64]``
+        Intensity point spread function, centered in the array.
+    otf : ``npt.NDArray[np.complex128]``
+        Real FFT of ``psf`` zero-padded to ``fft_shape``.
+    fft_shape : ``tuple[int, int]``
+        Shape of the linear convolution of an image with ``psf``,
+        rounded up to fast FFT sizes.
+
+    """
+
+    psf: npt.NDArray[np.float64]
+    otf: npt.NDArray[np.complex128]
+    fft_shape: tuple[int, int]
+
+
+#: key of the optical transfer cache: numerical aperture, wavelength (nm),
+#: object plane pixel size (nm), image shape and defocus (um)
+TransferKey = tuple[float, float, tuple[float, ...], tuple[int, ...], float]
+
+
+class _TransferCache:
+    """Thread-safe LRU cache of optical transfers shared by all cameras."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._entries: OrderedDict[TransferKey, OpticalTransfer] = OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: TransferKey) -> Optional[OpticalTransfer]:
+        with self._lock:
+            transfer = self._entries.get(key)
+            if transfer is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries.move_to_end(key)
+            return transfer
+
+    def put(self, key: TransferKey, transfer: OpticalTransfer) -> None:
+        with self._lock:
+            self._entries[key] = transfer
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self._hits, self._misses, self._maxsize, len(self._entries)
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+_transfer_cache = _TransferCache(maxsize=32)
+
+#: number of planes of a stack transformed at once by ``render_stack``
+_STACK_CHUNK = 8
+
+
+def psf_cache_info() -> CacheInfo:
+    """Return the hit/miss statistics of the optical transfer cache."""
+    return _transfer_cache.info()
+
+
+def psf_cache_clear() -> None:
+    """Clear the optical transfer cache and its statistics."""
+    _transfer_cache.clear()
+
+
+class _Canvas(NamedTuple):
+    """Rendered image extending beyond the field of view."""
+
+    key: TransferKey
+    stage: Quantity
+    image: npt.NDArray[np.float64]
+
+
+class SimulatedMicroscope(Microscope):
+    """A :class:`openwfs.simulation.Microscope` caching its optical transfer.
+
+    The point spread function only depends on the numerical aperture,
+    the wavelength, the pixel size in the object plane, the image shape
+    and the defocus of the z stage. It is computed once for each combination
+    of these parameters, together with its Fourier transform, and stored in
+    an LRU cache shared by all the instances in the process.
+
+    Aberrations and incident fields are not cached; if either is set,
+    the image is computed by the base class.
+
+    The source can also be a :class:`SpecimenSource`, in which case
+    only the region of the specimen in the field of view is read for
+    each frame. Aberrations and incident fields are not supported
+    with such sources.
+
+    With a :class:`SpecimenSource` and a positive ``canvas_margin``,
+    a canvas extending ``canvas_margin`` pixels beyond each side of the
+    field of view is rendered and kept. As long as the optics do not
+    change, lateral stage moves by a whole number of image pixels that stay
+    within the margin are served by cropping the canvas instead of
+    rendering a new image. Near the edges of the field of view, such images
+    include the light spreading in from outside of it.
+
+    Attributes
+    ----------
+    canvas_margin : ``int``
+        Margin of the rendered canvas in image pixels; 0 disables the canvas.
+    view_offset : ``tuple[float, float]``
+        Offset of the center of the image from the optical axis, in image
+        pixels along the rows and columns; used to render a region of
+        interest of a larger sensor.
+
+    """
+
+    def __init__(
+        self,
+        source: Union[Detector, npt.NDArray[Any], SpecimenSource],
+        **kwargs: Any,
+    ) -> None:
+        self._specimen: Optional[SpecimenSource] = None
+        if isinstance(source, SpecimenSource):
+            self._specimen = source
+            # the specimen is read directly in _fetch; the processor chain
+            # only requires a (trivial) source detector
+            source = StaticSource(np.zeros((1, 1)), pixel_size=source.pixel_size)
+        super().__init__(source, **kwargs)
+        self.canvas_margin = 0
+        self.view_offset = (0.0, 0.0)
+        self._canvas: Optional[_Canvas] = None
+
+    def _fetch(
+        self,
+        source: npt.NDArray[Any],
+        aberrations: Optional[npt.NDArray[Any]],
+        incident_field: Optional[npt.NDArray[Any]],
+    ) -> npt.NDArray[np.float64]:
+        """Render the image of the specimen, or of ``source``, on the camera."""
+        if aberrations is not None or incident_field is not None:
+            if self._specimen is not None:
+                raise NotImplementedError(
+                    "Aberrations and incident fields require an array source."
+                )
+            return super()._fetch(source, aberrations, incident_field)  # type: ignore[no-any-return]
+
+        if self._specimen is not None and self.canvas_margin > 0:
+            target_pixel_size = self.pixel_size / self.magnification
+            stage = self._stage(target_pixel_size)
+            return self._fetch_canvas(self._specimen, target_pixel_size, stage)
+
+        image = self._place(source)
+        transfer = self.optical_transfer()
+        return self._convolve(image, transfer)
+
+    def render_stack(
+        self, defocus: Quantity, out: Optional[npt.NDArray[np.float64]] = None
+    ) -> npt.NDArray[np.float64]:
+        """Image the specimen at several positions of the focus stage.
+
+        The specimen is placed and transformed once; its spectrum is then
+        multiplied by the (cached) optical transfer of each plane and all
+        planes are transformed back with batched, multithreaded inverse FFTs.
+
+        Parameters
+        ----------
+        defocus : ``Quantity``
+            Positions of the focus stage, shape ``(N,)``.
+        out : ``npt.NDArray[np.float64]``, optional
+            Destination of the images, shape ``(N, *data_shape)``.
+
+        Returns
+        -------
+        stack : ``npt.NDArray[np.float64]``
+            The images, shape ``(N, *data_shape)``.
+
+        Raises
+        ------
+        NotImplementedError
+            If aberrations or incident fields are set.
+
+        """
+        if any(source is not None for source in self._sources[1:]):
+            raise NotImplementedError(
+                "Aberrations and incident fields are not supported in stacks."
+            )
+        planes = np.atleast_1d(defocus)
+        height, width = self.data_shape
+        if out is None:
+            out = np.empty((planes.size, height, width), dtype=np.float64)
+        source = self._sources[0].read() if self._specimen is None else None
+        image = self._place(source)
+        transfer = self.optical_transfer()
+        spectrum = fft.rfft2(image, transfer.fft_shape)
+        top = (height - 1) // 2
+        left = (width - 1) // 2
+        # planes are transformed in chunks to bound the size of the padded stack
+        product = np.empty((_STACK_CHUNK, *spectrum.shape), dtype=spectrum.dtype)
+        for start in range(0, planes.size, _STACK_CHUNK):
+            chunk = planes[start : start + _STACK_CHUNK]
+            for i, z in enumerate(chunk):
+                otf = self.optical_transfer(defocus=z).otf
+                np.multiply(spectrum, otf, out=product[i])
+            full = fft.irfft2(product[: chunk.size], transfer.fft_shape, workers=-1)
+            out[start : start + chunk.size] = full[
+                :, top : top + height, left : left + width
+            ]
+        return np.maximum(out, 0.0, out=out)
+
+    def _place(self, source: Optional[npt.NDArray[Any]]) -> npt.NDArray[np.float64]:
+        """Place the source (or specimen) in view on the image."""
+        target_pixel_size = self.pixel_size / self.magnification
+        stage = self._stage(target_pixel_size)
+        if self._specimen is None:
+            # see Microscope._fetch for the one pixel shift
+            shift = stage - get_pixel_size(source)
+            image = place(self.data_shape, target_pixel_size, source, shift)
+        else:
+            image = self._place_specimen(
+                self._specimen, target_pixel_size, stage, self.data_shape
+            )
+        return np.asarray(image, dtype=np.float64)
+
+    def _stage(self, target_pixel_size: Quantity) -> Quantity:
+        """Position of the specimen relative to the center of the image."""
+        stage = Quantity((self.xy_stage.y, self.xy_stage.x))
+        if self.view_offset != (0.0, 0.0):
+            stage = stage - np.asarray(self.view_offset) * target_pixel_size
+        return stage
+
+    def _fetch_canvas(
+        self, specimen: SpecimenSource, target_pixel_size: Quantity, stage: Quantity
+    ) -> npt.NDArray[np.float64]:
+        """Crop the image from the canvas, rendering a new one if needed."""
+        margin = self.canvas_margin
+        height, width = self.data_shape
+        shape = (height + 2 * margin, width + 2 * margin)
+        key = self._transfer_key(shape)
+        canvas = self._canvas
+        if canvas is not None and canvas.key == key:
+            # the specimen moves on the sensor by as many pixels as the stage
+            moved = ((stage - canvas.stage) / target_pixel_size).to_value(
+                u.dimensionless_unscaled
+            )
+            steps = np.round(moved)
+            if np.all(np.abs(moved - steps) < 1e-6) and np.all(np.abs(steps) <= margin):
+                top, left = (margin - steps).astype(int)
+                return canvas.image[top : top + height, left : left + width].copy()
+
+        image = self._place_specimen(specimen, target_pixel_size, stage, shape)
+        transfer = self.optical_transfer(shape)
+        image = self._convolve(np.asarray(image, dtype=np.float64), transfer)
+        image.flags.writeable = False
+        self._canvas = _Canvas(key, stage, image)
+        return image[margin : margin + height, margin : margin + width].copy()
+
+    def _place_specimen(
+        self,
+        specimen: SpecimenSource,
+        target_pixel_size: Quantity,
+        stage: Quantity,
+        shape: tuple[int, ...],
+    ) -> npt.NDArray[Any]:
+        """Place the region of ``specimen`` in view on an image of the given shape.
+
+        Equivalent to placing the whole specimen, as done for array sources.
+        """
+        pixel_size = specimen.pixel_size * np.ones(2)
+        shift = stage - pixel_size
+        size = np.array(specimen.shape)
+        # specimen pixel at the center of the field of view, and half the
+        # size of the field of view in specimen pixels, with a safety margin
+        center = size / 2 - (shift / pixel_size).to_value(u.dimensionless_unscaled)
+        half = (np.array(shape) * target_pixel_size / pixel_size).to_value(
+            u.dimensionless_unscaled
+        ) / 2 + 2
+        top, left = np.clip(np.floor(center - half), 0, size).astype(int)
+        bottom, right = np.clip(np.ceil(center + half), 0, size).astype(int)
+        if bottom <= top or right <= left:
+            # the field of view is outside of the specimen
+            return np.zeros(shape)
+        region = specimen.region(top, left, bottom - top, right - left)
+        middle = np.array(((top + bottom) / 2, (left + right) / 2))
+        offset = shift + (middle - size / 2) * pixel_size
+        return place(shape, target_pixel_size, region, offset)  # type: ignore[no-any-return]
+
+    def optical_transfer(
+        self,
+        shape: Optional[tuple[int, ...]] = None,
+        defocus: Optional[Quantity] = None,
+    ) -> OpticalTransfer:
+        """Return the optical transfer for the current settings.
+
+        Parameters
+        ----------
+        shape : ``tuple[int, ...]``, optional
+            Shape of the image to convolve.
+            Default is the shape of the microscope image.
+        defocus : ``Quantity``, optional
+            Position of the focus stage.
+            Default is the current position of the ``z_stage``.
+
+        Returns
+        -------
+        transfer : ``OpticalTransfer``
+            The (possibly cached) optical transfer.
+
+        """
+        shape = tuple(shape if shape is not None else self.data_shape)
+        if defocus is None and self.z_stage is not None:
+            defocus = self.z_stage.position
+        key = self._transfer_key(shape, defocus)
+        transfer = _transfer_cache.get(key)
+        if transfer is None:
+            transfer = self._compute_transfer(
+                self.pixel_size / self.magnification, shape, defocus
+            )
+            _transfer_cache.put(key, transfer)
+        return transfer
+
+    def _transfer_key(
+        self, shape: tuple[int, ...], defocus: Optional[Quantity] = None
+    ) -> TransferKey:
+        """Return the cache key of the optical transfer for an image shape."""
+        target_pixel_size = self.pixel_size / self.magnification
+        if defocus is None and self.z_stage is not None:
+            defocus = self.z_stage.position
+        return (
+            float(self.numerical_aperture),
+            float(self.wavelength.to_value(u.nm)),
+            tuple(float(p) for p in np.atleast_1d(target_pixel_size.to_value(u.nm))),
+            tuple(shape),
+            float(defocus.to_value(u.um)) if defocus is not None else 0.0,
+        )
+
+    def _compute_transfer(
+        self,
+        target_pixel_size: Quantity,
+        shape: tuple[int, ...],
+        defocus: Optional[Quantity],
+    ) -> OpticalTransfer:
+        """Compute the optical transfer, as done by ``Microscope._fetch``."""
+        pupil_extent = self.wavelength / target_pixel_size
+        pupil_shape = shape
+        pupil_field = patterns.disk(
+            pupil_shape, radius=self.numerical_aperture, extent=pupil_extent
+        )
+        pupil_area = np.sum(pupil_field)
+        if defocus is not None:
+            phase = propagation(
+                pupil_shape,
+                distance=defocus,
+                wavelength=self.wavelength,
+                extent=pupil_extent,
+            )
+            pupil_field = pupil_field * np.exp(1j * phase)
+        psf = np.abs(np.fft.ifft2(pupil_field)) ** 2
+        psf = np.fft.ifftshift(psf) * (psf.size / pupil_area)
+
+        fft_shape = (
+            fft.next_fast_len(2 * pupil_shape[0] - 1, real=True),
+            fft.next_fast_len(2 * pupil_shape[1] - 1, real=True),
+        )
+        otf = fft.rfft2(psf, fft_shape)
+        # shared across instances: protect from accidental modification
+        psf.flags.writeable = False
+        otf.flags.writeable = False
+        return OpticalTransfer(psf, otf, fft_shape)
+
+    @staticmethod
+    def _convolve(
+        image: npt.NDArray[np.float64], transfer: OpticalTransfer
+    ) -> npt.NDArray[np.float64]:
+        """Convolve ``image`` with the PSF; equivalent to ``fftconvolve(..., "same")``."""
+        height, width = image.shape
+        full = fft.irfft2(
+            fft.rfft2(image, transfer.fft_shape) * transfer.otf, transfer.fft_shape
+        )
+        top = (height - 1) // 2
+        left = (width - 1) // 2
+        image = full[top : top + height, left : left + width]
+        # FFT round-off can produce tiny negative intensities,
+        # which are not accepted as the mean of the shot noise
+        return np.maximum(image, 0.0, out=image)
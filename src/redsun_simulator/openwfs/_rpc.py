@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import socket
+import struct
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Union
+
+import numpy as np
+import numpy.typing as npt
+
+__all__ = ["Address", "Command", "RemoteError"]
+
+#: address of a device server; a Unix socket path or a ``(host, port)`` pair
+Address = Union[str, Path, tuple[str, int]]
+
+#: length of the JSON header preceding the binary buffers of a message
+_PREFIX = struct.Struct("!I")
+
+
+class Command(NamedTuple):
+    """A method call on a device served by a ``DeviceServer``.
+
+    Attributes
+    ----------
+    device : ``str``
+        The name of the device.
+    method : ``str``
+        The name of the method.
+    args : ``tuple[Any, ...]``
+        The positional arguments.
+    kwargs : ``dict[str, Any]``, optional
+        The keyword arguments.
+
+    """
+
+    device: str
+    method: str
+    args: tuple[Any, ...] = ()
+    kwargs: Optional[dict[str, Any]] = None
+
+
+class RemoteError(RuntimeError):
+    """A command failed on the device server."""
+
+
+def connect(address: Address) -> socket.socket:
+    """Open a connection to a device server."""
+    if isinstance(address, tuple):
+        sock = socket.create_connection(address)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    else:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(str(address))
+    return sock
+
+
+def listen(address: Address) -> socket.socket:
+    """Open the listening socket of a device server.
+
+    An existing Unix socket file at ``address`` is replaced.
+    """
+    if isinstance(address, tuple):
+        sock = socket.create_server(address)
+    else:
+        path = Path(address)
+        if path.is_socket():
+            path.unlink()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(str(path))
+        sock.listen()
+    return sock
+
+
+def encode(value: Any, buffers: list[npt.NDArray[Any]]) -> Any:
+    """Convert a value to JSON types, moving its arrays to ``buffers``."""
+    if isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        buffers.append(array)
+        return {
+            "__ndarray__": len(buffers) - 1,
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+        }
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {key: encode(item, buffers) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode(item, buffers) for item in value]
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f"Cannot send a value of type {type(value).__name__}.")
+
+
+def decode(value: Any, buffers: list[bytearray]) -> Any:
+    """Convert a value returned by :func:`encode` back, with its arrays."""
+    if isinstance(value, dict):
+        index = value.get("__ndarray__")
+        if index is not None:
+            return np.frombuffer(buffers[index], dtype=value["dtype"]).reshape(
+                value["shape"]
+            )
+        return {key: decode(item, buffers) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode(item, buffers) for item in value]
+    return value
+
+
+def send_message(
+    sock: socket.socket, header: dict[str, Any], buffers: list[npt.NDArray[Any]]
+) -> None:
+    """Send a JSON header followed by the raw bytes of its arrays."""
+    header["buffers"] = [buffer.nbytes for buffer in buffers]
+    data = json.dumps(header).encode()
+    sock.sendall(_PREFIX.pack(len(data)) + data)
+    for buffer in buffers:
+        if buffer.nbytes:
+            sock.sendall(memoryview(buffer).cast("B"))
+
+
+def recv_message(
+    sock: socket.socket,
+) -> Optional[tuple[dict[str, Any], list[bytearray]]]:
+    """Receive a message sent by :func:`send_message`; ``None`` at end of stream."""
+    prefix = _recv_exact(sock, _PREFIX.size)
+    if prefix is None:
+        return None
+    (size,) = _PREFIX.unpack(prefix)
+    data = _recv_exact(sock, size)
+    if data is None:
+        return None
+    header = json.loads(data)
+    buffers: list[bytearray] = []
+    for nbytes in header.pop("buffers"):
+        buffer = _recv_exact(sock, nbytes)
+        if buffer is None:
+            return None
+        buffers.append(buffer)
+    return header, buffers
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytearray]:
+    """Receive exactly ``size`` bytes; ``None`` if the stream ends first."""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if count == 0:
+            return None
+        received += count
+    return buffer
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import weakref
+from typing import Callable, Optional
+
+from sunflare.log import get_logger
+
+from ._clock import Clock, get_clock
+
+__all__ = ["Scheduler", "get_scheduler"]
+
+#: seconds without scheduled callbacks after which the worker thread stops
+_IDLE_TIMEOUT = 1.0
+
+
+class Scheduler:
+    """Run callbacks at a given deadline from a single background thread.
+
+    Used by the simulated devices to complete their ``Status`` objects
+    after the modelled duration of an operation has elapsed, without
+    blocking the caller (i.e. the ``RunEngine`` thread).
+
+    The worker thread is started lazily on the first scheduled callback,
+    and stops when no callback was scheduled for a while, so that unused
+    schedulers (and their clocks) can be garbage collected;
+    callbacks are executed in deadline order.
+
+    Parameters
+    ----------
+    clock : ``Clock``
+        The clock in which the deadlines are expressed.
+
+    """
+
+    def __init__(self, clock: Clock) -> None:
+        self._clock = clock
+        self._queue: list[tuple[float, int, Callable[[], None]]] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def call_at(self, deadline: float, callback: Callable[[], None]) -> None:
+        """Schedule ``callback`` to run at ``deadline``.
+
+        Parameters
+        ----------
+        deadline : ``float``
+            Time at which to run the callback,
+            expressed in the ``monotonic`` reference of the clock.
+        callback : ``Callable[[], None]``
+            The function to call.
+
+        """
+        with self._condition:
+            heapq.heappush(self._queue, (deadline, next(self._counter), callback))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="redsun-simulator-scheduler", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> None:
+        """Schedule ``callback`` to run after ``delay`` seconds.
+
+        Parameters
+        ----------
+        delay : ``float``
+            Delay in seconds.
+        callback : ``Callable[[], None]``
+            The function to call.
+
+        """
+        self.call_at(self._clock.monotonic() + delay, callback)
+
+    @property
+    def pending(self) -> int:
+        """The number of callbacks waiting for their deadline."""
+        with self._condition:
+            return len(self._queue)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._queue:
+                    self._condition.wait(_IDLE_TIMEOUT)
+                    if not self._queue:
+                        # restarted by the next call_at
+                        self._thread = None
+                        return
+                deadline, _, callback = self._queue[0]
+                remaining = self._clock.delay_until(deadline)
+                if remaining > 0:
+                    # a new, earlier deadline may be pushed while waiting
+                    self._condition.wait(remaining)
+                    continue
+                heapq.heappop(self._queue)
+            try:
+                callback()
+            except Exception:
+                get_logger().exception("Error in scheduled callback %r", callback)
+
+
+#: schedulers by clock identity; a scheduler references its clock, so the
+#: identity is not reused while the scheduler is alive
+_schedulers: weakref.WeakValueDictionary[int, Scheduler] = weakref.WeakValueDictionary()
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler(clock: Optional[Clock] = None) -> Scheduler:
+    """Return the scheduler shared by all simulated devices using ``clock``.
+
+    The scheduler is shared as long as it is referenced,
+    e.g. by the devices or by its pending callbacks.
+
+    Parameters
+    ----------
+    clock : ``Clock``, optional
+        The clock of the devices. Default is the clock returned by ``get_clock``.
+
+    """
+    if clock is None:
+        clock = get_clock()
+    with _scheduler_lock:
+        scheduler = _schedulers.get(id(clock))
+        if scheduler is None:
+            scheduler = _schedulers[id(clock)] = Scheduler(clock)
+        return scheduler
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import argparse
+import socket
+import threading
+from pathlib import Path
+from typing import Any, Mapping, Optional, Sequence
+
+import numpy as np
+import numpy.typing as npt
+from sunflare.log import get_logger
+
+from ._rpc import Address, decode, encode, listen, recv_message, send_message
+
+__all__ = ["DeviceServer", "main"]
+
+#: methods of the devices which can be called by clients
+_METHODS = frozenset(
+    {
+        "set",
+        "move_many",
+        "locate",
+        "locate_many",
+        "trigger",
+        "read",
+        "describe",
+        "acquire_batch",
+        "configure",
+        "read_configuration",
+        "describe_configuration",
+        "enable_metrics",
+        "read_metrics",
+    }
+)
+
+
+class DeviceServer:
+    """Serve simulated devices over a local socket.
+
+    Clients (see ``DeviceClient``) send batches of commands, i.e. method
+    calls on the devices; the commands of a batch are started in order,
+    and the reply is sent once all the returned statuses are done, so that
+    many motors can be moved in a single round-trip. Arrays, such as frames,
+    are sent as raw bytes after a small JSON header.
+
+    Each connection is served by its own thread; the batches of a
+    connection are executed one after the other.
+
+    Parameters
+    ----------
+    devices : ``Mapping[str, Any]``
+        The devices, by name; e.g. the ``DeviceRegistry`` returned by
+        ``load_devices``, whose devices are constructed on first use.
+    address : ``Address``
+        A Unix socket path or a ``(host, port)`` pair; port 0 binds
+        to a free port (see :attr:`address`).
+
+    """
+
+    def __init__(self, devices: Mapping[str, Any], address: Address) -> None:
+        self._devices = devices
+        self._socket = listen(address)
+        self._address: Address = (
+            self._socket.getsockname() if isinstance(address, tuple) else address
+        )
+        self._connections: set[socket.socket] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def serve_forever(self) -> None:
+        """Accept and serve connections until :meth:`close` is called."""
+        while not self._closed:
+            try:
+                connection, _ = self._socket.accept()
+            except OSError:
+                break
+            if connection.family != socket.AF_UNIX:
+                connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with self._lock:
+                self._connections.add(connection)
+            threading.Thread(
+                target=self._serve,
+                args=(connection,),
+                name="device-server",
+                daemon=True,
+            ).start()
+
+    def start(self) -> None:
+        """Serve connections in a background thread."""
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="device-server", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop serving and close all the connections."""
+        self._closed = True
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._socket.close()
+        with self._lock:
+            for connection in self._connections:
+                try:
+                    connection.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        if self._thread is not None:
+            self._thread.join()
+        if not isinstance(self._address, tuple):
+            Path(self._address).unlink(missing_ok=True)
+
+    def __enter__(self) -> DeviceServer:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    @property
+    def address(self) -> Address:
+        """The address of the server."""
+        return self._address
+
+    def _serve(self, connection: socket.socket) -> None:
+        """Execute the batches received on a connection."""
+        send_lock = threading.Lock()
+        try:
+            while (message := recv_message(connection)) is not None:
+                header, buffers = message
+                commands = decode(header["commands"], buffers)
+                self._execute(connection, send_lock, header["id"], commands)
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                self._connections.discard(connection)
+            connection.close()
+
+    def _execute(
+        self,
+        connection: socket.socket,
+        send_lock: threading.Lock,
+        request: int,
+        commands: list[Any],
+    ) -> None:
+        """Start the commands of a batch and reply once they are all done."""
+        results: list[Any] = [None] * len(commands)
+        errors: list[Optional[str]] = [None] * len(commands)
+        buffers: list[npt.NDArray[Any]] = []
+        statuses: list[tuple[int, Any]] = []
+        for i, (device, method, args, kwargs) in enumerate(commands):
+            try:
+                result = self._call(device, method, args, kwargs or {})
+                if hasattr(result, "add_callback"):
+                    statuses.append((i, result))
+                else:
+                    # results are encoded (and frames referenced) right away
+                    results[i] = encode(result, buffers)
+            except Exception as exc:
+                errors[i] = f"{device}.{method}: {exc!r}"
+
+        def reply() -> None:
+            body = {"id": request, "results": results, "errors": errors}
+            try:
+                with send_lock:
+                    send_message(connection, body, buffers)
+            except OSError:
+                get_logger().warning("Lost the connection of a device client")
+
+        if not statuses:
+            reply()
+            return
+        # frames of a ring buffer could be overwritten before the reply
+        buffers[:] = [np.array(b) if b.base is not None else b for b in buffers]
+        remaining = [len(statuses)]
+        lock = threading.Lock()
+
+        def finished(i: int, status: Any) -> None:
+            exc = status.exception(timeout=0.0)
+            if exc is not None:
+                errors[i] = f"{commands[i][0]}.{commands[i][1]}: {exc!r}"
+            with lock:
+                remaining[0] -= 1
+                done = remaining[0] == 0
+            if done:
+                reply()
+
+        for i, status in statuses:
+            status.add_callback(lambda status, i=i: finished(i, status))
+
+    def _call(
+        self, device: str, method: str, args: list[Any], kwargs: dict[str, Any]
+    ) -> Any:
+        """Call a method of a device, or list the devices."""
+        if method == "list_devices":
+            return {name: self._model_name(name) for name in self._devices}
+        if method not in _METHODS:
+            raise AttributeError(f"{method} cannot be called remotely")
+        return getattr(self._devices[device], method)(*args, **kwargs)
+
+    def _model_name(self, name: str) -> str:
+        """Return the model name of a device, without constructing it."""
+        model_info = getattr(self._devices, "model_info", None)
+        if model_info is not None:  # DeviceRegistry
+            return str(model_info(name).model_name)
+        return str(self._devices[name].model_info.model_name)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Serve the devices of a configuration file until interrupted."""
+    from ._factory import load_devices
+
+    parser = argparse.ArgumentParser(
+        prog="redsun-simulator-server",
+        description="Serve the simulated devices of a configuration file.",
+    )
+    parser.add_argument("config", help="YAML file with a 'models' section")
+    address = parser.add_mutually_exclusive_group(required=True)
+    address.add_argument("--socket", help="path of a Unix socket")
+    address.add_argument("--port", type=int, help="TCP port on --host")
+    parser.add_argument("--host", default="127.0.0.1", help="default: 127.0.0.1")
+    options = parser.parse_args(argv)
+
+    devices = load_devices(options.config)
+    server = DeviceServer(
+        devices,
+        options.socket if options.socket else (options.host, options.port),
+    )
+    print(f"Serving {len(devices)} devices on {server.address}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Union
+
+import numpy as np
+import numpy.typing as npt
+from astropy.units import Quantity
+from openwfs.utilities import set_pixel_size
+
+__all__ = ["MappedSpecimen", "SpecimenSource", "TiledSpecimen"]
+
+
+class SpecimenSource(ABC):
+    """Source of a specimen image, read one region at a time.
+
+    Subclasses only need to provide the pixels of the requested region,
+    so that arbitrarily large specimens can be imaged without holding
+    the whole image in memory.
+
+    Parameters
+    ----------
+    shape : ``tuple[int, int]``
+        Size of the whole specimen in pixels (height, width).
+    pixel_size : ``Quantity``
+        Pixel size of the specimen.
+
+    """
+
+    def __init__(self, shape: tuple[int, int], pixel_size: Quantity) -> None:
+        self._shape = (int(shape[0]), int(shape[1]))
+        self._pixel_size = pixel_size
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Size of the specimen in pixels (height, width)."""
+        return self._shape
+
+    @property
+    def pixel_size(self) -> Quantity:
+        """Pixel size of the specimen."""
+        return self._pixel_size
+
+    def region(self, top: int, left: int, height: int, width: int) -> npt.NDArray[Any]:
+        """Return a region of the specimen.
+
+        The region is clipped to the bounds of the specimen.
+
+        Parameters
+        ----------
+        top : ``int``
+            First row of the region.
+        left : ``int``
+            First column of the region.
+        height : ``int``
+            Number of rows of the region.
+        width : ``int``
+            Number of columns of the region.
+
+        Returns
+        -------
+        region : ``npt.NDArray[Any]``
+            The pixels of the region, with ``pixel_size`` metadata.
+
+        """
+        bottom = min(max(top + height, 0), self._shape[0])
+        right = min(max(left + width, 0), self._shape[1])
+        top = min(max(top, 0), bottom)
+        left = min(max(left, 0), right)
+        return set_pixel_size(self._read(top, left, bottom, right), self._pixel_size)
+
+    @abstractmethod
+    def _read(self, top: int, left: int, bottom: int, right: int) -> npt.NDArray[Any]:
+        """Read the pixels in ``[top:bottom, left:right]``, already clipped."""
+
+
+class TiledSpecimen(SpecimenSource):
+    """Random specimen generated lazily, one tile at a time.
+
+    Each tile is generated from its own random stream, seeded by
+    ``seed`` and the tile coordinates: the specimen is the same
+    regardless of the order in which tiles are accessed,
+    and only the tiles in view are ever computed.
+    Recently used tiles are kept in an LRU cache.
+
+    Parameters
+    ----------
+    shape : ``tuple[int, int]``
+        Size of the whole specimen in pixels (height, width).
+    pixel_size : ``Quantity``
+        Pixel size of the specimen.
+    seed : ``int``
+        Seed of the specimen.
+    tile_size : ``int``
+        Size of the (square) tiles in pixels.
+    cache_size : ``int``
+        Maximum number of tiles kept in memory.
+
+    """
+
+    def __init__(
+        self,
+        shape: tuple[int, int],
+        pixel_size: Quantity,
+        seed: int,
+        tile_size: int,
+        cache_size: int,
+    ) -> None:
+        if tile_size < 1:
+            raise ValueError("Tiles must contain at least one pixel.")
+        if cache_size < 1:
+            raise ValueError("The cache must contain at least one tile.")
+        super().__init__(shape, pixel_size)
+        self._seed = seed
+        self._tile_size = tile_size
+        self._cache_size = cache_size
+        self._tiles: OrderedDict[tuple[int, int], npt.NDArray[np.int16]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generated = 0
+
+    def tile(self, row: int, column: int) -> npt.NDArray[np.int16]:
+        """Return a tile of the specimen, generating it if needed.
+
+        Tiles on the bottom and right edges are cropped to the specimen shape.
+
+        Parameters
+        ----------
+        row : ``int``
+            Row of the tile.
+        column : ``int``
+            Column of the tile.
+
+        Returns
+        -------
+        tile : ``npt.NDArray[np.int16]``
+            A read-only view of the tile.
+
+        """
+        key = (row, column)
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                return tile
+        tile = self._generate(row, column)
+        with self._lock:
+            self._tiles[key] = tile
+            self._generated += 1
+            while len(self._tiles) > self._cache_size:
+                self._tiles.popitem(last=False)
+        return tile
+
+    def _generate(self, row: int, column: int) -> npt.NDArray[np.int16]:
+        size = self._tile_size
+        shape = (
+            min(size, self._shape[0] - row * size),
+            min(size, self._shape[1] - column * size),
+        )
+        rng = np.random.default_rng((self._seed, row, column))
+        # sparse bright emitters on a dark background
+        tile = rng.integers(-10000, 10, shape, dtype=np.int16)
+        np.maximum(tile, 0, out=tile)
+        tile.flags.writeable = False
+        return tile
+
+    def _read(self, top: int, left: int, bottom: int, right: int) -> npt.NDArray[Any]:
+        size = self._tile_size
+        out = np.empty((bottom - top, right - left), dtype=np.int16)
+        for row in range(top // size, -(-bottom // size)):
+            for column in range(left // size, -(-right // size)):
+                tile = self.tile(row, column)
+                y0, x0 = row * size, column * size
+                y1, y2 = max(top, y0), min(bottom, y0 + size)
+                x1, x2 = max(left, x0), min(right, x0 + size)
+                out[y1 - top : y2 - top, x1 - left : x2 - left] = tile[
+                    y1 - y0 : y2 - y0, x1 - x0 : x2 - x0
+                ]
+        return out
+
+    @property
+    def tiles_cached(self) -> int:
+        """Number of tiles currently in the cache."""
+        return len(self._tiles)
+
+    @property
+    def tiles_generated(self) -> int:
+        """Total number of tiles generated, including regenerated evicted tiles."""
+        return self._generated
+
+
+#: data types supported by the image placement in the simulated microscope
+_SUPPORTED_DTYPES = tuple(
+    np.dtype(t) for t in (np.uint8, np.uint16, np.int16, np.float32, np.float64)
+)
+
+
+class MappedSpecimen(SpecimenSource):
+    """Specimen image memory-mapped from a file.
+
+    Only the pixels of the requested regions are read from disk;
+    the pages are shared through the page cache of the operating system
+    between all the cameras (and processes) mapping the same file.
+
+    Supported formats are:
+
+    - NumPy ``.npy`` files;
+    - uncompressed TIFF files (``.tif``, ``.tiff``), requires ``tifffile``;
+    - local Zarr arrays (``.zarr``), requires ``zarr``.
+
+    Parameters
+    ----------
+    path : ``Union[str, Path]``
+        Path to the specimen image; it must contain a 2D array.
+    pixel_size : ``Quantity``
+        Pixel size of the specimen.
+
+    Raises
+    ------
+    ValueError
+        If the format is not supported or the image is not 2D.
+    ImportError
+        If the package required to read the format is not installed.
+
+    """
+
+    def __init__(self, path: Union[str, Path], pixel_size: Quantity) -> None:
+        self._path = Path(path)
+        self._array = _open_array(self._path)
+        if self._array.ndim != 2:
+            raise ValueError(
+                f"The specimen must be a 2D image; {self._path} "
+                f"has shape {self._array.shape}."
+            )
+        super().__init__(self._array.shape, pixel_size)
+
+    @property
+    def path(self) -> Path:
+        """Path to the specimen image."""
+        return self._path
+
+    def _read(self, top: int, left: int, bottom: int, right: int) -> npt.NDArray[Any]:
+        region = np.asarray(self._array[top:bottom, left:right])
+        if region.dtype not in _SUPPORTED_DTYPES:
+            return region.astype(np.float64)
+        return region
+
+
+def _open_array(path: Path) -> Any:
+    """Open a file as a lazily read array, without loading its content."""
+    suffix = path.suffix.lower()
+    if suffix == ".npy":
+        return np.load(path, mmap_mode="r")
+    if suffix in (".tif", ".tiff"):
+        try:
+            import tifffile
+        except ImportError as exc:
+            raise ImportError(
+                "Reading TIFF specimens requires tifffile; "
+                "install it with 'pip install redsun-simulator[specimen]'."
+            ) from exc
+        try:
+            return tifffile.memmap(path, mode="r")
+        except ValueError as exc:
+            raise ValueError(
+                f"{path} cannot be memory-mapped; "
+                "only uncompressed, contiguous TIFF images are supported."
+            ) from exc
+    if suffix == ".zarr":
+        try:
+            import zarr
+        except ImportError as exc:
+            raise ImportError(
+                "Reading Zarr specimens requires zarr; "
+                "install it with 'pip install redsun-simulator[specimen]'."
+            ) from exc
+        return zarr.open_array(str(path), mode="r")
+    raise ValueError(f"Unsupported specimen format: {path}.")
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Callable, Generic, Optional, TypeVar
+
+from sunflare.log import get_logger
+
+from ._clock import Clock, get_clock
+
+__all__ = ["FrameStream"]
+
+T = TypeVar("T")
+
+
+class FrameStream(Generic[T]):
+    """Produce frames ahead of time from background worker threads.
+
+    Workers call ``render`` at the target frame rate and push the results
+    into a bounded queue. When the consumer falls behind and the queue is
+    full, the oldest queued frame is dropped, as a real camera would do.
+
+    Parameters
+    ----------
+    render : ``Callable[[], T]``
+        Function producing a single frame.
+    frame_rate : ``float``
+        Target frame rate in frames per second.
+        If 0, frames are produced as fast as possible.
+    queue_size : ``int``
+        Maximum number of frames waiting for the consumer.
+    workers : ``int``, optional
+        Number of worker threads rendering frames concurrently.
+        Default is 1.
+    clock : ``Clock``, optional
+        The clock pacing the frames.
+        Default is the clock returned by ``get_clock``.
+
+    """
+
+    def __init__(
+        self,
+        render: Callable[[], T],
+        frame_rate: float,
+        queue_size: int,
+        workers: int = 1,
+        clock: Optional[Clock] = None,
+    ) -> None:
+        if queue_size < 1:
+            raise ValueError("The queue must contain at least one frame.")
+        if workers < 1:
+            raise ValueError("At least one worker is required.")
+        self._render = render
+        self._clock = clock if clock is not None else get_clock()
+        self._period = 1.0 / frame_rate if frame_rate > 0.0 else 0.0
+        self._queue: deque[T] = deque(maxlen=queue_size)
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._workers = workers
+        self._next_tick = 0.0
+        self._rendered = 0
+        self._dropped = 0
+
+    def start(self) -> None:
+        """Start the worker threads."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._next_tick = self._clock.monotonic()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"frame-stream-{i}", daemon=True)
+            for i in range(self._workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        """Stop the worker threads and wait for them to finish.
+
+        Frames still in the queue can be retrieved after stopping.
+        """
+        self._stop.set()
+        with self._condition:
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def get(self, timeout: Optional[float] = None) -> T:
+        """Return the oldest frame in the queue.
+
+        Parameters
+        ----------
+        timeout : ``float``, optional
+            Maximum time to wait for a frame in seconds.
+            If ``None`` (default), wait until a frame is available
+            or the stream is stopped.
+
+        Raises
+        ------
+        TimeoutError
+            If no frame is available within ``timeout``,
+            or the stream is stopped and the queue is empty.
+
+        """
+        with self._condition:
+            available = self._condition.wait_for(
+                lambda: len(self._queue) > 0 or self._stop.is_set(), timeout
+            )
+            if not available or len(self._queue) == 0:
+                raise TimeoutError("No frame available.")
+            return self._queue.popleft()
+
+    def discard(self) -> None:
+        """Count a retrieved frame which could not be used as dropped."""
+        with self._condition:
+            self._dropped += 1
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._condition:
+                tick = self._next_tick
+                self._next_tick = max(tick, self._clock.monotonic()) + self._period
+            while (delay := self._clock.delay_until(tick)) > 0:
+                if self._stop.wait(delay):
+                    return
+            try:
+                frame = self._render()
+            except Exception:
+                get_logger().exception("Error while rendering a streamed frame")
+                self._stop.set()
+                with self._condition:
+                    self._condition.notify_all()
+                return
+            with self._condition:
+                if len(self._queue) == self._queue.maxlen:
+                    self._dropped += 1
+                self._queue.append(frame)
+                self._rendered += 1
+                self._condition.notify()
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker threads are running."""
+        return any(thread.is_alive() for thread in self._threads)
+
+    @property
+    def queued(self) -> int:
+        """Number of frames waiting for the consumer."""
+        return len(self._queue)
+
+    @property
+    def frames_rendered(self) -> int:
+        """Total number of frames produced by the workers."""
+        return self._rendered
+
+    @property
+    def frames_dropped(self) -> int:
+        """Number of frames dropped because the queue was full, or discarded."""
+        return self._dropped
@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import queue
+import threading
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Optional, Union
+
+import numpy as np
+import numpy.typing as npt
+from sunflare.log import get_logger
+
+__all__ = ["FrameWriter"]
+
+#: chunk of frames handed to the writer thread: buffer, timestamps, frame count
+_Chunk = tuple[npt.NDArray[Any], npt.NDArray[np.float64], int]
+
+
+class FrameWriter:
+    """Stream frames to a chunked Zarr or HDF5 store from a background thread.
+
+    Frames are copied into preallocated chunks of ``chunk_frames`` frames;
+    full chunks are compressed and written by a background thread, so that
+    the caller only pays for the copy. At most ``max_chunks`` chunks are
+    allocated: when the writer thread falls behind, :meth:`write` either
+    blocks until a chunk is free or, if ``block`` is ``False``, drops the frame.
+
+    The store contains a ``frames`` array of shape ``(N, height, width)``,
+    chunked by ``chunk_frames`` frames, and a ``timestamps`` array of shape
+    ``(N,)``.
+
+    Parameters
+    ----------
+    path : ``Union[str, Path]``
+        The store; a ``.zarr`` directory or an ``.h5``/``.hdf5`` file.
+        An existing store is overwritten.
+    shape : ``tuple[int, int]``
+        Shape of the frames.
+    dtype : ``npt.DTypeLike``
+        Data type of the frames.
+    chunk_frames : ``int``, optional
+        Number of frames per chunk. Default is 16.
+    max_chunks : ``int``, optional
+        Maximum number of chunks waiting to be written. Default is 4.
+    compression : ``str``, optional
+        Compression of the frames: the name of a Blosc compressor
+        (e.g. ``"zstd"``, ``"lz4"``) for Zarr, ``"gzip"`` or ``"lzf"`` for HDF5.
+        Default is no compression.
+    block : ``bool``, optional
+        Whether :meth:`write` waits for a free chunk when all are pending,
+        rather than dropping the frame. Default is ``True``.
+
+    Raises
+    ------
+    ValueError
+        If the format or the buffering parameters are not supported.
+    ImportError
+        If the package required by the format is not installed.
+
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        shape: tuple[int, int],
+        dtype: npt.DTypeLike,
+        *,
+        chunk_frames: int = 16,
+        max_chunks: int = 4,
+        compression: Optional[str] = None,
+        block: bool = True,
+    ) -> None:
+        if chunk_frames < 1:
+            raise ValueError("Chunks must contain at least one frame.")
+        if max_chunks < 1:
+            raise ValueError("At least one chunk is required.")
+        self._path = Path(path)
+        self._store = _open_store(self._path, shape, dtype, chunk_frames, compression)
+        self._block = block
+        self._free: queue.Queue[_Chunk] = queue.Queue()
+        for _ in range(max_chunks):
+            self._free.put(
+                (
+                    np.empty((chunk_frames, *shape), dtype=dtype),
+                    np.empty(chunk_frames, dtype=np.float64),
+                    0,
+                )
+            )
+        self._pending: queue.Queue[Optional[_Chunk]] = queue.Queue()
+        self._current: Optional[_Chunk] = None
+        self._lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._received = 0
+        self._dropped = 0
+        self._written = 0
+        self._bytes = 0
+        self._write_time = 0.0
+        self._thread = threading.Thread(
+            target=self._run, name="frame-writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, frame: npt.NDArray[Any], timestamp: float) -> bool:
+        """Queue a frame for writing.
+
+        Parameters
+        ----------
+        frame : ``npt.NDArray[Any]``
+            The frame; it is copied.
+        timestamp : ``float``
+            The time at which the frame was acquired.
+
+        Returns
+        -------
+        written : ``bool``
+            ``False`` if the frame was dropped, or the writer is closed.
+
+        Raises
+        ------
+        RuntimeError
+            If the background thread failed.
+
+        """
+        with self._lock:
+            if self._closed:
+                # frames racing with close are not recorded
+                return False
+            self._check()
+            self._received += 1
+            if self._current is None:
+                try:
+                    self._current = self._free.get(block=self._block)
+                except queue.Empty:
+                    self._dropped += 1
+                    return False
+            frames, timestamps, count = self._current
+            frames[count] = frame
+            timestamps[count] = timestamp
+            count += 1
+            if count == frames.shape[0]:
+                self._pending.put((frames, timestamps, count))
+                self._current = None
+            else:
+                self._current = (frames, timestamps, count)
+            return True
+
+    def flush(self) -> None:
+        """Write the frames of the current chunk and wait until all are written."""
+        with self._lock:
+            self._check()
+            self._submit()
+        self._pending.join()
+        with self._lock:
+            self._check()
+
+    def close(self) -> None:
+        """Write the remaining frames and close the store.
+
+        Raises
+        ------
+        RuntimeError
+            If the background thread failed.
+
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._submit()
+            self._pending.put(None)
+        self._thread.join()
+        _close_store(self._store)
+        if self._error is not None:
+            raise RuntimeError(f"Failed to write {self._path}.") from self._error
+
+    def __enter__(self) -> FrameWriter:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def stats(self) -> dict[str, float]:
+        """Return the write statistics.
+
+        Returns
+        -------
+        stats : ``dict[str, float]``
+            The number of frames received (``frames_received``), dropped
+            (``frames_dropped``) and written (``frames_written``), the bytes
+            written before compression (``bytes_written``), the time spent
+            writing in seconds (``write_seconds``), the resulting write
+            throughput in bytes per second (``throughput``) and the number of
+            chunks waiting to be written (``pending_chunks``).
+
+        """
+        return {
+            "frames_received": self._received,
+            "frames_dropped": self._dropped,
+            "frames_written": self._written,
+            "bytes_written": self._bytes,
+            "write_seconds": self._write_time,
+            "throughput": self._bytes / self._write_time if self._write_time else 0.0,
+            "pending_chunks": self._pending.qsize(),
+        }
+
+    @property
+    def path(self) -> Path:
+        """The store."""
+        return self._path
+
+    def _check(self) -> None:
+        if self._closed:
+            raise RuntimeError(f"The writer of {self._path} is closed.")
+        if self._error is not None:
+            raise RuntimeError(f"Failed to write {self._path}.") from self._error
+
+    def _submit(self) -> None:
+        """Hand the current, partially filled chunk to the writer thread."""
+        if self._current is not None and self._current[2] > 0:
+            self._pending.put(self._current)
+            self._current = None
+
+    def _run(self) -> None:
+        while (chunk := self._pending.get()) is not None:
+            frames, timestamps, count = chunk
+            try:
+                if self._error is None:
+                    start = perf_counter()
+                    _append(self._store, frames[:count], timestamps[:count])
+                    self._write_time += perf_counter() - start
+                    self._written += count
+                    self._bytes += frames[:count].nbytes
+            except Exception as exc:
+                get_logger().exception(f"Error while writing frames to {self._path}")
+                self._error = exc
+            finally:
+                self._free.put((frames, timestamps, 0))
+                self._pending.task_done()
+        self._pending.task_done()
+
+
+def _open_store(
+    path: Path,
+    shape: tuple[int, int],
+    dtype: npt.DTypeLike,
+    chunk_frames: int,
+    compression: Optional[str],
+) -> Any:
+    """Create the ``frames`` and ``timestamps`` arrays of a store."""
+    suffix = path.suffix.lower()
+    if suffix == ".zarr":
+        try:
+            import zarr
+            from numcodecs import Blosc
+        except ImportError as exc:
+            raise ImportError(
+                "Writing Zarr stores requires zarr; "
+                "install it with 'pip install redsun-simulator[writer]'."
+            ) from exc
+        group = zarr.open_group(str(path), mode="w")
+        group.create_dataset(
+            "frames",
+            shape=(0, *shape),
+            chunks=(chunk_frames, *shape),
+            dtype=dtype,
+            compressor=Blosc(cname=compression) if compression else None,
+        )
+        group.create_dataset("timestamps", shape=(0,), chunks=(1024,), dtype="f8")
+        return group
+    if suffix in (".h5", ".hdf5"):
+        try:
+            import h5py
+        except ImportError as exc:
+            raise ImportError(
+                "Writing HDF5 stores requires h5py; "
+                "install it with 'pip install redsun-simulator[writer]'."
+            ) from exc
+        file = h5py.File(path, "w")
+        file.create_dataset(
+            "frames",
+            shape=(0, *shape),
+            maxshape=(None, *shape),
+            chunks=(chunk_frames, *shape),
+            dtype=dtype,
+            compression=compression,
+        )
+        file.create_dataset("timestamps", shape=(0,), maxshape=(None,), dtype="f8")
+        return file
+    raise ValueError(f"Unsupported store format: {path}.")
+
+
+def _append(
+    store: Any, frames: npt.NDArray[Any], timestamps: npt.NDArray[np.float64]
+) -> None:
+    """Append frames and their timestamps to a store."""
+    if hasattr(store["frames"], "append"):  # zarr
+        store["frames"].append(frames)
+        store["timestamps"].append(timestamps)
+        return
+    for name, data in (("frames", frames), ("timestamps", timestamps)):
+        dataset = store[name]
+        start = dataset.shape[0]
+        dataset.resize(start + data.shape[0], axis=0)
+        dataset[start:] = data
+
+
+def _close_store(store: Any) -> None:
+    """Close the HDF5 file of a store; Zarr stores need no closing."""
+    close = getattr(store, "close", None)
+    if close is not None:
+        close()
@@ -1,17 +1,46 @@
 import logging
 import os
+from typing import Any
 
 import pytest
+import yaml
 
+from redsun_simulator.openwfs import OpenWFSCameraInfo, OpenWFSMotorInfo
 
-@pytest.fixture
+
+def _first_model(path: str) -> dict[str, Any]:
+    with open(path, "r") as file:
+        config_dict: dict[str, Any] = yaml.safe_load(file)
+    return next(iter(config_dict["models"].values()))
+
+@pytest.fixture(scope="session")
 def motor_config_path() -> str:
     return os.path.join(os.path.dirname(__file__), "data/test_motor_config.yaml")
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def camera_config_path() -> str:
     return os.path.join(os.path.dirname(__file__), "data/test_camera_config.yaml")
 
+@pytest.fixture(scope="session")
+def motor_values(motor_config_path: str) -> dict[str, Any]:
+    """Return the keyword arguments of the test motor configuration; do not modify."""
+    return _first_model(motor_config_path)
+
+@pytest.fixture(scope="session")
+def camera_values(camera_config_path: str) -> dict[str, Any]:
+    """Return the keyword arguments of the test camera configuration; do not modify."""
+    return _first_model(camera_config_path)
+
+@pytest.fixture
+def motor_info(motor_values: dict[str, Any]) -> OpenWFSMotorInfo:
+    """Return the configuration of the test motor."""
+    return OpenWFSMotorInfo(**motor_values)
+
+@pytest.fixture
+def camera_info(camera_values: dict[str, Any]) -> OpenWFSCameraInfo:
+    """Return the configuration of the test camera."""
+    return OpenWFSCameraInfo(**camera_values)
+
 @pytest.fixture()
 def logger() -> logging.Logger:
     logger = logging.getLogger("plugin-logger")
@@ -0,0 +1,108 @@
+"""``pytest`` test cases for the ``aio`` module."""
+
+import asyncio
+import threading
+import time
+from typing import Any
+
+import bluesky.plan_stubs as bps
+import bluesky.plans as bp
+import numpy as np
+import pytest
+from bluesky.run_engine import RunEngine
+
+from redsun_simulator.openwfs import (
+    AsyncOpenWFSCamera,
+    AsyncOpenWFSMotor,
+    AsyncStatus,
+    OpenWFSCameraInfo,
+    OpenWFSMotorInfo,
+)
+
+
+def test_async_motors_share_loop(motor_info: OpenWFSMotorInfo) -> None:
+    """Many motors move concurrently in one event loop, without threads."""
+
+    motors = [AsyncOpenWFSMotor(f"motor {i}", motor_info) for i in range(500)]
+
+    async def move() -> float:
+        threads = threading.active_count()
+        start = time.perf_counter()
+        statuses = [motor.set(100.0 * i, axis="Y") for i, motor in enumerate(motors)]
+        assert all(isinstance(status, AsyncStatus) for status in statuses)
+        assert not any(status.done for status in statuses)
+        assert threading.active_count() == threads
+        await asyncio.gather(*statuses)
+        assert all(status.success for status in statuses)
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(move())
+    # all motors settle concurrently
+    assert elapsed < 1.0
+    for i, motor in enumerate(motors):
+        motor.current_axis = "Y"
+        assert motor.locate()["readback"] == 100.0 * i
+
+
+def test_async_motor_shutdown(motor_info: OpenWFSMotorInfo) -> None:
+    """Shutting down many motors takes the time of a single one."""
+
+    motors = [AsyncOpenWFSMotor(f"motor {i}", motor_info) for i in range(10)]
+    start = time.perf_counter()
+
+    async def shutdown() -> None:
+        await asyncio.gather(*(motor.shutdown() for motor in motors))
+
+    asyncio.run(shutdown())
+    assert time.perf_counter() - start < 2 * motor_info.shutdown_time
+
+
+def test_async_status_error() -> None:
+    """Failures are reported by the status."""
+
+    async def fail() -> None:
+        raise RuntimeError("failure")
+
+    async def check() -> None:
+        status = AsyncStatus(fail())
+        with pytest.raises(RuntimeError):
+            await status
+        assert status.done
+        assert not status.success
+        assert isinstance(status.exception(), RuntimeError)
+        called: list[AsyncStatus] = []
+        status.add_callback(called.append)
+        assert called == [status]
+
+    asyncio.run(check())
+
+
+def test_async_camera(camera_info: OpenWFSCameraInfo) -> None:
+    """Frames are acquired from the event loop."""
+
+    camera = AsyncOpenWFSCamera("camera", camera_info)
+
+    async def acquire() -> np.ndarray:
+        await camera.trigger()
+        reading = await camera.read()
+        return reading["camera"]["value"]
+
+    frame = asyncio.run(acquire())
+    assert frame.shape == camera_info.sensor_shape
+
+
+def test_async_plan(motor_info: OpenWFSMotorInfo, camera_info: OpenWFSCameraInfo) -> None:
+    """Asynchronous devices can be used in Bluesky plans."""
+
+    RE = RunEngine()
+    motor = AsyncOpenWFSMotor("motor", motor_info)
+    camera = AsyncOpenWFSCamera("camera", camera_info)
+    events: list[dict[str, Any]] = []
+
+    def plan() -> Any:
+        yield from bps.mv(motor, 200.0)
+        yield from bp.count([camera], num=2)
+
+    RE(plan(), lambda name, doc: events.append(doc) if name == "event" else None)
+    assert motor.locate()["readback"] == 200.0
+    assert len(events) == 2
@@ -0,0 +1,111 @@
+"""``pytest`` test cases for the ``bank`` module."""
+
+from typing import Any
+
+import bluesky.plan_stubs as bps
+import numpy as np
+import pytest
+from bluesky.protocols import Location
+from bluesky.run_engine import RunEngine
+
+from redsun_simulator.openwfs import (
+    BankMotor,
+    OpenWFSCamera,
+    OpenWFSCameraInfo,
+    OpenWFSMotorBank,
+    OpenWFSMotorInfo,
+    VirtualClock,
+)
+
+
+def test_bank_construction(motor_info: OpenWFSMotorInfo) -> None:
+    """Test the bank construction and the motor proxies."""
+
+    bank = OpenWFSMotorBank("stage", motor_info, 1000)
+    assert len(bank) == 1000
+    assert bank.locate()["readback"].shape == (1000, 3)
+    motor = bank[10]
+    assert isinstance(motor, BankMotor)
+    assert bank[10] is motor
+    assert bank[-1].name == "stage-999"
+    assert [m.name for m in bank[:2]] == ["stage-0", "stage-1"]
+    assert motor.model_info is motor_info
+    assert motor.read_configuration() == motor_info.read_configuration()
+    # the configuration documents are shared by the motors
+    assert bank[0].read_configuration() is motor.read_configuration()
+    changes: list[str] = []
+    bank.subscribe_configuration(lambda name, value: changes.append(name))
+    bank.configure("velocity", 10.0)
+    assert changes == ["velocity"]
+    assert bank.configuration_version == 1
+    assert motor.read_configuration()["velocity"]["value"] == 10.0
+    with pytest.raises(IndexError):
+        bank[1000]
+    with pytest.raises(ValueError):
+        OpenWFSMotorBank("stage", motor_info, 0)
+
+
+def test_bank_move(motor_info: OpenWFSMotorInfo) -> None:
+    """Bulk moves update the state of the moved motors only."""
+
+    bank = OpenWFSMotorBank("stage", motor_info, 100, clock=VirtualClock())
+    targets = np.arange(50) * 100.0 + 40.0
+    bank.move(targets, axis="Y", motors=np.arange(0, 100, 2)).wait()
+    location = bank.locate()
+    # rounded to the step size
+    np.testing.assert_array_equal(location["readback"][::2, 1], targets - 40.0)
+    np.testing.assert_array_equal(location["readback"][1::2], 0.0)
+    np.testing.assert_array_equal(location["readback"][:, [0, 2]], 0.0)
+
+    grid = np.full((100, 3), 300.0)
+    bank.move(grid).wait()
+    np.testing.assert_array_equal(bank.locate()["readback"], grid)
+    with pytest.raises(ValueError):
+        bank.move(np.zeros(99), axis="X")
+    with pytest.raises(IndexError):
+        bank.move(np.zeros(100), axis="W")
+
+
+def test_bank_motor_set(motor_info: OpenWFSMotorInfo) -> None:
+    """Proxies move like ``OpenWFSMotor``, within the shared state."""
+
+    bank = OpenWFSMotorBank("stage", motor_info, 4, clock=VirtualClock())
+    motor = bank[2]
+    status = motor.set(200)
+    assert motor.locate() == Location(setpoint=200.0, readback=0.0)
+    status.wait()
+    assert motor.locate() == Location(setpoint=200.0, readback=200.0)
+
+    motor.current_axis = "Z"
+    motor.set({"Y": 100.0, "Z": 500.0}).wait()
+    assert motor.locate() == Location(setpoint=500.0, readback=500.0)
+    motor.set([1.0, 2.0, 3.0]).wait()
+    np.testing.assert_array_equal(bank.locate()["readback"][2], 0.0)
+    np.testing.assert_array_equal(bank.locate()["readback"][[0, 1, 3]], 0.0)
+    with pytest.raises(IndexError):
+        motor.current_axis = "W"
+
+
+def test_bank_plan(motor_info: OpenWFSMotorInfo) -> None:
+    """Proxies can be moved together in Bluesky plans."""
+
+    bank = OpenWFSMotorBank("stage", motor_info, 8)
+    args: list[Any] = []
+    for i, motor in enumerate(bank):
+        args.extend([motor, 100.0 * i])
+    RE = RunEngine()
+    RE(bps.mv(*args))
+    np.testing.assert_array_equal(bank.locate()["readback"][:, 0], np.arange(8) * 100.0)
+
+
+def test_bank_coupling(
+    motor_info: OpenWFSMotorInfo, camera_info: OpenWFSCameraInfo
+) -> None:
+    """Proxies can drive the stage of a camera."""
+
+    bank = OpenWFSMotorBank("stage", motor_info, 2)
+    camera = OpenWFSCamera("camera", camera_info)
+    camera.couple_stage(bank[1], x="X", y="Y")
+    assert camera._microscope.xy_stage.x.value == 0.0
+    bank.move([[0.0, 0.0, 0.0], [1000.0, 0.0, 0.0]]).wait()
+    assert camera._microscope.xy_stage.x.value == 1000.0
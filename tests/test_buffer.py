@@ -0,0 +1,44 @@
+"""``pytest`` test cases for the ``buffer`` module."""
+
+import numpy as np
+import pytest
+
+from redsun_simulator.openwfs._buffer import FrameBuffer
+
+
+def test_buffer_read_only_views() -> None:
+    buffer = FrameBuffer(3, (4, 4), np.uint16)
+    index, slot = buffer.claim()
+    slot[...] = 7
+    frame = buffer.frame(index)
+    assert not frame.flags.writeable
+    assert np.shares_memory(frame, slot)
+    np.testing.assert_array_equal(frame, 7)
+    assert memoryview(frame).readonly
+
+
+def test_buffer_overruns() -> None:
+    """Writing more frames than the buffer size without reading them counts overruns."""
+    buffer = FrameBuffer(3, (4, 4), np.uint16)
+    indices = [buffer.claim()[0] for _ in range(5)]
+    assert buffer.frames_written == 5
+    assert buffer.overruns == 2
+    assert buffer.pending == 3
+    with pytest.raises(IndexError):
+        buffer.frame(indices[1])
+    buffer.frame(indices[-1])
+    assert buffer.pending == 0
+    buffer.claim()
+    assert buffer.overruns == 2
+
+
+def test_buffer_peek() -> None:
+    """Peeking at a frame does not mark it as read."""
+    buffer = FrameBuffer(2, (4, 4), np.uint16)
+    indices = [buffer.claim()[0] for _ in range(4)]
+    frame = buffer.peek(indices[-1])
+    assert not frame.flags.writeable
+    assert buffer.pending == 2
+    assert buffer.overruns == 2
+    with pytest.raises(IndexError):
+        buffer.peek(indices[0])
@@ -0,0 +1,173 @@
+"""``pytest`` test cases for the ``clock`` module."""
+
+import gc
+import time
+import weakref
+from typing import Any
+
+import bluesky.plan_stubs as bps
+import bluesky.preprocessors as bpp
+import numpy as np
+import pytest
+from bluesky.protocols import Location
+from bluesky.run_engine import RunEngine
+
+from redsun_simulator.openwfs import (
+    Clock,
+    OpenWFSCamera,
+    OpenWFSCameraInfo,
+    OpenWFSMotor,
+    OpenWFSMotorInfo,
+    ScaledClock,
+    VirtualClock,
+    get_clock,
+    set_clock,
+)
+from redsun_simulator.openwfs import _scheduler
+
+
+def test_default_clock(motor_info: OpenWFSMotorInfo) -> None:
+    """Devices use the default clock unless given one."""
+
+    default = get_clock()
+    assert type(default) is Clock
+    assert OpenWFSMotor("motor", motor_info).clock is default
+    clock = VirtualClock()
+    try:
+        set_clock(clock)
+        assert OpenWFSMotor("motor", motor_info).clock is clock
+    finally:
+        set_clock(default)
+    assert OpenWFSMotor("motor", motor_info).clock is default
+
+
+def test_clock_release(
+    motor_info: OpenWFSMotorInfo, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Schedulers and clocks are released with the last device using them."""
+
+    monkeypatch.setattr(_scheduler, "_IDLE_TIMEOUT", 0.01)
+    clock = ScaledClock(100.0)
+    motor = OpenWFSMotor("motor", motor_info, clock=clock)
+    assert _scheduler.get_scheduler(clock) is motor._scheduler
+    motor.set(1.0).wait()
+
+    released = weakref.ref(clock)
+    del motor, clock
+    deadline = time.monotonic() + 5.0
+    while released() is not None and time.monotonic() < deadline:
+        gc.collect()
+        time.sleep(0.01)
+    assert released() is None
+
+
+def test_scaled_clock(motor_info: OpenWFSMotorInfo) -> None:
+    """Movements and shutdowns are accelerated by the scale factor."""
+
+    with pytest.raises(ValueError):
+        ScaledClock(0.0)
+    motor_info.velocity = 1000.0
+    motor_info.shutdown_time = 2.0
+    clock = ScaledClock(20.0)
+    motor = OpenWFSMotor("motor", motor_info, clock=clock)
+
+    start = time.monotonic()
+    simulated_start = clock.monotonic()
+    motor.set(1000).wait()
+    elapsed = time.monotonic() - start
+    # 1 s of travel plus the setpoint time, in simulated time
+    duration = 1.0 + motor_info.setpoint_time
+    assert elapsed == pytest.approx(duration / 20.0, abs=0.05)
+    assert clock.monotonic() - simulated_start == pytest.approx(duration, abs=0.5)
+    assert motor.locate() == Location(setpoint=1000.0, readback=1000.0)
+
+    start = time.monotonic()
+    motor.shutdown()
+    assert time.monotonic() - start == pytest.approx(0.1, abs=0.05)
+
+
+def test_virtual_clock(motor_info: OpenWFSMotorInfo) -> None:
+    """Virtual time advances instantly, following the simulated durations."""
+
+    motor_info.velocity = 1.0
+    motor_info.shutdown_time = 3600.0
+    clock = VirtualClock(start=1000.0)
+    motor = OpenWFSMotor("motor", motor_info, clock=clock)
+    assert clock.time() == 1000.0
+
+    start = time.monotonic()
+    motor.shutdown()
+    motor.set(1000).wait()
+    assert time.monotonic() - start < 1.0
+    # one hour of shutdown, 1000 s of travel and the setpoint time
+    assert clock.time() == pytest.approx(1000.0 + 3600.0 + 1000.0 + 0.1)
+    assert motor.locate() == Location(setpoint=1000.0, readback=1000.0)
+
+    clock.advance(10.0)
+    assert clock.monotonic() == pytest.approx(4610.1)
+    with pytest.raises(ValueError):
+        clock.advance(-1.0)
+    with pytest.raises(ValueError):
+        VirtualClock(settle=0.0)
+
+
+def test_virtual_clock_parallel_moves(motor_info: OpenWFSMotorInfo) -> None:
+    """Moves started one after the other by a plan overlap in virtual time."""
+
+    motor_info.velocity = 100.0
+    motor_info.acceleration = 0.0
+    motor_info.setpoint_time = 0.0
+    RE = RunEngine()
+    for _ in range(20):
+        clock = VirtualClock(start=0.0)
+        first = OpenWFSMotor("first", motor_info, clock=clock)
+        second = OpenWFSMotor("second", motor_info, clock=clock)
+        # two moves of 5 s each
+        RE(bps.mv(first, 500.0, second, 500.0))
+        assert clock.monotonic() == 5.0
+
+
+def test_virtual_clock_plan(
+    motor_info: OpenWFSMotorInfo, camera_info: OpenWFSCameraInfo
+) -> None:
+    """Event timestamps of a plan follow the simulated time."""
+
+    motor_info.velocity = 1.0
+    motor_info.acceleration = 0.0
+    clock = VirtualClock(start=0.0)
+    motor = OpenWFSMotor("motor", motor_info, clock=clock)
+    camera = OpenWFSCamera("camera", camera_info, clock=clock)
+    events: list[dict[str, Any]] = []
+
+    def collect(name: str, doc: dict[str, Any]) -> None:
+        if name == "event":
+            events.append(doc)
+
+    @bpp.run_decorator()
+    def scan() -> Any:
+        for position in np.linspace(0, 1000, 11):
+            yield from bps.mv(motor, position)
+            yield from bps.trigger_and_read([camera])
+
+    start = time.monotonic()
+    RE = RunEngine()
+    RE(scan(), collect)
+    assert time.monotonic() - start < 30.0
+    assert len(events) == 11
+    stamps = np.array([event["timestamps"]["camera"] for event in events])
+    # 100 s of travel and the setpoint time between consecutive points
+    np.testing.assert_allclose(np.diff(stamps), 100.1, atol=1e-6)
+
+
+def test_virtual_clock_stream(camera_info: OpenWFSCameraInfo) -> None:
+    """Streamed frames are timestamped at the simulated frame rate."""
+
+    camera_info.frame_rate = 0.1
+    camera_info.stream_queue_size = 4
+    clock = VirtualClock(start=0.0)
+    camera = OpenWFSCamera("camera", camera_info, clock=clock)
+    camera.start_streaming()
+    stamps = [camera.get_frame(timeout=10.0)[1] for _ in range(3)]
+    camera.stop_streaming()
+    # frames are 10 s apart in simulated time, without waiting
+    assert np.all(np.diff(stamps) >= 10.0 - 1e-6)
@@ -1,4 +1,5 @@
 """``pytest`` test cases for the ``config`` module."""
+import pytest
 import yaml
 from typing import Any
 
@@ -43,3 +44,47 @@ def test_camera_model_info(camera_config_path: str) -> None:
     assert config.specimen == specimen_truth
     assert config.sensor_shape == (256, 256)
     assert config.pixel_size == (8.5, 8.5, 8.5)
+    assert config.buffer_size == 0
+    assert config.bit_depth == 8
+    assert config.dtype == "uint16"
+
+    with pytest.raises(ValueError):
+        OpenWFSCameraInfo(**{**values, "bit_depth": 12, "dtype": "uint8"})
+    for field, value in (
+        ("frame_rate", -1.0),
+        ("stream_queue_size", 0),
+        ("stream_workers", 0),
+    ):
+        with pytest.raises(ValueError):
+            OpenWFSCameraInfo(**{**values, field: value})
+
+
+def test_camera_readout(camera_config_path: str) -> None:
+    """Test the validation of the region of interest and of the binning."""
+
+    with open(camera_config_path, "r") as file:
+        values = yaml.safe_load(file)["models"]["Mock camera"]
+
+    config = OpenWFSCameraInfo(**values)
+    assert config.roi == (0, 0, 0, 0)
+    assert config.binning == 1
+    assert config.readout_region == (0, 0, 256, 256)
+    assert config.frame_shape == (256, 256)
+
+    config = OpenWFSCameraInfo(**{**values, "roi": [102, 16, 0, 64], "binning": 2})
+    assert config.readout_region == (102, 16, 154, 64)
+    assert config.frame_shape == (77, 32)
+
+    for roi, binning in (
+        ((0, 0, 300, 256), 1),  # larger than the sensor
+        ((200, 0, 64, 64), 1),  # beyond the edge of the sensor
+        ((0, 0, 64), 1),  # not a region
+        ((0, 0, 64, 62), 4),  # not a multiple of the binning
+        ((0, 0, 0, 0), 3),  # unsupported binning
+    ):
+        with pytest.raises(ValueError):
+            OpenWFSCameraInfo(**{**values, "roi": roi, "binning": binning})
+
+    # configured values are validated against each other
+    with pytest.raises(ValueError):
+        config.binning = 4
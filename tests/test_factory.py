@@ -0,0 +1,93 @@
+"""``pytest`` test cases for the ``factory`` module."""
+
+import time
+from pathlib import Path
+
+import pytest
+import yaml
+
+from redsun_simulator.openwfs import (
+    OpenWFSCamera,
+    OpenWFSCameraInfo,
+    OpenWFSMotor,
+    OpenWFSMotorInfo,
+    VirtualClock,
+    config_cache_clear,
+    config_cache_info,
+    load_devices,
+)
+
+
+def test_load_devices(motor_config_path: str, camera_config_path: str) -> None:
+    """Devices are constructed on first access."""
+
+    clock = VirtualClock()
+    motors = load_devices(motor_config_path, clock=clock)
+    cameras = load_devices(camera_config_path)
+    assert list(motors) == ["Mock motor"]
+    assert list(cameras) == ["Mock camera"]
+    assert motors.constructed == []
+
+    info = motors.model_info("Mock motor")
+    assert isinstance(info, OpenWFSMotorInfo)
+    assert motors.constructed == []
+    motor = motors["Mock motor"]
+    assert isinstance(motor, OpenWFSMotor)
+    assert motor.model_info is info
+    assert motor.clock is clock
+    assert motors["Mock motor"] is motor
+    assert motors.constructed == ["Mock motor"]
+
+    camera = cameras["Mock camera"]
+    assert isinstance(camera, OpenWFSCamera)
+    assert isinstance(camera.model_info, OpenWFSCameraInfo)
+
+
+def test_load_devices_cache(motor_config_path: str, tmp_path: Path) -> None:
+    """Files with the same content are parsed once, devices stay independent."""
+
+    config_cache_clear()
+    first = load_devices(motor_config_path)
+    copy = tmp_path / "copy.yaml"
+    copy.write_bytes(Path(motor_config_path).read_bytes())
+    second = load_devices(copy)
+    info = config_cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+    first["Mock motor"].configure("velocity", 10.0)
+    assert first.model_info("Mock motor").velocity == 10.0
+    assert second.model_info("Mock motor").velocity == 0.0
+    assert load_devices(copy).model_info("Mock motor").velocity == 0.0
+
+
+def test_load_devices_errors(tmp_path: Path) -> None:
+    """Unsupported models are rejected when the file is loaded."""
+
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump({"models": {"laser": {"model_name": "Laser"}}}))
+    with pytest.raises(ValueError, match="Laser"):
+        load_devices(path)
+
+
+def test_load_many_devices(tmp_path: Path) -> None:
+    """A large configuration is loaded without constructing the devices."""
+
+    models = {
+        f"motor {i}": {
+            "model_name": "OpenWFSMotor",
+            "axis": ["X", "Y", "Z"],
+            "step_size": {"X": 0.1, "Y": 0.1, "Z": 0.1},
+            "egu": "um",
+        }
+        for i in range(500)
+    }
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump({"models": models}))
+    config_cache_clear()
+    load_devices(path)
+    start = time.perf_counter()
+    devices = load_devices(path)
+    assert time.perf_counter() - start < 0.05
+    assert len(devices) == 500
+    assert devices.constructed == []
+    assert devices["motor 499"].model_info.axis == ["X", "Y", "Z"]
@@ -0,0 +1,116 @@
+"""``pytest`` test cases for the ``farm`` module."""
+
+from pathlib import Path
+from typing import Any, Iterator
+
+import bluesky.plans as bp
+import numpy as np
+import pytest
+from bluesky.run_engine import RunEngine
+
+from redsun_simulator.openwfs import CameraFarm, OpenWFSCameraInfo, VirtualClock
+
+
+@pytest.fixture(scope="module")
+def farm(camera_values: dict[str, Any]) -> Iterator[CameraFarm]:
+    """Return a farm of three cameras served by two processes."""
+
+    # worker processes are slow to start: the farm is shared by the module
+    infos = {
+        "camera 0": OpenWFSCameraInfo(**camera_values),
+        "camera 1": OpenWFSCameraInfo(**camera_values),
+        "camera 2": OpenWFSCameraInfo(**{**camera_values, "dtype": "uint8"}),
+    }
+    with CameraFarm(infos, processes=2, slots=2) as farm:
+        yield farm
+
+
+def test_farm_trigger_read(farm: CameraFarm) -> None:
+    """Frames rendered in the workers are read from shared memory."""
+
+    assert list(farm) == ["camera 0", "camera 1", "camera 2"]
+    statuses = [camera.trigger() for camera in farm.values()]
+    for status in statuses:
+        status.wait()
+        assert status.success
+
+    for name, camera in farm.items():
+        frame = camera.read()[name]["value"]
+        assert frame.shape == camera.model_info.sensor_shape
+        assert frame.dtype == np.dtype(camera.model_info.dtype)
+        assert frame.max() > 0
+        assert not frame.flags.writeable
+        assert camera.describe()[name]["dtype_numpy"] == frame.dtype.str
+
+    # frames are written in a ring of shared memory slots
+    camera = farm["camera 0"]
+    first = camera.read()["camera 0"]["value"]
+    camera.trigger().wait()
+    second = camera.read()["camera 0"]["value"]
+    assert not np.shares_memory(first, second)
+    camera.trigger().wait()
+    assert np.shares_memory(first, camera.read()["camera 0"]["value"])
+
+
+def test_farm_plan_count(farm: CameraFarm) -> None:
+    """Farm cameras can be used in Bluesky plans."""
+
+    RE = RunEngine()
+    events: list[dict[str, Any]] = []
+    RE(
+        bp.count(list(farm.values()), num=3),
+        lambda name, doc: events.append(doc) if name == "event" else None,
+    )
+    assert len(events) == 3
+    assert all(set(event["data"]) == set(farm) for event in events)
+
+
+def test_farm_close(camera_info: OpenWFSCameraInfo) -> None:
+    """Closing the farm stops the workers."""
+
+    infos = {"camera": camera_info}
+    farm = CameraFarm(infos)
+    processes = list(farm._processes)
+    farm.close()
+    assert not any(process.is_alive() for process in processes)
+    farm.close()
+
+    with pytest.raises(ValueError):
+        CameraFarm(infos, slots=0)
+
+
+def test_farm_errors(camera_values: dict[str, Any], tmp_path: Path) -> None:
+    """Cameras that cannot be built or whose worker exited fail their acquisitions."""
+
+    specimen = {**camera_values["specimen"], "path": str(tmp_path / "missing.npy")}
+    infos = {
+        "camera": OpenWFSCameraInfo(**camera_values),
+        "missing": OpenWFSCameraInfo(**{**camera_values, "specimen": specimen}),
+    }
+    with CameraFarm(infos, processes=2) as farm:
+        status = farm["missing"].trigger()
+        with pytest.raises(RuntimeError, match="missing"):
+            status.wait(timeout=30.0)
+        status = farm["camera"].trigger()
+        status.wait(timeout=30.0)
+        assert status.success
+
+        farm._processes[0].kill()
+        farm._processes[0].join()
+        status = farm["camera"].trigger()
+        with pytest.raises(RuntimeError, match="exited"):
+            status.wait(timeout=5.0)
+        with pytest.raises(RuntimeError, match="exited"):
+            farm["camera"].trigger().wait(timeout=5.0)
+
+    with pytest.raises(RuntimeError, match="closed"):
+        farm["missing"].trigger().wait(timeout=5.0)
+
+
+def test_farm_clock(camera_info: OpenWFSCameraInfo) -> None:
+    """Frames are timestamped with the clock of the farm."""
+
+    clock = VirtualClock(start=1000.0)
+    with CameraFarm({"camera": camera_info}, clock=clock) as farm:
+        farm["camera"].trigger().wait(timeout=30.0)
+        assert farm["camera"].read()["camera"]["timestamp"] == 1000.0
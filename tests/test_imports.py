@@ -0,0 +1,64 @@
+"""``pytest`` test cases for the import time of the package."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+#: maximum import time of ``redsun_simulator.openwfs`` in milliseconds;
+#: can be overridden with the ``REDSUN_IMPORT_BUDGET_MS`` environment variable
+IMPORT_BUDGET_MS = float(os.environ.get("REDSUN_IMPORT_BUDGET_MS", 1000))
+
+#: dependencies which must not be imported with the package
+HEAVY_MODULES = ["numpy", "astropy", "bluesky", "openwfs", "scipy"]
+
+
+def _run(code: str, *options: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_import_time() -> None:
+    """The package imports within the budget, measured with ``-X importtime``."""
+
+    # the first run warms up the bytecode and file system caches
+    _run("import redsun_simulator.openwfs")
+    result = _run("import redsun_simulator.openwfs", "-X", "importtime")
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, total, name = line[len("import time:") :].split("|")
+            if total.strip().isdigit():
+                cumulative[name.strip()] = int(total) / 1000
+    assert cumulative["redsun_simulator.openwfs"] < IMPORT_BUDGET_MS
+
+
+def test_lazy_imports() -> None:
+    """Heavy dependencies are imported on first access to the devices."""
+
+    code = (
+        "import sys, redsun_simulator.openwfs as openwfs;"
+        f"print(*[m for m in {HEAVY_MODULES!r} if m in sys.modules]);"
+        "openwfs.OpenWFSMotor;"
+        f"print(*[m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    )
+    before, after = _run(code).stdout.splitlines()
+    assert before == ""
+    assert "numpy" in after.split()
+
+
+def test_lazy_attributes() -> None:
+    """All the public names are available and listed."""
+
+    import redsun_simulator.openwfs as openwfs
+
+    for name in openwfs.__all__:
+        assert getattr(openwfs, name) is not None
+        assert name in dir(openwfs)
+    with pytest.raises(AttributeError):
+        openwfs.Missing
@@ -0,0 +1,118 @@
+"""``pytest`` test cases for the ``metrics`` module."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import bluesky.plan_stubs as bps
+import bluesky.plans as bp
+import pytest
+from bluesky.run_engine import RunEngine
+
+from redsun_simulator.openwfs import (
+    OpenWFSCamera,
+    OpenWFSCameraInfo,
+    OpenWFSMotor,
+    OpenWFSMotorInfo,
+    VirtualClock,
+    dump_metrics,
+    format_prometheus,
+)
+
+
+@pytest.fixture
+def motor(motor_info: OpenWFSMotorInfo) -> OpenWFSMotor:
+    """Return the test motor, with a virtual clock."""
+
+    return OpenWFSMotor("motor", motor_info, clock=VirtualClock())
+
+
+@pytest.fixture
+def camera(camera_values: dict[str, Any]) -> OpenWFSCamera:
+    """Return the test camera, with a frame buffer."""
+
+    info = OpenWFSCameraInfo(**camera_values, buffer_size=4)
+    return OpenWFSCamera("camera", info)
+
+
+def test_metrics_disabled(motor: OpenWFSMotor, camera: OpenWFSCamera) -> None:
+    """Metrics are disabled by default."""
+
+    motor.set(100).wait()
+    assert motor.read_metrics() == {}
+    assert camera.read_metrics() == {}
+    motor.enable_metrics()
+    motor.set(200).wait()
+    assert motor.read_metrics()["counters"]["moves"] == 1
+    motor.enable_metrics(False)
+    assert motor.read_metrics() == {}
+
+
+def test_motor_metrics(motor: OpenWFSMotor) -> None:
+    """Moves, steps and latencies are recorded."""
+
+    motor.enable_metrics()
+    RE = RunEngine()
+    RE(bps.mv(motor, 500))
+    RE(bps.mv(motor, 200))
+    metrics = motor.read_metrics()
+    assert metrics["device"] == "motor"
+    assert metrics["counters"] == {"moves": 2, "steps": 8}
+    assert metrics["gauges"]["moving_axis"] == 0
+    assert metrics["gauges"]["scheduler_queue"] == 0
+    for name in ("set", "readback"):
+        histogram = metrics["histograms"][name]
+        assert histogram["count"] == 2
+        assert sum(count for _, count in histogram["buckets"]) == 2
+        assert 0.0 < histogram["mean"] <= histogram["max"]
+    assert histogram["buckets"][-1][0] is None
+
+
+def test_camera_metrics(camera: OpenWFSCamera) -> None:
+    """Frames, latencies, queue depths and overruns are recorded."""
+
+    camera.enable_metrics()
+    RE = RunEngine()
+    RE(bp.count([camera], num=2))
+    metrics = camera.read_metrics()
+    assert metrics["counters"] == {"frames": 2, "buffer_overruns": 0}
+    assert metrics["histograms"]["trigger"]["count"] == 2
+    assert metrics["histograms"]["digitize"]["count"] == 2
+
+    camera.acquire_batch(3)
+    camera.start_streaming()
+    camera.get_frame(timeout=10.0)
+    camera.stop_streaming()
+    metrics = camera.read_metrics()
+    assert metrics["counters"]["frames"] >= 2 + 3 + 1
+    assert metrics["histograms"]["batch"]["count"] == 1
+    assert metrics["histograms"]["render"]["count"] >= 1
+    assert "frames_dropped" in metrics["counters"]
+    assert "stream_queue" in metrics["gauges"]
+    assert "buffer_pending" in metrics["gauges"]
+
+
+def test_dump_metrics(
+    motor: OpenWFSMotor, camera: OpenWFSCamera, tmp_path: Path
+) -> None:
+    """Metrics are dumped as JSON or in the Prometheus text format."""
+
+    motor.enable_metrics()
+    motor.set(100).wait()
+    path = tmp_path / "metrics.json"
+    # the camera metrics are disabled and skipped
+    dump_metrics([motor, camera], path)
+    metrics = json.loads(path.read_text())
+    assert [m["device"] for m in metrics] == ["motor"]
+    assert metrics[0]["counters"]["moves"] == 1
+
+    path = tmp_path / "metrics.prom"
+    dump_metrics([motor, camera], path, format="prometheus")
+    text = path.read_text()
+    assert text == format_prometheus([motor.read_metrics()])
+    assert "# TYPE redsun_simulator_moves_total counter" in text
+    assert 'redsun_simulator_moves_total{device="motor"} 1' in text
+    assert 'redsun_simulator_set_seconds_bucket{device="motor",le="+Inf"} 1' in text
+    assert 'redsun_simulator_set_seconds_count{device="motor"} 1' in text
+    with pytest.raises(ValueError):
+        dump_metrics([motor], path, format="csv")
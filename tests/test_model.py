@@ -1,18 +1,27 @@
 """``pytest`` test cases for the ``model`` module."""
 
 import time
+from pathlib import Path
 from typing import Tuple
 
+import astropy.units as u
 import bluesky.plan_stubs as bps
+import bluesky.plans as bp
 import numpy as np
 import pytest
 import yaml
+from attrs import asdict
 from typing import Any
 from bluesky.protocols import Location
 from bluesky.run_engine import RunEngine
 from bluesky.utils import MsgGenerator
 
-from redsun_simulator.openwfs import OpenWFSMotor, OpenWFSMotorInfo
+from redsun_simulator.openwfs import (
+    OpenWFSCamera,
+    OpenWFSCameraInfo,
+    OpenWFSMotor,
+    OpenWFSMotorInfo,
+)
 
 
 @pytest.fixture
@@ -28,6 +37,19 @@ def motor_config(motor_config_path: str) -> dict[str, OpenWFSMotorInfo]:
             motors[name] = config
     return motors
 
+@pytest.fixture
+def camera_config(camera_config_path: str) -> dict[str, OpenWFSCameraInfo]:
+    """Return the cameras configuration."""
+
+    cameras: dict[str, OpenWFSCameraInfo] = {}
+
+    with open(camera_config_path, "r") as file:
+        config_dict: dict[str, Any] = yaml.safe_load(file)
+        for name, values in config_dict["models"].items():
+            config = OpenWFSCameraInfo(**values)
+            cameras[name] = config
+    return cameras
+
 @pytest.fixture
 def RE() -> RunEngine:
     """Return a ``RunEngine`` instance."""
@@ -58,8 +80,62 @@ def test_motor_configurable_protocol(motor_config: dict[str, OpenWFSMotorInfo])
             "egu": {"value": info.egu, "timestamp": 0},
             "setpoint_time": {"value": info.setpoint_time, "timestamp": 0},
             "shutdown_time": {"value": info.shutdown_time, "timestamp": 0},
+            "velocity": {"value": info.velocity, "timestamp": 0},
+            "acceleration": {"value": info.acceleration, "timestamp": 0},
         }
 
+def test_configuration_cache(
+    motor_config: dict[str, OpenWFSMotorInfo], camera_config: dict[str, OpenWFSCameraInfo]
+) -> None:
+    """Test that configuration documents are cached until the device is configured."""
+
+    devices: list[tuple[Any, str]] = [
+        (OpenWFSMotor(name, info), "velocity") for name, info in motor_config.items()
+    ]
+    devices += [
+        (OpenWFSCamera(name, info), "frame_rate") for name, info in camera_config.items()
+    ]
+    for device, key in devices:
+        changes: list[tuple[str, Any]] = []
+
+        def record(name: str, value: Any) -> None:
+            changes.append((name, value))
+
+        device.subscribe_configuration(record)
+
+        read = device.read_configuration()
+        description = device.describe_configuration()
+        assert device.read_configuration() is read
+        assert device.describe_configuration() is description
+        assert device.configuration_version == 0
+
+        device.configure(key, 5.0)
+        assert changes == [(key, 5.0)]
+        assert device.configuration_version == 1
+        assert device.read_configuration() == {**read, key: {"value": 5.0, "timestamp": 0}}
+        assert device.describe_configuration() is not description
+
+        # a failing callback does not prevent the others from being notified
+        device.subscribe_configuration(lambda name, value: 1 / 0)
+        device.configure(key, 2.0)
+        assert changes[-1] == (key, 2.0)
+
+        device.unsubscribe_configuration(record)
+        device.configure(key, 0.0)
+        assert len(changes) == 2
+        assert device.configuration_version == 3
+
+    # callbacks see the new configuration in effect
+    for name, info in camera_config.items():
+        camera = OpenWFSCamera(name, info)
+        magnifications: list[float] = []
+        camera.subscribe_configuration(
+            lambda name, value: magnifications.append(camera._microscope.magnification)
+        )
+        specimen = {**asdict(info.specimen), "magnification": 2 * info.specimen.magnification}
+        camera.configure("specimen", specimen)
+        assert magnifications == [specimen["magnification"]]
+
 def test_motor_properties(motor_config: dict[str, OpenWFSMotorInfo]) -> None:
     """Test changing properties.
     
@@ -110,6 +186,27 @@ def test_motor_set_direct(motor_config: dict[str, OpenWFSMotorInfo]) -> None:
             assert status.success
             assert motor.locate() == Location(setpoint=200.0, readback=200.0)
 
+def test_motor_set_non_blocking(motor_config: dict[str, OpenWFSMotorInfo]) -> None:
+    """Test that ``set`` returns a pending ``Status`` for the duration of the movement.
+
+    With a velocity of 1000 um/s, moving of 500 um takes 0.5 seconds
+    plus the setpoint time.
+    """
+
+    for name, info in motor_config.items():
+        info.velocity = 1000.0
+        motor = OpenWFSMotor(name, info)
+        start = time.time()
+        status = motor.set(500)
+        assert time.time() - start < 0.05
+        assert not status.done
+        assert motor.locate() == Location(setpoint=500.0, readback=0.0)
+        status.wait()
+        end = time.time()
+        assert status.success
+        assert end - start == pytest.approx(0.5 + info.setpoint_time, abs=0.1)
+        assert motor.locate() == Location(setpoint=500.0, readback=500.0)
+
 def test_motor_shutdown(motor_config: dict[str, OpenWFSMotorInfo]) -> None:
     """Test the motor shutdown.
     
@@ -146,6 +243,19 @@ def test_motor_plan_absolute(motor_config: dict[str, OpenWFSMotorInfo], RE: RunE
     motors = tuple([OpenWFSMotor(name, info) for name, info in motor_config.items()])
     RE(moving_plan(motors))
 
+def test_motor_plan_parallel(motor_config: dict[str, OpenWFSMotorInfo], RE: RunEngine) -> None:
+    """Test that motors moved in the same ``bps.mv`` call overlap in time."""
+
+    for name, info in motor_config.items():
+        info.velocity = 1000.0
+        motors = [OpenWFSMotor(f"{name} {i}", info) for i in range(3)]
+        start = time.time()
+        RE(bps.mv(motors[0], 500, motors[1], 500, motors[2], 500))
+        end = time.time()
+        assert end - start == pytest.approx(0.5 + info.setpoint_time, abs=0.2)
+        for m in motors:
+            assert m.locate() == Location(setpoint=500.0, readback=500.0)
+
 def test_motor_plan_relative(motor_config: dict[str, OpenWFSMotorInfo], RE: RunEngine) -> None:
     """Test motor execution in a ``RunEngine`` plan.
     
@@ -163,3 +273,362 @@ def test_motor_plan_relative(motor_config: dict[str, OpenWFSMotorInfo], RE: RunE
     
     motors = tuple([OpenWFSMotor(name, info) for name, info in motor_config.items()])
     RE(moving_plan(motors))
+
+def test_motor_move_many(motor_config: dict[str, OpenWFSMotorInfo]) -> None:
+    """Test multi-axis movements via mapping and vector of locations.
+
+    All axis move under a single ``Status`` which completes
+    with the time of the slowest axis.
+    """
+
+    for name, info in motor_config.items():
+        info.velocity = 1000.0
+        motor = OpenWFSMotor(name, info)
+
+        start = time.time()
+        status = motor.set({"X": 100, "Y": 500})
+        status.wait()
+        end = time.time()
+        assert status.success
+        assert end - start == pytest.approx(0.5 + info.setpoint_time, abs=0.1)
+        location = motor.locate_many()
+        np.testing.assert_array_equal(location["setpoint"], [100.0, 500.0, 0.0])
+        np.testing.assert_array_equal(location["readback"], [100.0, 500.0, 0.0])
+
+        status = motor.move_many(np.array([200.0, 200.0, 200.0]))
+        status.wait()
+        np.testing.assert_array_equal(motor.locate_many()["readback"], [200.0] * 3)
+        motor.current_axis = "Z"
+        assert motor.locate() == Location(setpoint=200.0, readback=200.0)
+
+        with pytest.raises(IndexError):
+            motor.move_many({"A": 100})
+        with pytest.raises(ValueError):
+            motor.move_many(np.zeros(2))
+
+def test_motor_fly_scan(motor_config: dict[str, OpenWFSMotorInfo], RE: RunEngine) -> None:
+    """Test a fly scan over a precomputed trajectory.
+
+    The trajectory is emitted in bulk as a single ``EventPage``.
+    """
+
+    pages: list[dict[str, Any]] = []
+
+    def fly_plan(motor: OpenWFSMotor, trajectory: np.ndarray) -> MsgGenerator:
+        yield from bps.prepare(motor, trajectory, wait=True)
+        yield from bps.open_run()
+        yield from bps.kickoff(motor, wait=True)
+        yield from bps.complete(motor, wait=True)
+        yield from bps.collect(motor)
+        yield from bps.close_run()
+
+    for name, info in motor_config.items():
+        info.velocity = 100000.0
+        info.setpoint_time = 0.0
+        motor = OpenWFSMotor(name, info)
+        trajectory = np.stack([np.arange(1000) * 100.0] * 3, axis=1)
+        RE(fly_plan(motor, trajectory), lambda name, doc: pages.append(doc) if name == "event_page" else None)
+
+        assert len(pages) == 1
+        for axis in info.axis:
+            np.testing.assert_array_equal(pages[0]["data"][f"{name}-{axis}"], trajectory[:, 0])
+        assert np.all(np.diff(pages[0]["time"]) >= 0)
+        np.testing.assert_array_equal(motor.locate_many()["readback"], trajectory[-1])
+
+def test_motor_describe_configuration(motor_config: dict[str, OpenWFSMotorInfo]) -> None:
+    """Test that per-axis configuration values can be described."""
+    for name, info in motor_config.items():
+        motor = OpenWFSMotor(name, info)
+        description = motor.describe_configuration()
+        assert description.keys() == motor.read_configuration().keys()
+        assert description["step_size"] == {"source": "model_info", "dtype": "array", "shape": [3]}
+
+def test_camera_trigger_read(camera_config: dict[str, OpenWFSCameraInfo]) -> None:
+    """Test the camera ``Triggerable`` and ``Readable`` protocols."""
+
+    for name, info in camera_config.items():
+        camera = OpenWFSCamera(name, info)
+        assert camera.describe() == {
+            name: {
+                "source": "data",
+                "dtype": "array",
+                "shape": list(info.sensor_shape),
+                "dtype_numpy": "<u2",
+            }
+        }
+        status = camera.trigger()
+        status.wait()
+        assert status.success
+        reading = camera.read()[name]
+        assert reading["value"].shape == info.sensor_shape
+        assert reading["timestamp"] > 0
+
+def test_camera_plan_count(camera_config: dict[str, OpenWFSCameraInfo], RE: RunEngine) -> None:
+    """Test the camera in a ``bp.count`` plan."""
+
+    events: list[dict[str, Any]] = []
+
+    for name, info in camera_config.items():
+        camera = OpenWFSCamera(name, info)
+        RE(bp.count([camera], num=3), lambda name, doc: events.append(doc) if name == "event" else None)
+        assert len(events) == 3
+        for event in events:
+            assert event["data"][name].shape == info.sensor_shape
+
+def test_camera_frame_buffer(camera_config: dict[str, OpenWFSCameraInfo]) -> None:
+    """Test that frames are delivered as read-only views of the ring buffer."""
+
+    for name, info in camera_config.items():
+        info = OpenWFSCameraInfo(**{**asdict(info, recurse=False), "buffer_size": 2})
+        camera = OpenWFSCamera(name, info)
+        buffer = camera.frame_buffer
+        assert buffer is not None
+
+        frames = []
+        for _ in range(3):
+            camera.trigger().wait()
+            frames.append(camera.read()[name]["value"])
+        assert all(not frame.flags.writeable for frame in frames)
+        # the third frame overwrites the first one
+        assert np.shares_memory(frames[0], frames[2])
+        assert buffer.frames_written == 3
+        assert buffer.overruns == 0
+
+@pytest.mark.parametrize("bit_depth, dtype", [(8, "uint8"), (12, "uint16"), (16, "uint16")])
+def test_camera_bit_depth(
+    camera_config: dict[str, OpenWFSCameraInfo], bit_depth: int, dtype: str
+) -> None:
+    """Test that frames are produced in the configured data type and range."""
+
+    for name, info in camera_config.items():
+        values = asdict(info, recurse=False)
+        info = OpenWFSCameraInfo(**{**values, "bit_depth": bit_depth, "dtype": dtype})
+        camera = OpenWFSCamera(name, info)
+        camera.trigger().wait()
+        frame = camera.read()[name]["value"]
+        assert frame.dtype == np.dtype(dtype)
+        # frames are auto-scaled to the full range of the converter
+        assert 0 < frame.max() <= 2**bit_depth - 1
+        assert camera.describe()[name]["dtype_numpy"] == np.dtype(dtype).str
+
+
+def test_camera_large_specimen(camera_config: dict[str, OpenWFSCameraInfo]) -> None:
+    """Test that a huge specimen is only generated where the camera looks."""
+
+    for name, info in camera_config.items():
+        specimen = {**asdict(info.specimen), "resolution": [32768, 32768]}
+        info = OpenWFSCameraInfo(**{**asdict(info, recurse=False), "specimen": specimen})
+        start = time.perf_counter()
+        camera = OpenWFSCamera(name, info)
+        assert time.perf_counter() - start < 1.0
+
+        camera.trigger().wait()
+        assert camera.read()[name]["value"].shape == info.sensor_shape
+        tiles = camera._specimen.tiles_cached
+        assert 0 < tiles <= info.specimen.cache_tiles
+
+
+def test_camera_mapped_specimen(
+    camera_config: dict[str, OpenWFSCameraInfo], tmp_path: Path
+) -> None:
+    """Test imaging a specimen loaded from disk."""
+
+    image = np.zeros((1024, 1024), dtype=np.uint16)
+    image[::16, ::16] = 1000
+    np.save(tmp_path / "specimen.npy", image)
+
+    for name, info in camera_config.items():
+        specimen = {**asdict(info.specimen), "path": str(tmp_path / "specimen.npy")}
+        info = OpenWFSCameraInfo(**{**asdict(info, recurse=False), "specimen": specimen})
+        camera = OpenWFSCamera(name, info)
+        assert camera._specimen.shape == (1024, 1024)
+        camera.trigger().wait()
+        assert camera.read()[name]["value"].max() > 0
+
+
+def test_camera_stage_coupling(camera_config: dict[str, OpenWFSCameraInfo]) -> None:
+    """Test that the motor readback moves and focuses the specimen."""
+
+    # one step of the motor is one pixel of the specimen
+    motor = OpenWFSMotor(
+        "stage",
+        OpenWFSMotorInfo(
+            model_name="OpenWFSMotor",
+            axis=["X", "Y", "Z"],
+            step_size={"X": 0.06, "Y": 0.06, "Z": 0.1},
+            egu="um",
+            setpoint_time=0.0,
+        ),
+    )
+
+    for name, info in camera_config.items():
+        camera = OpenWFSCamera(name, info)
+        camera.couple_stage(motor, x="X", y="Y", z="Z")
+        microscope = camera._microscope
+        start = microscope.read()
+
+        # small lateral moves shift the cached canvas
+        motor.set({"X": 0.3, "Y": -0.12}).wait()
+        moved = microscope.read()
+        np.testing.assert_array_equal(moved[:-2, 5:], start[2:, :-5])
+
+        # moving back restores the initial image
+        motor.set({"X": 0.0, "Y": 0.0}).wait()
+        np.testing.assert_array_equal(microscope.read(), start)
+
+        # defocus blurs the image
+        motor.set(2.0, axis="Z").wait()
+        assert microscope.read().max() < start.max()
+
+        with pytest.raises(IndexError):
+            camera.couple_stage(motor, x="W")
+
+
+def test_camera_acquire_batch(camera_config: dict[str, OpenWFSCameraInfo]) -> None:
+    """Test the acquisition of time series and z-stacks in a single call."""
+
+    for name, info in camera_config.items():
+        camera = OpenWFSCamera(name, info)
+        height, width = info.sensor_shape
+
+        series = camera.acquire_batch(4)
+        assert series.shape == (4, height, width)
+        assert series.dtype == np.uint16
+        # same image, independent noise
+        assert not np.array_equal(series[0], series[1])
+        assert np.all(series.max(axis=(1, 2)) > 0)
+
+        out = np.empty((3, height, width), dtype=np.uint16)
+        stack = camera.acquire_batch(3, positions=[0.0, 1.0, 2.0], out=out)
+        assert stack is out
+
+        planes = camera._microscope.render_stack([0.0, 2.0] * u.um)
+        np.testing.assert_allclose(planes[0], camera._microscope.read(), atol=1e-12)
+        assert planes[1].max() < planes[0].max()
+
+        with pytest.raises(ValueError):
+            camera.acquire_batch(3, positions=[0.0, 1.0])
+        with pytest.raises(ValueError):
+            camera.acquire_batch(2, out=out)
+
+
+def test_camera_roi_binning(camera_config: dict[str, OpenWFSCameraInfo]) -> None:
+    """Test that the region of interest renders the same image as the full sensor."""
+
+    for name, info in camera_config.items():
+        reference = OpenWFSCamera(name, info)._microscope.read()
+
+        roi_info = OpenWFSCameraInfo(**{**asdict(info), "roi": (32, 64, 96, 128)})
+        camera = OpenWFSCamera(name, roi_info)
+        image = camera._microscope.read()
+        assert image.shape == (96, 128)
+        # away from the edges of the region, the light from outside of it is negligible
+        crop = reference[32:128, 64:192]
+        margin = 32
+        np.testing.assert_allclose(
+            image[margin:-margin, margin:-margin],
+            crop[margin:-margin, margin:-margin],
+            atol=0.02 * reference.max(),
+        )
+
+        frame = camera.read()[name]["value"]
+        assert frame.shape == (96, 128)
+        assert camera.describe()[name]["shape"] == [96, 128]
+
+        # binning is applied from the next frame, without a new microscope
+        microscope = camera._microscope
+        camera.configure("binning", 2)
+        assert camera._microscope is microscope
+        assert camera.data_shape == (48, 64)
+        assert camera.read()[name]["value"].shape == (48, 64)
+        assert camera.acquire_batch(3).shape == (3, 48, 64)
+        data = np.arange(2 * 4 * 8, dtype=np.float64).reshape(2, 4, 8)
+        np.testing.assert_array_equal(
+            camera._bin(data)[:, 0, 0], data[:, :2, :2].sum(axis=(1, 2))
+        )
+
+        camera.configure("roi", (0, 0, 0, 0))
+        assert camera.data_shape == (128, 128)
+
+        with pytest.raises(ValueError):
+            camera.configure("roi", (0, 0, 0, 300))
+
+        camera.start_streaming()
+        try:
+            with pytest.raises(RuntimeError):
+                camera.configure("binning", 1)
+        finally:
+            camera.stop_streaming()
+
+        # the readout can be configured again once the streaming is stopped
+        camera.configure("roi", (0, 0, 64, 64))
+        camera.configure("binning", 1)
+        assert camera.data_shape == (64, 64)
+        assert camera.stream is None
+        camera.start_streaming()
+        try:
+            assert camera.get_frame(timeout=5.0)[0].shape == (64, 64)
+        finally:
+            camera.stop_streaming()
+
+
+def test_camera_streaming(camera_config: dict[str, OpenWFSCameraInfo]) -> None:
+    """Test the continuous acquisition at a target frame rate."""
+
+    for name, info in camera_config.items():
+        info.frame_rate = 20.0
+        camera = OpenWFSCamera(name, info)
+        camera.start_streaming()
+        start = time.time()
+        frames = [camera.get_frame(timeout=1.0) for _ in range(5)]
+        end = time.time()
+        camera.stop_streaming()
+
+        # the first frame is produced immediately
+        assert end - start == pytest.approx(4 / info.frame_rate, abs=0.1)
+        timestamps = [timestamp for _, timestamp in frames]
+        assert timestamps == sorted(timestamps)
+        for frame, _ in frames:
+            assert frame.shape == info.sensor_shape
+        assert camera.stream is not None
+        assert camera.stream.frames_dropped == 0
+
+def test_camera_streaming_drops_frames(camera_config: dict[str, OpenWFSCameraInfo]) -> None:
+    """Test that frames are dropped when the consumer falls behind."""
+
+    for name, info in camera_config.items():
+        info.frame_rate = 0.0
+        info.stream_queue_size = 2
+        camera = OpenWFSCamera(name, info)
+        camera.start_streaming()
+        time.sleep(0.5)
+        camera.stop_streaming()
+
+        stream = camera.stream
+        assert stream is not None
+        assert stream.frames_dropped == stream.frames_rendered - 2
+        assert stream.frames_dropped > 0
+        assert len(list(camera.frames())) == 2
+
+
+def test_camera_streaming_slow_consumer(camera_config: dict[str, OpenWFSCameraInfo]) -> None:
+    """Test that queued frames overwritten in the frame buffer are skipped."""
+
+    for name, info in camera_config.items():
+        info = OpenWFSCameraInfo(
+            **{**asdict(info), "buffer_size": 2, "stream_queue_size": 2, "frame_rate": 0.0}
+        )
+        camera = OpenWFSCamera(name, info)
+        camera.start_streaming()
+        try:
+            # the consumer is slower than the producer
+            for _ in range(30):
+                frame, _ = camera.get_frame(timeout=1.0)
+                assert frame.shape == info.sensor_shape
+                time.sleep(0.05)
+        finally:
+            camera.stop_streaming()
+
+        stream = camera.stream
+        assert stream is not None
+        assert stream.frames_dropped > 0
@@ -0,0 +1,36 @@
+"""``pytest`` test cases for the ``motion`` module."""
+
+import numpy as np
+import pytest
+
+from redsun_simulator.openwfs._motion import move_duration, plan_trajectory
+
+
+def test_move_duration_instantaneous() -> None:
+    """Without velocity, only the settle time is simulated for non-zero moves."""
+    assert move_duration(100.0, 0.0, 0.0, 0.1) == pytest.approx(0.1)
+    assert move_duration(0.0, 0.0, 0.0, 0.1) == 0.0
+
+
+def test_move_duration_constant_velocity() -> None:
+    assert move_duration(-500.0, 1000.0, 0.0) == pytest.approx(0.5)
+
+
+def test_move_duration_profiles() -> None:
+    """Test the trapezoidal and triangular profiles.
+
+    With v = 1000 and a = 10000, the ramps cover 100 units;
+    longer moves cruise at full velocity, shorter ones never reach it.
+    """
+    durations = move_duration([1000.0, 100.0, 25.0], 1000.0, 10000.0, 0.1)
+    expected = [1.0 + 0.1 + 0.1, 0.2 + 0.1, 2 * np.sqrt(25.0 / 10000.0) + 0.1]
+    np.testing.assert_allclose(durations, expected)
+
+
+def test_plan_trajectory() -> None:
+    """Points are rounded to the step grid and reached after each segment."""
+    start = np.array([0.0, 0.0])
+    points = np.array([[100.0, 40.0], [260.0, 100.0], [260.0, 100.0]])
+    positions, offsets = plan_trajectory(start, points, np.array([100.0, 50.0]), 1000.0, 0.0)
+    np.testing.assert_array_equal(positions, [[100.0, 50.0], [300.0, 100.0], [300.0, 100.0]])
+    np.testing.assert_allclose(offsets, [0.1, 0.3, 0.3])
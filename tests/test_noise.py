@@ -0,0 +1,78 @@
+"""``pytest`` test cases for the ``noise`` module."""
+
+import os
+import threading
+from typing import Any
+
+import numpy as np
+import pytest
+from attrs import evolve
+
+from redsun_simulator.openwfs import NoiseEngine, OpenWFSCamera, OpenWFSCameraInfo
+from redsun_simulator.openwfs._config import Noise
+
+
+def test_noise_reproducible() -> None:
+    """Test that the noise only depends on the seed, not on the threads."""
+
+    signal = np.full((300, 40), 20.0)
+    single = NoiseEngine(Noise(seed=7, threads=1))
+    multi = NoiseEngine(Noise(seed=7, threads=4))
+    for _ in range(2):
+        np.testing.assert_array_equal(
+            single.apply(signal, signal.shape), multi.apply(signal, signal.shape)
+        )
+
+    other = NoiseEngine(Noise(seed=8, threads=1))
+    assert not np.array_equal(
+        NoiseEngine(Noise(seed=7)).apply(signal, signal.shape),
+        other.apply(signal, signal.shape),
+    )
+
+
+def test_noise_shared_threads() -> None:
+    """Test that all the engines share the same threads."""
+
+    signal = np.full((256, 16), 20.0)
+    for seed in range(20):
+        NoiseEngine(Noise(seed=seed, threads=4)).apply(signal, signal.shape)
+    threads = [t for t in threading.enumerate() if t.name.startswith("noise")]
+    assert 0 < len(threads) <= (os.cpu_count() or 1)
+
+
+@pytest.mark.parametrize("mean", [5.0, 400.0])
+def test_noise_statistics(mean: float) -> None:
+    """Test the mean and variance of the shot, dark and read noise."""
+
+    engine = NoiseEngine(
+        Noise(gaussian_threshold=100.0, read_noise=3.0, dark_current=2.0, seed=0)
+    )
+    # a single image broadcast to a stack of frames
+    frames = engine.apply(np.full((64, 64), mean), (10, 64, 64))
+    assert frames.shape == (10, 64, 64)
+    assert not np.array_equal(frames[0], frames[1])
+    assert frames.mean() == pytest.approx(mean + 2.0, rel=0.01)
+    assert frames.var() == pytest.approx(mean + 2.0 + 9.0, rel=0.05)
+
+    silent = NoiseEngine(Noise(shot_noise=False))
+    np.testing.assert_array_equal(
+        silent.apply(np.full((4, 4), mean), (4, 4)), np.full((4, 4), mean)
+    )
+
+
+def test_camera_noise(camera_values: dict[str, Any]) -> None:
+    """Test that seeded cameras acquire identical frames."""
+
+    info = OpenWFSCameraInfo(**{**camera_values, "noise": {"seed": 3}})
+
+    first = OpenWFSCamera("first", info).acquire_batch(2)
+    second = OpenWFSCamera("second", evolve(info)).acquire_batch(2)
+    np.testing.assert_array_equal(first, second)
+
+    camera = OpenWFSCamera("camera", evolve(info))
+    camera.configure("noise", {"seed": 3, "read_noise": 5.0})
+    assert camera.noise_engine.noise.read_noise == 5.0
+    assert not np.array_equal(camera.acquire_batch(2), first)
+
+    with pytest.raises(ValueError):
+        camera.configure("noise", {"read_noise": -1.0})
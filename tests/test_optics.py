@@ -0,0 +1,57 @@
+"""``pytest`` test cases for the ``optics`` module."""
+
+from typing import Any
+
+import astropy.units as u
+import numpy as np
+from openwfs.simulation import Microscope, StaticSource
+
+from redsun_simulator.openwfs import (
+    OpenWFSCamera,
+    OpenWFSCameraInfo,
+    psf_cache_clear,
+    psf_cache_info,
+)
+from redsun_simulator.openwfs._config import Specimen
+from redsun_simulator.openwfs._optics import SimulatedMicroscope
+
+
+def test_microscope_equivalence() -> None:
+    """The cached microscope renders the same image as the OpenWFS one."""
+    img = np.random.default_rng(0).integers(0, 10, (128, 128)).astype(np.float64)
+    source = StaticSource(img, pixel_size=60 * u.nm)
+    kwargs = dict(
+        source=source,
+        data_shape=(64, 96),
+        magnification=40,
+        numerical_aperture=0.85,
+        wavelength=532.8 * u.nm,
+        multi_threaded=False,
+    )
+    expected = Microscope(**kwargs).read()
+    microscope = SimulatedMicroscope(**kwargs)
+    np.testing.assert_allclose(microscope.read(), expected, atol=1e-12)
+    np.testing.assert_allclose(microscope.read(), expected, atol=1e-12)
+
+
+def test_psf_cache_shared(camera_values: dict[str, Any]) -> None:
+    """Cameras with the same optical parameters share the cached transfer."""
+
+    psf_cache_clear()
+    cameras = [
+        OpenWFSCamera(f"camera {i}", OpenWFSCameraInfo(**camera_values))
+        for i in range(3)
+    ]
+    for camera in cameras:
+        camera.trigger().wait()
+    info = psf_cache_info()
+    assert info.misses == 1
+    assert info.hits == 2
+    assert info.currsize == 1
+
+    # changing the optical parameters computes a new transfer
+    specimen = Specimen(**{**camera_values["specimen"], "numerical_aperture": 0.5})
+    cameras[0].configure("specimen", specimen)
+    cameras[0].trigger().wait()
+    assert psf_cache_info().misses == 2
+    assert psf_cache_info().currsize == 2
@@ -0,0 +1,177 @@
+"""``pytest`` test cases for the device server and client."""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+import bluesky.plan_stubs as bps
+import numpy as np
+import pytest
+import yaml
+from bluesky.preprocessors import run_decorator
+from bluesky.run_engine import RunEngine
+from bluesky.utils import MsgGenerator
+
+from redsun_simulator.openwfs import (
+    CameraProxy,
+    Command,
+    DeviceClient,
+    DeviceServer,
+    MotorProxy,
+    RemoteError,
+    load_devices,
+)
+
+
+@pytest.fixture
+def config_path(
+    tmp_path: Path, motor_config_path: str, camera_config_path: str
+) -> Path:
+    models: dict[str, Any] = {}
+    for path in (motor_config_path, camera_config_path):
+        with open(path, "r") as file:
+            models.update(yaml.safe_load(file)["models"])
+    models["Mock motor"]["setpoint_time"] = 0.0
+    path = tmp_path / "devices.yaml"
+    path.write_text(yaml.safe_dump({"models": models}))
+    return path
+
+
+@pytest.fixture(params=["unix", "tcp"])
+def client(
+    request: pytest.FixtureRequest, config_path: Path, tmp_path: Path
+) -> Iterator[DeviceClient]:
+    address: Any = (
+        str(tmp_path / "devices.sock") if request.param == "unix" else ("127.0.0.1", 0)
+    )
+    with DeviceServer(load_devices(config_path), address) as server:
+        server.start()
+        with DeviceClient(server.address) as client:
+            yield client
+
+
+def test_client_proxies(client: DeviceClient) -> None:
+    """Test that the proxies forward the Bluesky protocols to the server."""
+
+    motor = client["Mock motor"]
+    camera = client["Mock camera"]
+    assert isinstance(motor, MotorProxy)
+    assert isinstance(camera, CameraProxy)
+    assert set(client) == {"Mock motor", "Mock camera"}
+
+    motor.set(200.0).wait(timeout=5)
+    assert motor.locate() == {"setpoint": 200.0, "readback": 200.0}
+    motor.set({"Y": 100.0, "Z": -100.0}).wait(timeout=5)
+    motor.configure("velocity", 1000.0)
+    assert motor.read_configuration()["velocity"]["value"] == 1000.0
+
+    camera.trigger().wait(timeout=5)
+    frame = camera.read()["Mock camera"]["value"]
+    assert frame.shape == (256, 256)
+    assert frame.dtype == np.uint16
+    assert frame.max() > 0
+    assert camera.describe()["Mock camera"]["shape"] == [256, 256]
+    assert camera.acquire_batch(2, positions=np.array([0.0, 1.0])).shape == (
+        2,
+        256,
+        256,
+    )
+
+
+def test_client_batch(client: DeviceClient) -> None:
+    """Test batches of commands in a single round-trip."""
+
+    results = client.call(
+        [Command("Mock motor", "set", (float(i * 100), "X")) for i in range(20)]
+        + [Command("Mock motor", "set", (np.array([100.0, 200.0, 300.0]),))]
+    )
+    assert results == [None] * 21
+    assert client.call([Command("Mock motor", "locate_many")])[0][
+        "readback"
+    ].tolist() == [
+        100.0,
+        200.0,
+        300.0,
+    ]
+
+    with pytest.raises(RemoteError, match="IndexError"):
+        client.call([Command("Mock motor", "set", (1.0, "W"))])
+    with pytest.raises(RemoteError, match="cannot be called remotely"):
+        client.call([Command("Mock motor", "shutdown")])
+    with pytest.raises(RemoteError, match="KeyError"):
+        client.call([Command("Missing", "locate")])
+
+
+def test_client_batch_frames(config_path: Path, tmp_path: Path) -> None:
+    """Frames replied with pending statuses are not overwritten by later frames."""
+
+    models = yaml.safe_load(config_path.read_text())["models"]
+    models["Mock motor"]["setpoint_time"] = 0.5
+    models["Mock camera"]["buffer_size"] = 1
+    config_path.write_text(yaml.safe_dump({"models": models}))
+    devices = load_devices(config_path)
+    camera, motor = devices["Mock camera"], devices["Mock motor"]
+    with DeviceServer(devices, str(tmp_path / "devices.sock")) as server:
+        server.start()
+        with DeviceClient(server.address) as client:
+            camera.trigger().wait(timeout=5)
+            expected = np.array(camera.read()["Mock camera"]["value"])
+            future = client.submit(
+                [Command("Mock camera", "read"), Command("Mock motor", "set", (100.0,))]
+            )
+            # the frame is read before the motor starts moving
+            while motor.locate()["setpoint"] != 100.0:
+                time.sleep(0.01)
+            camera.trigger().wait(timeout=5)
+            assert not np.array_equal(camera.read()["Mock camera"]["value"], expected)
+            frame = future.result(timeout=5)[0]["Mock camera"]["value"]
+            assert np.array_equal(frame, expected)
+
+
+def test_client_plan(client: DeviceClient) -> None:
+    """Test a plan driving the proxies."""
+
+    motor = client["Mock motor"]
+    camera = client["Mock camera"]
+
+    @run_decorator()
+    def plan() -> MsgGenerator[None]:
+        for x in (0.0, 100.0, 200.0):
+            yield from bps.mv(motor, x)
+            yield from bps.trigger_and_read([camera])
+
+    events: list[dict[str, Any]] = []
+    RunEngine()(
+        plan(), lambda name, doc: events.append(doc) if name == "event" else None
+    )
+    assert len(events) == 3
+    assert events[-1]["data"]["Mock camera"].shape == (256, 256)
+    assert motor.locate()["readback"] == 200.0
+
+
+def test_server_entry_point(config_path: Path, tmp_path: Path) -> None:
+    """Test serving a configuration file from the command line."""
+
+    address = tmp_path / "cli.sock"
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "redsun_simulator.openwfs._server",
+            str(config_path),
+            "--socket",
+            str(address),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        assert process.stdout is not None
+        assert process.stdout.readline().startswith("Serving 2 devices")
+        with DeviceClient(str(address)) as client:
+            assert client["Mock motor"].locate() == {"setpoint": 0.0, "readback": 0.0}
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
@@ -0,0 +1,92 @@
+"""``pytest`` test cases for the ``specimen`` module."""
+
+from pathlib import Path
+
+import astropy.units as u
+import numpy as np
+import pytest
+from openwfs.utilities import get_pixel_size
+
+from redsun_simulator.openwfs._specimen import MappedSpecimen, TiledSpecimen
+
+
+def test_tiled_specimen_deterministic() -> None:
+    """The specimen only depends on the seed, not on the tile size or access order."""
+    a = TiledSpecimen((300, 500), 60 * u.nm, seed=1, tile_size=64, cache_size=4)
+    b = TiledSpecimen((300, 500), 60 * u.nm, seed=1, tile_size=64, cache_size=100)
+    c = TiledSpecimen((300, 500), 60 * u.nm, seed=2, tile_size=64, cache_size=100)
+
+    region = a.region(100, 200, 50, 70)
+    assert region.shape == (50, 70)
+    assert region.dtype == np.int16
+    assert np.all(region >= 0)
+    np.testing.assert_array_equal(get_pixel_size(region), [60, 60] * u.nm)
+
+    whole = b.region(0, 0, 300, 500)
+    np.testing.assert_array_equal(region, whole[100:150, 200:270])
+    # tiles evicted from the cache are regenerated identically
+    np.testing.assert_array_equal(a.region(0, 0, 300, 500), whole)
+    assert not np.array_equal(c.region(0, 0, 300, 500), whole)
+
+
+def test_tiled_specimen_cache() -> None:
+    """Only the tiles in view are generated, up to the cache size."""
+    specimen = TiledSpecimen(
+        (32768, 32768), 60 * u.nm, seed=0, tile_size=256, cache_size=4
+    )
+    assert specimen.tiles_generated == 0
+
+    specimen.region(1024, 1024, 100, 100)
+    assert specimen.tiles_generated == 1
+    specimen.region(1024, 1024, 100, 100)
+    assert specimen.tiles_generated == 1
+
+    # 3x3 more tiles, of which only 4 are retained
+    specimen.region(0, 0, 700, 700)
+    assert specimen.tiles_generated == 10
+    assert specimen.tiles_cached == 4
+
+
+def test_tiled_specimen_clipping() -> None:
+    """Regions are clipped to the bounds of the specimen."""
+    specimen = TiledSpecimen((100, 100), 60 * u.nm, seed=0, tile_size=32, cache_size=8)
+    assert specimen.region(-10, 90, 20, 20).shape == (10, 10)
+    assert specimen.region(200, 0, 20, 20).size == 0
+
+    with pytest.raises(ValueError):
+        TiledSpecimen((100, 100), 60 * u.nm, seed=0, tile_size=0, cache_size=8)
+
+
+@pytest.mark.parametrize("suffix", [".npy", ".tif", ".zarr"])
+def test_mapped_specimen(tmp_path: Path, suffix: str) -> None:
+    """Regions of a memory-mapped specimen match the image on disk."""
+    image = np.random.default_rng(0).integers(0, 1000, (300, 400), dtype=np.uint16)
+    path = tmp_path / f"specimen{suffix}"
+    if suffix == ".npy":
+        np.save(path, image)
+    elif suffix == ".tif":
+        tifffile = pytest.importorskip("tifffile")
+        tifffile.imwrite(path, image)
+    else:
+        zarr = pytest.importorskip("zarr")
+        zarr.save_array(str(path), image, chunks=(64, 64))
+
+    specimen = MappedSpecimen(path, 60 * u.nm)
+    assert specimen.shape == (300, 400)
+    region = specimen.region(50, 100, 80, 120)
+    np.testing.assert_array_equal(region, image[50:130, 100:220])
+    np.testing.assert_array_equal(get_pixel_size(region), [60, 60] * u.nm)
+
+
+def test_mapped_specimen_errors(tmp_path: Path) -> None:
+    """Unsupported files are rejected."""
+    np.save(tmp_path / "stack.npy", np.zeros((2, 10, 10)))
+    with pytest.raises(ValueError):
+        MappedSpecimen(tmp_path / "stack.npy", 60 * u.nm)
+    with pytest.raises(ValueError):
+        MappedSpecimen(tmp_path / "specimen.png", 60 * u.nm)
+
+    tifffile = pytest.importorskip("tifffile")
+    tifffile.imwrite(tmp_path / "compressed.tif", np.zeros((10, 10)), compression="zlib")
+    with pytest.raises(ValueError):
+        MappedSpecimen(tmp_path / "compressed.tif", 60 * u.nm)
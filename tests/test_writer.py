@@ -0,0 +1,190 @@
+"""``pytest`` test cases for the ``writer`` module."""
+
+import threading
+from pathlib import Path
+from typing import Any
+
+import bluesky.plans as bp
+import h5py
+import numpy as np
+import pytest
+import zarr
+from bluesky.run_engine import RunEngine
+
+from redsun_simulator.openwfs import FrameWriter, OpenWFSCamera, OpenWFSCameraInfo
+from redsun_simulator.openwfs import _writer
+
+
+def _read(path: Path) -> tuple[np.ndarray, np.ndarray]:
+    if path.suffix == ".zarr":
+        group = zarr.open_group(str(path), mode="r")
+        return group["frames"][:], group["timestamps"][:]
+    with h5py.File(path, "r") as file:
+        return file["frames"][:], file["timestamps"][:]
+
+
+@pytest.mark.parametrize(
+    "name, compression",
+    [
+        ("frames.zarr", None),
+        ("frames.zarr", "zstd"),
+        ("frames.h5", None),
+        ("frames.h5", "gzip"),
+    ],
+)
+def test_writer_roundtrip(tmp_path: Path, name: str, compression: Any) -> None:
+    """Frames are written in chunks, including the last partial chunk."""
+
+    rng = np.random.default_rng(0)
+    frames = rng.integers(0, 4096, (21, 32, 48), dtype=np.uint16)
+    path = tmp_path / name
+    with FrameWriter(
+        path, (32, 48), np.uint16, chunk_frames=4, max_chunks=2, compression=compression
+    ) as writer:
+        for i, frame in enumerate(frames):
+            assert writer.write(frame, float(i))
+        writer.flush()
+        assert writer.stats()["frames_written"] == 21
+    written, timestamps = _read(path)
+    np.testing.assert_array_equal(written, frames)
+    np.testing.assert_array_equal(timestamps, np.arange(21.0))
+    stats = writer.stats()
+    assert stats["bytes_written"] == frames.nbytes
+    assert stats["frames_dropped"] == 0
+    assert stats["throughput"] > 0
+    # frames written after closing are dropped
+    assert not writer.write(frames[0], 0.0)
+
+
+def test_writer_drop(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Frames are dropped when all the chunks are pending, unless blocking."""
+
+    release = threading.Event()
+    append = _writer._append
+
+    def slow_append(*args: Any) -> None:
+        release.wait()
+        append(*args)
+
+    monkeypatch.setattr(_writer, "_append", slow_append)
+    frame = np.ones((8, 8), dtype=np.uint8)
+    writer = FrameWriter(
+        tmp_path / "frames.zarr",
+        (8, 8),
+        np.uint8,
+        chunk_frames=2,
+        max_chunks=2,
+        block=False,
+    )
+    results = [writer.write(frame, 0.0) for _ in range(6)]
+    assert results == [True] * 4 + [False] * 2
+    release.set()
+    writer.close()
+    stats = writer.stats()
+    assert (stats["frames_received"], stats["frames_written"]) == (6, 4)
+    assert stats["frames_dropped"] == 2
+
+
+def test_writer_closed(tmp_path: Path) -> None:
+    """Frames written after closing are dropped."""
+
+    writer = FrameWriter(tmp_path / "frames.h5", (8, 8), np.uint8)
+    assert writer.write(np.ones((8, 8), dtype=np.uint8), 0.0)
+    writer.close()
+    assert not writer.write(np.ones((8, 8), dtype=np.uint8), 1.0)
+    assert writer.stats()["frames_written"] == 1
+
+
+def test_writer_errors(tmp_path: Path) -> None:
+    """Unsupported formats and parameters are rejected."""
+
+    with pytest.raises(ValueError):
+        FrameWriter(tmp_path / "frames.tif", (8, 8), np.uint8)
+    with pytest.raises(ValueError):
+        FrameWriter(tmp_path / "frames.zarr", (8, 8), np.uint8, chunk_frames=0)
+
+
+def test_camera_recording(camera_info: OpenWFSCameraInfo, tmp_path: Path) -> None:
+    """All the frames acquired by the camera are recorded."""
+
+    info = camera_info
+    camera = OpenWFSCamera("camera", info)
+    camera.enable_metrics()
+    path = tmp_path / "frames.h5"
+    writer = camera.start_recording(path, chunk_frames=2)
+    with pytest.raises(RuntimeError):
+        camera.start_recording(tmp_path / "other.h5")
+
+    frames: list[np.ndarray] = []
+    RE = RunEngine()
+    RE(
+        bp.count([camera], num=3),
+        lambda name, doc: (
+            frames.append(doc["data"]["camera"]) if name == "event" else None
+        ),
+    )
+    batch = camera.acquire_batch(2)
+    metrics = camera.read_metrics()
+    assert metrics["counters"]["writer_frames_dropped"] == 0
+    camera.stop_recording()
+    camera.stop_recording()
+
+    written, timestamps = _read(path)
+    assert written.shape == (5, *info.sensor_shape)
+    np.testing.assert_array_equal(written[:3], np.stack(frames))
+    np.testing.assert_array_equal(written[3:], batch)
+    assert np.all(np.diff(timestamps) >= 0)
+    assert writer.stats()["frames_written"] == 5
+
+
+def test_camera_recording_buffer(
+    camera_values: dict[str, Any], tmp_path: Path
+) -> None:
+    """Recording does not mark the buffered frames as read."""
+
+    info = OpenWFSCameraInfo(**camera_values, buffer_size=2)
+    camera = OpenWFSCamera("camera", info)
+    camera.enable_metrics()
+    camera.start_recording(tmp_path / "frames.h5")
+    for _ in range(10):
+        camera.trigger().wait()
+    metrics = camera.read_metrics()
+    camera.stop_recording()
+
+    assert metrics["counters"]["buffer_overruns"] == 8
+    assert metrics["gauges"]["buffer_pending"] == 2
+    assert _read(tmp_path / "frames.h5")[0].shape[0] == 10
+
+
+def test_camera_stop_recording(
+    camera_values: dict[str, Any], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Stopping the recording while a frame is recorded does not fail the acquisition."""
+
+    info = OpenWFSCameraInfo(**camera_values, frame_rate=0.0)
+    camera = OpenWFSCamera("camera", info)
+
+    def start_recording(name: str) -> None:
+        writer = camera.start_recording(tmp_path / name)
+        write = writer.write
+
+        def stop_and_write(frame: np.ndarray, timestamp: float) -> bool:
+            camera.stop_recording()
+            return write(frame, timestamp)
+
+        monkeypatch.setattr(writer, "write", stop_and_write)
+
+    start_recording("trigger.h5")
+    status = camera.trigger()
+    status.wait()
+    assert status.success
+
+    start_recording("stream.h5")
+    camera.start_streaming()
+    try:
+        for _ in range(3):
+            camera.get_frame(timeout=5.0)
+        assert camera.stream is not None
+        assert camera.stream.running
+    finally:
+        camera.stop_streaming()